@@ -0,0 +1,124 @@
+"""
+Seeded generator of synthetic repositories used to benchmark the file hooks.
+
+The same specification always produces byte-identical files, so results
+measured on different commits are comparable.
+"""
+import argparse
+import json
+import pathlib
+import random
+from dataclasses import asdict, dataclass
+
+from src.remove_diacritics import MAPPING
+
+WORDS = (
+    "def class return import self value index file line hook commit tree "
+    "branch merge staged result cache error path name data count"
+).split()
+DIACRITICS = "".join(MAPPING)
+
+
+@dataclass
+class RepositorySpec:
+    """
+    Shape of a synthetic repository.
+
+    :param files: number of files.
+    :param median_size: median file size in bytes, sizes follow a log-normal distribution.
+    :param size_sigma: standard deviation of the logarithm of the file sizes.
+    :param max_size: upper bound of the file sizes in bytes.
+    :param binary_share: fraction of files with binary contents.
+    :param crlf_share: fraction of text files with CRLF line endings.
+    :param trailing_whitespace_share: fraction of lines ending with whitespace.
+    :param diacritics_density: fraction of characters replaced with letters with diacritics.
+    :param files_per_directory: number of files in a directory before a new one is started.
+    :param seed: seed of the random number generator.
+    """
+
+    files: int = 1000
+    median_size: int = 4096
+    size_sigma: float = 1.0
+    max_size: int = 4 * 1024 * 1024
+    binary_share: float = 0.05
+    crlf_share: float = 0.2
+    trailing_whitespace_share: float = 0.05
+    diacritics_density: float = 0.001
+    files_per_directory: int = 50
+    seed: int = 0
+
+
+def text_contents(spec: RepositorySpec, size: int, rng: random.Random) -> bytes:
+    """
+    Generates text resembling source code.
+
+    :param spec: shape of the repository.
+    :param size: approximate size of the contents in bytes.
+    :param rng: random number generator.
+    :return: encoded contents.
+    """
+    newline = "\r\n" if rng.random() < spec.crlf_share else "\n"
+    lines = []
+    total = 0
+
+    while total < size:
+        indent = "    " * rng.randint(0, 3)
+        line = indent + " ".join(rng.choices(WORDS, k=rng.randint(1, 12)))
+        # the expected number of replaced characters, rounded randomly
+        replaced = int(len(line) * spec.diacritics_density + rng.random())
+        if replaced:
+            characters = list(line)
+            for position in rng.sample(range(len(line)), min(replaced, len(line))):
+                characters[position] = rng.choice(DIACRITICS)
+            line = "".join(characters)
+        if rng.random() < spec.trailing_whitespace_share:
+            line += rng.choice((" ", "  ", "\t"))
+        lines.append(line + newline)
+        total += len(line) + len(newline)
+
+    return "".join(lines).encode("utf-8")
+
+
+def generate_repository(path: str, spec: RepositorySpec) -> None:
+    """
+    Writes the files of a synthetic repository into the directory.
+
+    :param path: path to the directory, created if it does not exist.
+    :param spec: shape of the repository.
+    """
+    rng = random.Random(spec.seed)
+    root = pathlib.Path(path)
+
+    for index in range(spec.files):
+        directory = root / f"dir_{index // spec.files_per_directory:04d}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        size = min(
+            int(rng.lognormvariate(0, spec.size_sigma) * spec.median_size),
+            spec.max_size,
+        )
+        if rng.random() < spec.binary_share:
+            contents = b"\0" + rng.randbytes(max(size - 1, 0))
+            name = f"file_{index:06d}.bin"
+        else:
+            contents = text_contents(spec, size, rng)
+            name = f"file_{index:06d}.txt"
+
+        (directory / name).write_bytes(contents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic repository")
+    parser.add_argument("dir_name", help="Name of the directory to generate")
+    parser.add_argument(
+        "--spec", help="JSON object overriding fields of the default specification"
+    )
+    args = parser.parse_args()
+
+    spec = RepositorySpec(**json.loads(args.spec or "{}"))
+    generate_repository(args.dir_name, spec)
+    print(json.dumps(asdict(spec), indent=2))
+
+
+if __name__ == "__main__":
+    main()
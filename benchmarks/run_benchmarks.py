@@ -0,0 +1,282 @@
+"""
+Times the file hooks on a synthetic repository.
+
+Every hook runs as a separate child process on a fresh copy of the generated
+repository, so fixes made by one run never speed up the next one. Throughput
+is reported in files/s and MB/s of the repository, together with the peak
+resident set size of the largest process, and the results are written as JSON
+so that runs on different commits can be compared.
+"""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.generate_repository import RepositorySpec, generate_repository
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+CONTENT_HOOKS = [
+    "remove_carriage_return",
+    "remove_diacritics",
+    "remove_trailing_whitespaces",
+    "last_line_empty",
+]
+
+# module of every benchmarked hook and the options passed after the directory
+HOOKS = {
+    **{name: (f"src.{name}", ["--no-cache"]) for name in CONTENT_HOOKS},
+    "normalize": ("src.normalize", ["--no-cache"]),
+    "run_hooks": ("src.run_hooks", ["--hooks", *CONTENT_HOOKS]),
+}
+# hooks supporting the check mode
+CHECK_HOOKS = [*CONTENT_HOOKS, "normalize"]
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements of a single hook.
+
+    :param hook: name of the hook.
+    :param mode: fix or check.
+    :param seconds: median wall time of the runs.
+    :param files_per_second: files processed per second.
+    :param mb_per_second: megabytes processed per second.
+    :param peak_rss_mb: highest peak resident set size of any process of any run.
+    :param exit_codes: exit codes of the runs.
+    """
+
+    hook: str
+    mode: str
+    seconds: float
+    files_per_second: float
+    mb_per_second: float
+    peak_rss_mb: float
+    exit_codes: List[int]
+
+
+def repository_size(path: pathlib.Path) -> Tuple[int, int]:
+    """
+    Counts the files in the directory and their total size.
+
+    :param path: path to the directory.
+    :return: number of files and their size in bytes.
+    """
+    files = [file for file in path.rglob("*") if file.is_file()]
+    return len(files), sum(file.stat().st_size for file in files)
+
+
+def run_child(arguments: List[str], cwd: pathlib.Path) -> Tuple[float, int, int]:
+    """
+    Runs a command and measures it.
+
+    :param arguments: command line.
+    :param cwd: directory the command is run in.
+    :return: wall time in seconds, peak resident set size in kilobytes and exit code.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        arguments, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # the usage reported for the child covers the worker processes it waited for
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is reported in kilobytes on Linux
+    return seconds, usage.ru_maxrss, process.returncode
+
+
+def benchmark_hook(
+    name: str,
+    mode: str,
+    template: pathlib.Path,
+    workspace: pathlib.Path,
+    repeat: int,
+    jobs: int,
+) -> BenchmarkResult:
+    """
+    Runs the hook repeat times, each time on a fresh copy of the template.
+
+    :param name: name of the hook.
+    :param mode: fix or check.
+    :param template: path to the generated repository.
+    :param workspace: directory the copies are made in.
+    :param repeat: number of runs.
+    :param jobs: number of worker processes passed to the hook, 0 for the default.
+    :return: measurements of the hook.
+    """
+    files, size = repository_size(template)
+    module, options = HOOKS[name]
+    if mode == "check":
+        options = [*options, "--check"]
+
+    times = []
+    peak_rss = 0
+    exit_codes = []
+
+    for _ in range(repeat):
+        target = workspace / "repository"
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(template, target)
+
+        seconds, rss, exit_code = run_child(
+            [sys.executable, "-m", module, str(target), "--jobs", str(jobs), *options],
+            ROOT,
+        )
+        times.append(seconds)
+        peak_rss = max(peak_rss, rss)
+        exit_codes.append(exit_code)
+
+    seconds = statistics.median(times)
+
+    return BenchmarkResult(
+        name,
+        mode,
+        seconds,
+        files / seconds,
+        size / seconds / 1e6,
+        peak_rss / 1024,
+        exit_codes,
+    )
+
+
+def current_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode().strip()
+
+
+def run_benchmarks(
+    spec: RepositorySpec, hooks: List[str], repeat: int = 3, jobs: int = 0
+) -> Dict:
+    """
+    Generates the repository and benchmarks the hooks on it.
+
+    :param spec: shape of the repository.
+    :param hooks: names of the hooks to benchmark.
+    :param repeat: number of runs of every hook.
+    :param jobs: number of worker processes passed to the hooks, 0 for the default.
+    :return: JSON-serializable report.
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        workspace = pathlib.Path(directory)
+        template = workspace / "template"
+        generate_repository(template, spec)
+        files, size = repository_size(template)
+
+        for name in hooks:
+            modes = ["fix", "check"] if name in CHECK_HOOKS else ["fix"]
+            for mode in modes:
+                result = benchmark_hook(name, mode, template, workspace, repeat, jobs)
+                print(
+                    f"{result.hook:<28} {result.mode:<5} {result.seconds:>8.3f}s "
+                    f"{result.files_per_second:>10.0f} files/s "
+                    f"{result.mb_per_second:>8.1f} MB/s "
+                    f"{result.peak_rss_mb:>7.1f} MB RSS",
+                    file=sys.stderr,
+                )
+                results.append(asdict(result))
+
+    return {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "jobs": jobs,
+        "repeat": repeat,
+        "spec": asdict(spec),
+        "files": files,
+        "bytes": size,
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict) -> None:
+    """
+    Prints the speedup of every hook between two reports.
+
+    :param baseline: report of the baseline run.
+    :param current: report of the current run.
+    """
+    previous = {
+        (result["hook"], result["mode"]): result for result in baseline["results"]
+    }
+
+    for result in current["results"]:
+        old = previous.get((result["hook"], result["mode"]))
+        if old is None:
+            continue
+        print(
+            f"{result['hook']:<28} {result['mode']:<5} "
+            f"{old['seconds']:>8.3f}s -> {result['seconds']:>8.3f}s "
+            f"({old['seconds'] / result['seconds']:.2f}x), "
+            f"RSS {old['peak_rss_mb']:.1f} -> {result['peak_rss_mb']:.1f} MB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the file hooks on a synthetic repository"
+    )
+    parser.add_argument(
+        "--spec", help="JSON object overriding fields of the default specification"
+    )
+    parser.add_argument(
+        "--hooks",
+        help="Hooks to benchmark, all of them by default",
+        nargs="+",
+        choices=list(HOOKS),
+        default=list(HOOKS),
+    )
+    parser.add_argument(
+        "-r", "--repeat", help="Number of runs of every hook", type=int, default=3
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes passed to the hooks, 0 for the default",
+        type=int,
+        default=0,
+    )
+    parser.add_argument("-o", "--output", help="File the JSON report is written to")
+    parser.add_argument(
+        "-c", "--compare", help="JSON report of a previous run to compare against"
+    )
+    args = parser.parse_args()
+
+    spec = RepositorySpec(**json.loads(args.spec or "{}"))
+    report = run_benchmarks(spec, args.hooks, args.repeat, args.jobs)
+
+    if args.output:
+        pathlib.Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        compare(json.loads(pathlib.Path(args.compare).read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,7 @@
 
 paths=(src)  # If you wish to check more directories, you may add them to this list.
 
+# every hook runs in a single pass over the files, see src/run_hooks.py
 for path in "${paths[@]}"; do
-  for script in $(find "$path" -type f -name "[^_]*.sh"); do
-      eval ""$script" "$path""
-      echo -e "\nExecuting "$script""
-    done
+  python -m src.run_hooks "$path" "$@" || exit 1
 done
-
@@ -0,0 +1,505 @@
+"""
+Persistent cache of files the hooks already found clean.
+
+Results are stored in an SQLite database inside the .git directory, keyed by
+the git blob SHA of the file contents and by a key identifying the hook, its
+version and its configuration. A file whose key is already marked clean can be
+skipped without running the hook on it. The least recently used entries are
+evicted once the cache holds more than max_entries results.
+
+Working tree files are only hashed when their stat data changed since a
+previous run hashed them, like git does for its index. The SHAs are computed
+by the workers from the contents they read anyway, so the main process never
+reads the files.
+
+The same database memoizes the results of hooks on parts of files, e.g. the
+formatted docstrings, keyed by a digest of the part and the hook key.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import subprocess
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+CACHE_FILE_NAME = "hooks-cache.sqlite"
+MAX_ENTRIES = 100_000
+# memoized results kept in the memory of every process
+MEMORY_ENTRIES = 10_000
+# files modified this recently may change again without changing their stat data
+RACY_INTERVAL_NS = 2_000_000_000
+
+
+def blob_sha(contents: bytes) -> str:
+    """
+    Computes the SHA git assigns to a blob with the given contents.
+
+    :param contents: raw contents of the file.
+    :return: hexadecimal SHA-1 of the blob.
+    """
+    digest = hashlib.sha1(b"blob %d\0" % len(contents))
+    digest.update(contents)
+    return digest.hexdigest()
+
+
+def hook_key(name: str, version: int, config: str = "") -> str:
+    """
+    Identifies a hook whose results can be cached.
+
+    :param name: name of the hook.
+    :param version: version of the hook, bumped whenever its output changes.
+    :param config: serialized configuration of the hook.
+    :return: hexadecimal digest of the hook identity.
+    """
+    return hashlib.sha256(f"{name}\0{version}\0{config}".encode()).hexdigest()
+
+
+def stat_signature(path: Union[str, pathlib.Path]) -> Optional[str]:
+    """
+    Identifies the version of a file by its stat data. Files modified within
+    RACY_INTERVAL_NS are not identified, since they could be modified again
+    without changing their modification time.
+
+    :param path: path to the file.
+    :return: size, modification time and inode of the file, None if unknown.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    if time.time_ns() - stat.st_mtime_ns < RACY_INTERVAL_NS:
+        return None
+
+    return f"{stat.st_size}:{stat.st_mtime_ns}:{stat.st_ino}"
+
+
+def cache_database(path: str = ".") -> Optional[pathlib.Path]:
+    """
+    Finds the location of the cache database for the repository containing the path.
+
+    :param path: path to a directory inside the repository.
+    :return: path to the database, None if the path is not inside a repository.
+    """
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cwd=path,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return pathlib.Path(output.decode().rstrip("\n")) / CACHE_FILE_NAME
+
+
+class ResultCache:
+    """
+    Clean results of a single hook. Lookups go straight to the database, while
+    new results and access times are written in a single transaction on close.
+    Without a database every lookup misses and nothing is stored.
+
+    The database also maps the stat data of the working tree files to the SHAs
+    of their contents, shared by all hooks.
+
+    :param database: path to the SQLite database, None to disable the cache.
+    :param hook: key returned by hook_key.
+    :param max_entries: number of results kept across all hooks.
+    """
+
+    def __init__(
+        self,
+        database: Optional[pathlib.Path],
+        hook: str,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.hook = hook
+        self.max_entries = max_entries
+        self.used = set()
+        self.signatures = {}
+        self.files = {}
+        self.connection = None
+
+        if database is not None:
+            self.connection = sqlite3.connect(str(database), timeout=30)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS clean "
+                "(key TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS clean_last_used ON clean (last_used)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, "
+                "signature TEXT NOT NULL, sha TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def enabled(self) -> bool:
+        return self.connection is not None
+
+    def is_clean(self, sha: Optional[str]) -> bool:
+        """
+        Checks if the hook already found contents with the given SHA clean.
+
+        :param sha: blob SHA of the contents, None if unknown.
+        :return: True if the contents are known to be clean, else False.
+        """
+        if not self.enabled or sha is None:
+            return False
+
+        key = f"{self.hook}:{sha}"
+        row = self.connection.execute(
+            "SELECT 1 FROM clean WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False
+
+        self.used.add(key)
+        return True
+
+    def file_sha(self, path: Union[str, pathlib.Path]) -> Optional[str]:
+        """
+        Finds the SHA of a working tree file hashed by a previous run, without
+        reading the file. The stat data of the file is remembered, so that the
+        SHA can be recorded once a worker computes it.
+
+        :param path: path to the file.
+        :return: blob SHA of the contents, None if the file changed or was never hashed.
+        """
+        if not self.enabled:
+            return None
+
+        path = os.path.abspath(path)
+        signature = stat_signature(path)
+        self.signatures[path] = signature
+        if signature is None:
+            return None
+
+        row = self.connection.execute(
+            "SELECT sha FROM files WHERE path = ? AND signature = ?",
+            (path, signature),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def mark_clean(
+        self, sha: Optional[str], path: Optional[Union[str, pathlib.Path]] = None
+    ) -> None:
+        """
+        Records that the hook found contents with the given SHA clean.
+
+        :param sha: blob SHA of the contents, None if unknown.
+        :param path: working tree file with the contents, previously looked up with file_sha.
+        """
+        if not self.enabled or sha is None:
+            return
+
+        self.used.add(f"{self.hook}:{sha}")
+        if path is not None:
+            path = os.path.abspath(path)
+            signature = self.signatures.get(path)
+            if signature is not None:
+                self.files[path] = (signature, sha)
+
+    def close(self) -> None:
+        """
+        Stores the new results, evicts the least recently used ones above
+        max_entries and closes the database.
+        """
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO clean (key, last_used) VALUES (?, ?)",
+                ((key, now) for key in self.used),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO files (path, signature, sha, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                ((path, *file, now) for path, file in self.files.items()),
+            )
+            for table, key in (("clean", "key"), ("files", "path")):
+                (count,) = self.connection.execute(
+                    f"SELECT COUNT(*) FROM {table}"
+                ).fetchone()
+                if count > self.max_entries:
+                    self.connection.execute(
+                        f"DELETE FROM {table} WHERE {key} IN "
+                        f"(SELECT {key} FROM {table} ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+
+        self.connection.close()
+        self.connection = None
+        self.used.clear()
+        self.signatures.clear()
+        self.files.clear()
+
+
+def open_cache(path: str, hook: str, enabled: bool = True) -> ResultCache:
+    """
+    Opens the result cache of the repository containing the path. The cache is
+    disabled outside of a repository.
+
+    :param path: path to a file or directory inside the repository.
+    :param hook: key returned by hook_key.
+    :param enabled: if False, a disabled cache is returned.
+    :return: result cache of the hook.
+    """
+    path = pathlib.Path(path)
+    directory = path if path.is_dir() else path.parent
+    return ResultCache(cache_database(directory) if enabled else None, hook)
+
+
+@dataclass
+class MemoUpdates:
+    """
+    Changes made to a memo cache since they were last drained, which can be
+    sent back from a worker process.
+
+    :param entries: new results serialized as JSON, by key.
+    :param used: keys of the results that were looked up.
+    :param hits: number of lookups that found a result.
+    :param misses: number of lookups that did not.
+    """
+
+    entries: Dict[str, str] = field(default_factory=dict)
+    used: Set[str] = field(default_factory=set)
+    hits: int = 0
+    misses: int = 0
+
+
+class MemoCache:
+    """
+    Results of a hook on parts of files, keyed by a digest of the text of the
+    part. The most recently used results are kept in memory, the rest are
+    looked up in the database. Like in ResultCache, new results and access
+    times are written in a single transaction on close and the least recently
+    used entries are evicted above max_entries. Without a database results are
+    only kept in memory.
+
+    Workers only read the database. A pickled cache is restored as the cache
+    shared by all tasks run in the worker process, whose changes are drained
+    after every file and merged into the cache of the main process.
+
+    :param database: path to the SQLite database, None to keep results in memory only.
+    :param hook: key returned by hook_key.
+    :param max_size: number of results kept in memory.
+    :param max_entries: number of results kept in the database across all hooks.
+    """
+
+    def __init__(
+        self,
+        database: Optional[pathlib.Path],
+        hook: str,
+        max_size: int = MEMORY_ENTRIES,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.database = database
+        self.hook = hook
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.updates = MemoUpdates()
+        self.merged_hits = 0
+        self.merged_misses = 0
+        self.connection = None
+
+        if database is not None:
+            self.connection = sqlite3.connect(str(database), timeout=30)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS memo "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS memo_last_used ON memo (last_used)"
+            )
+
+    def __enter__(self) -> "MemoCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return shared_memo_cache, (
+            self.database,
+            self.hook,
+            self.max_size,
+            self.max_entries,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.connection is not None
+
+    @property
+    def hits(self) -> int:
+        return self.merged_hits + self.updates.hits
+
+    @property
+    def misses(self) -> int:
+        return self.merged_misses + self.updates.misses
+
+    def key(self, text: str) -> str:
+        """
+        Computes the key of the result for the text.
+
+        :param text: part of a file passed to the hook.
+        :return: hook key followed by the SHA-256 of the text.
+        """
+        return f"{self.hook}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def get(self, text: str) -> Optional[Any]:
+        """
+        Looks up the result of the hook for the text.
+
+        :param text: part of a file passed to the hook.
+        :return: the result, None if it is not cached.
+        """
+        key = self.key(text)
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            value = self.memory[key]
+        else:
+            row = None
+            if self.enabled:
+                row = self.connection.execute(
+                    "SELECT value FROM memo WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                self.updates.misses += 1
+                return None
+            value = json.loads(row[0])
+            self._remember(key, value)
+
+        self.updates.used.add(key)
+        self.updates.hits += 1
+        return value
+
+    def put(self, text: str, value: Any) -> None:
+        """
+        Records the result of the hook for the text.
+
+        :param text: part of a file passed to the hook.
+        :param value: result serializable as JSON.
+        """
+        key = self.key(text)
+        self._remember(key, value)
+        self.updates.entries[key] = json.dumps(value)
+
+    def drain(self) -> MemoUpdates:
+        """
+        Collects the changes made since the last call.
+
+        :return: new results, used keys and the lookup counters.
+        """
+        updates = self.updates
+        self.updates = MemoUpdates()
+        return updates
+
+    def merge(self, updates: MemoUpdates) -> None:
+        """
+        Adds the changes drained from another cache of the same hook, so they
+        are stored on close.
+
+        :param updates: changes returned by drain.
+        """
+        self.updates.entries.update(updates.entries)
+        self.updates.used |= updates.used
+        self.merged_hits += updates.hits
+        self.merged_misses += updates.misses
+
+    def close(self) -> None:
+        """
+        Stores the new results, refreshes the access times of the used ones,
+        evicts the least recently used ones above max_entries and closes the
+        database.
+        """
+        if not self.enabled:
+            return
+
+        now = time.time()
+        entries = self.updates.entries
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO memo (key, value, last_used) VALUES (?, ?, ?)",
+                ((key, value, now) for key, value in entries.items()),
+            )
+            self.connection.executemany(
+                "UPDATE memo SET last_used = ? WHERE key = ?",
+                ((now, key) for key in self.updates.used if key not in entries),
+            )
+            (count,) = self.connection.execute("SELECT COUNT(*) FROM memo").fetchone()
+            if count > self.max_entries:
+                self.connection.execute(
+                    "DELETE FROM memo WHERE key IN "
+                    "(SELECT key FROM memo ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+        self.connection.close()
+        self.connection = None
+        self.merged_hits = self.hits
+        self.merged_misses = self.misses
+        self.updates = MemoUpdates()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+
+# caches restored in this process, by the arguments they were created with
+_shared_memo_caches: Dict[Tuple, MemoCache] = {}
+
+
+def shared_memo_cache(
+    database: Optional[pathlib.Path], hook: str, max_size: int, max_entries: int
+) -> MemoCache:
+    """
+    Returns the memo cache of the process for the database and hook, creating
+    it on first use. Pickled caches are restored with it, so the tasks run in a
+    worker process share their results.
+
+    :param database: path to the SQLite database, None to keep results in memory only.
+    :param hook: key returned by hook_key.
+    :param max_size: number of results kept in memory.
+    :param max_entries: number of results kept in the database across all hooks.
+    :return: memo cache shared within the process.
+    """
+    arguments = (database, hook, max_size, max_entries)
+    if arguments not in _shared_memo_caches:
+        _shared_memo_caches[arguments] = MemoCache(*arguments)
+
+    return _shared_memo_caches[arguments]
+
+
+def open_memo_cache(path: str, hook: str, enabled: bool = True) -> MemoCache:
+    """
+    Opens the memo cache of the repository containing the path. Outside of a
+    repository results are only kept in memory.
+
+    :param path: path to a file or directory inside the repository.
+    :param hook: key returned by hook_key.
+    :param enabled: if False, results are only kept in memory.
+    :return: memo cache of the hook.
+    """
+    path = pathlib.Path(path)
+    directory = path if path.is_dir() else path.parent
+    return MemoCache(cache_database(directory) if enabled else None, hook)
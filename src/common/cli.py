@@ -0,0 +1,326 @@
+"""
+Command line handling shared by the per-file hooks in src.
+"""
+import argparse
+import functools
+import pathlib
+import subprocess
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from src.common import tracing
+from src.common.cache import ResultCache, blob_sha, open_cache
+from src.common.git import BlobReader, staged_entries, staged_files
+from src.common.runner import FileResult, run_parallel
+from src.common.scanning import Buffer, Violation, mapped_file
+from src.common.sniffing import SNIFF_SIZE, is_binary, looks_binary
+from src.common.walker import compile_patterns, is_path_ignored, walk
+
+# result of a check, a violation or a flag telling whether the contents violate the hook
+Check = Union[bool, Optional[Violation]]
+
+
+class HookArgumentParser(argparse.ArgumentParser):
+    """
+    Command line argument parser for the per-file hooks.
+
+    :param description: description of the hook.
+    """
+
+    def __init__(self, description: str):
+        super().__init__(description=description)
+        self.add_argument("dir_name", help="Name of the directory to process")
+        self.add_argument(
+            "-j",
+            "--jobs",
+            help="Number of worker processes, defaults to the number of CPUs",
+            type=int,
+            default=0,
+        )
+        self.add_argument(
+            "-s",
+            "--staged",
+            help="Only process files staged for commit in the directory",
+            action="store_true",
+        )
+        self.add_argument(
+            "-c",
+            "--check",
+            help="Only report files that would be modified, without changing them. "
+            "Combined with --staged, the staged contents are checked",
+            action="store_true",
+        )
+        self.add_argument(
+            "-i",
+            "--ignore",
+            help="Ignore files or directories matching the patterns, in .gitignore "
+            "syntax. Files ignored by .gitignore are always skipped",
+            nargs="+",
+            default=[],
+        )
+        self.add_argument(
+            "--no-cache",
+            help="Process every file, even if it was found clean by a previous run",
+            action="store_true",
+        )
+        self.add_argument(
+            "--trace",
+            help="Write the time spent on every file and hook to the file, "
+            "in the Chrome trace-event format",
+            metavar="FILE",
+        )
+
+
+def collect_files(dir_name: str, ignore: Sequence[str] = ()) -> List[pathlib.Path]:
+    """
+    Finds all files in the directory that are not ignored.
+
+    :param dir_name: path to the directory.
+    :param ignore: extra patterns in .gitignore syntax, relative to the directory.
+    :return: sorted list of paths to the files.
+    """
+    return sorted(pathlib.Path(entry.path) for entry in walk(dir_name, ignore))
+
+
+def filter_ignored(
+    files: List[pathlib.Path], dir_name: str, ignore: Sequence[str]
+) -> List[pathlib.Path]:
+    """
+    Removes the files matching the patterns from a list of files in the directory.
+
+    :param files: paths to the files.
+    :param dir_name: path to the directory.
+    :param ignore: patterns in .gitignore syntax, relative to the directory.
+    :return: paths to the files that are not ignored.
+    """
+    if not ignore:
+        return files
+
+    patterns = compile_patterns(ignore)
+    root = pathlib.Path(dir_name).resolve()
+    return [
+        file
+        for file in files
+        if not is_path_ignored(patterns, file.resolve().relative_to(root).as_posix())
+    ]
+
+
+def check_contents(
+    file_name: str, contents: Buffer, check: Callable[[Buffer], Check]
+) -> FileResult:
+    """
+    Checks the contents of a file. Binary contents are never reported.
+
+    :param file_name: path to the file.
+    :param contents: raw contents of the file.
+    :param check: function returning a violation, or True, if the contents violate the hook.
+    :return: result of the check, describing the violation if there is one.
+    """
+    if looks_binary(contents[:SNIFF_SIZE]):
+        return FileResult(str(file_name))
+
+    with tracing.span(getattr(check, "__name__", "check"), "hook"):
+        violation = check(contents)
+    message = "" if isinstance(violation, bool) or violation is None else str(violation)
+
+    return FileResult(str(file_name), bool(violation), message=message)
+
+
+def check_file(
+    file_name: str, check: Callable[[Buffer], Check], hash_contents: bool = False
+) -> FileResult:
+    """
+    Checks the contents of the file in the working tree. The file is mapped
+    into memory instead of being read.
+
+    :param file_name: path to the file.
+    :param check: function returning a violation, or True, if the contents violate the hook.
+    :param hash_contents: if True, the SHA of clean text contents is returned with the result.
+    :return: result of the check.
+    """
+    with mapped_file(file_name) as contents:
+        result = check_contents(file_name, contents, check)
+        if hash_contents and not result.modified:
+            if not looks_binary(contents[:SNIFF_SIZE]):
+                result.sha = blob_sha(contents)
+
+        return result
+
+
+def run_hashed(file_name: str, func: Callable[[str], bool]) -> FileResult:
+    """
+    Runs the hook on the file in the working tree. The contents of a text file
+    the hook did not modify are hashed, so that the main process can mark them
+    clean without reading the file.
+
+    :param file_name: path to the file.
+    :param func: hook returning True if it modified the file.
+    :return: result of the hook with the SHA of the clean contents.
+    """
+    result = FileResult(str(file_name), bool(func(file_name)))
+    if not result.modified and not is_binary(file_name):
+        result.sha = blob_sha(pathlib.Path(file_name).read_bytes())
+
+    return result
+
+
+def check_staged_files(
+    files: List[pathlib.Path], check: Callable[[Buffer], Check], dir_name: str
+) -> List[FileResult]:
+    """
+    Checks the staged contents of the files, reading all of them through
+    a single git cat-file process.
+
+    :param files: paths to the staged files.
+    :param check: function returning a violation, or True, if the contents violate the hook.
+    :param dir_name: path to a directory inside the repository.
+    :return: results in the order of the files.
+    """
+    results = []
+
+    with BlobReader(dir_name) as reader:
+        for file in files:
+            try:
+                with tracing.span(str(file), "file"):
+                    contents = reader.read_staged(file)
+                    if contents is None:
+                        results.append(FileResult(str(file)))
+                    else:
+                        results.append(check_contents(file, contents, check))
+            except Exception as error:
+                results.append(
+                    FileResult(str(file), error=f"{type(error).__name__}: {error}")
+                )
+
+    return results
+
+
+def content_shas(
+    files: List[pathlib.Path], cache: ResultCache, staged: bool, dir_name: str
+) -> Dict[pathlib.Path, str]:
+    """
+    Finds the blob SHAs of the contents the hook will look at, without reading
+    the files. Staged SHAs are taken from the index, working tree files are
+    only known if their stat data did not change since a previous run.
+
+    :param files: paths to the files.
+    :param cache: result cache holding the SHAs of the working tree files.
+    :param staged: if True, the SHAs of the staged contents are returned.
+    :param dir_name: path to a directory inside the repository.
+    :return: mapping of the paths to the SHAs of their contents, if known.
+    """
+    if staged:
+        return {entry.path: entry.sha for entry in staged_entries(dir_name)}
+
+    return {file: cache.file_sha(file) for file in files}
+
+
+def skip_clean_files(
+    files: List[pathlib.Path], cache: ResultCache, staged: bool, dir_name: str
+) -> Dict[pathlib.Path, str]:
+    """
+    Looks up the files in the result cache.
+
+    :param files: paths to the files.
+    :param cache: result cache of the hook.
+    :param staged: if True, the staged contents are looked up.
+    :param dir_name: path to a directory inside the repository.
+    :return: mapping of the files not known to be clean to the SHAs of their contents, if known.
+    """
+    if not cache.enabled:
+        return dict.fromkeys(files)
+
+    shas = content_shas(files, cache, staged, dir_name)
+    return {
+        file: shas.get(file) for file in files if not cache.is_clean(shas.get(file))
+    }
+
+
+def report(results: List[FileResult], check: bool = False) -> int:
+    """
+    Prints the errors and the number of modified files. In check mode,
+    the files that would be modified are listed as well.
+
+    :param results: results of running the hook.
+    :param check: True if the hook was run in check mode.
+    :return: exit code, 1 if any file failed or, in check mode, would be modified, else 0.
+    """
+    errors = [result for result in results if result.error]
+    for result in errors:
+        print(f"{result.path}: {result.error}")
+
+    modified = [result for result in results if result.modified]
+
+    if check:
+        for result in modified:
+            print(f"{result.path}:{result.message or ' would be modified'}")
+        print(f"{len(modified)} files would be modified")
+        return 1 if errors or modified else 0
+
+    print(f"Modified {len(modified)} files")
+
+    return 1 if errors else 0
+
+
+def run_hook(
+    func: Callable[[str], bool],
+    args: argparse.Namespace,
+    check: Optional[Callable[[Buffer], Check]] = None,
+    cache_key: Optional[str] = None,
+) -> None:
+    """
+    Runs the hook on every file in the directory given on the command line
+    and exits with a non-zero code if any file failed. In check mode the files
+    are only checked with the check function. Files found clean by a previous
+    run with the same cache key are skipped. With --trace, the time spent on
+    every file and hook is written to the given file.
+
+    :param func: picklable hook returning True if it modified the file.
+    :param args: arguments parsed by HookArgumentParser.
+    :param check: picklable function returning a violation, or True, if file contents violate the hook.
+    :param cache_key: key identifying the hook in the result cache, None to disable it.
+    """
+    # check if file exists
+    if not pathlib.Path(args.dir_name).is_dir():
+        print("Dir does not exist")
+        sys.exit(1)
+
+    if args.trace:
+        tracing.start(args.trace)
+
+    if args.staged:
+        try:
+            files = staged_files(args.dir_name)
+        except subprocess.CalledProcessError:
+            # git already explained what went wrong
+            sys.exit(1)
+        files = filter_ignored(files, args.dir_name, args.ignore)
+    else:
+        files = collect_files(args.dir_name, args.ignore)
+
+    use_cache = cache_key is not None and not args.no_cache
+    with open_cache(args.dir_name, cache_key, enabled=use_cache) as cache:
+        shas = skip_clean_files(files, cache, args.check and args.staged, args.dir_name)
+        files = list(shas)
+
+        # working tree files are hashed by the workers, after running the hook
+        if args.check and args.staged:
+            results = check_staged_files(files, check, args.dir_name)
+        elif args.check:
+            results = run_parallel(
+                functools.partial(check_file, check=check, hash_contents=cache.enabled),
+                files,
+                args.jobs,
+            )
+        elif cache.enabled:
+            results = run_parallel(
+                functools.partial(run_hashed, func=func), files, args.jobs
+            )
+        else:
+            results = run_parallel(func, files, args.jobs)
+
+        for file, result in zip(files, results):
+            if not result.modified and not result.error:
+                cache.mark_clean(result.sha or shas[file], file)
+
+    sys.exit(report(results, check=args.check))
@@ -0,0 +1,67 @@
+"""
+Write layer shared by the hooks. Files are only rewritten when their contents
+actually change, and every write goes through a temporary sibling file that
+atomically replaces the original, so unchanged files keep their mtime and
+readers never observe a half-written file.
+"""
+import os
+import pathlib
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+
+@contextmanager
+def atomic_replace(file_name: str) -> Iterator[BinaryIO]:
+    """
+    Yields a temporary file created next to the given file. When the block
+    exits without an exception the temporary file takes over the permissions
+    of the original and replaces it, otherwise it is removed. Symbolic links
+    are resolved first, so the file they point to is replaced, not the link.
+
+    :param file_name: path to the file that is replaced.
+    :return: temporary file opened for binary writing.
+    """
+    path = pathlib.Path(os.path.realpath(file_name))
+
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as target:
+        try:
+            yield target
+        except BaseException:
+            target.close()
+            os.unlink(target.name)
+            raise
+
+    if path.exists():
+        shutil.copymode(path, target.name)
+    os.replace(target.name, path)
+
+
+def atomic_write(file_name: str, contents: bytes) -> None:
+    """
+    Writes the contents to the file through a temporary sibling file.
+
+    :param file_name: path to the file.
+    :param contents: new contents of the file.
+    """
+    with atomic_replace(file_name) as file:
+        file.write(contents)
+
+
+def write_if_changed(file_name: str, original: bytes, contents: bytes) -> bool:
+    """
+    Writes the contents to the file only if they differ from the original.
+
+    :param file_name: path to the file.
+    :param original: contents the file had when it was read.
+    :param contents: new contents of the file.
+    :return: True if the file was modified, else False.
+    """
+    if contents == original:
+        return False
+
+    atomic_write(file_name, contents)
+    return True
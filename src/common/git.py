@@ -0,0 +1,355 @@
+"""
+Helpers for querying the git repository the hooks are run in.
+"""
+import os
+import pathlib
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# file modes of index entries that do not point to regular file contents
+SYMLINK_MODE = "120000"
+GITLINK_MODE = "160000"
+# number of bytes discarded at once when skipping the rest of an object
+DRAIN_SIZE = 1024 * 1024
+
+
+def git(*args: str, cwd: str = ".") -> bytes:
+    """
+    Runs a git command and returns its standard output.
+
+    :param args: arguments passed to git.
+    :param cwd: directory the command is run in.
+    :return: standard output of the command.
+    """
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, stdout=subprocess.PIPE
+    ).stdout
+
+
+def repository_root(path: str = ".") -> pathlib.Path:
+    """
+    Finds the top-level directory of the working tree containing the path.
+
+    :param path: path to a file or directory inside the repository.
+    :return: path to the top-level directory.
+    """
+    path = pathlib.Path(path)
+    directory = path if path.is_dir() else path.parent
+    output = git("rev-parse", "--show-toplevel", cwd=directory)
+    return pathlib.Path(os.fsdecode(output.rstrip(b"\n")))
+
+
+def staged_files(path: str = ".") -> List[pathlib.Path]:
+    """
+    Lists the files that are added, copied, modified or renamed in the index,
+    limited to the given file or directory. Symbolic links and submodules
+    are skipped.
+
+    :param path: file or directory to look in.
+    :return: sorted list of paths to the staged files that exist in the working tree.
+    """
+    return [entry.path for entry in staged_entries(path) if entry.path.is_file()]
+
+
+@dataclass
+class StagedEntry:
+    """
+    File added, copied, modified or renamed in the index.
+
+    :param path: path to the file in the working tree.
+    :param mode: file mode of the staged entry, e.g. 100644.
+    :param sha: name of the staged blob.
+    """
+
+    path: pathlib.Path
+    mode: str
+    sha: str
+
+
+def staged_entries(path: str = ".") -> List[StagedEntry]:
+    """
+    Lists the entries that are added, copied, modified or renamed in the index,
+    limited to the given file or directory. Unlike staged_files, the entries
+    are read from the index alone, so files missing from the working tree
+    are listed as well. Symbolic links and submodules are skipped, since
+    their blobs are not file contents.
+
+    :param path: file or directory to look in.
+    :return: list of staged entries sorted by path.
+    """
+    path = pathlib.Path(path).resolve()
+    directory = path if path.is_dir() else path.parent
+    root = repository_root(directory)
+
+    output = git(
+        "diff",
+        "--cached",
+        "--raw",
+        "-z",
+        "--no-abbrev",
+        "--no-renames",
+        "--diff-filter=ACMR",
+        "--",
+        str(path),
+        cwd=directory,
+    )
+
+    entries = [
+        StagedEntry(root / os.fsdecode(name), mode, sha)
+        for name, mode, sha in parse_raw_diff(output)
+        if mode not in (SYMLINK_MODE, GITLINK_MODE)
+    ]
+
+    return sorted(entries, key=lambda entry: entry.path)
+
+
+def parse_raw_diff(output: bytes) -> List[Tuple[bytes, str, str]]:
+    """
+    Parses the output of a git diff command run with --raw -z --no-abbrev
+    and --no-renames.
+
+    :param output: standard output of the command.
+    :return: path, new file mode and new blob name of every entry.
+    """
+    # every entry is ":<old mode> <new mode> <old sha> <new sha> <status>"
+    # followed by the path, both terminated with NUL
+    fields = output.split(b"\0")
+    entries = []
+    for header, name in zip(fields[0::2], fields[1::2]):
+        _, mode, _, sha, _ = header.decode().split(" ")
+        entries.append((name, mode, sha))
+
+    return entries
+
+
+def is_null_sha(sha: str) -> bool:
+    """
+    Checks if the object name is the all-zero name git uses for a missing
+    revision, e.g. the old revision of a branch that is being created.
+
+    :param sha: object name.
+    :return: True if the name consists of zeros only, else False.
+    """
+    return set(sha) == {"0"}
+
+
+def empty_tree(path: str = ".") -> str:
+    """
+    Finds the name of the empty tree, which depends on the hash algorithm
+    of the repository.
+
+    :param path: path to a directory inside the repository.
+    :return: name of the empty tree.
+    """
+    return git("hash-object", "-t", "tree", os.devnull, cwd=path).decode().strip()
+
+
+@dataclass
+class TreeEntry:
+    """
+    File added, copied or modified between two revisions.
+
+    :param path: path to the file relative to the root of the repository, separated with slashes.
+    :param mode: file mode of the entry in the new revision, e.g. 100644.
+    :param sha: name of the blob in the new revision.
+    """
+
+    path: str
+    mode: str
+    sha: str
+
+
+def changed_entries(
+    old: str, new: str, path: str = ".", diff_filter: str = "ACMR"
+) -> List[TreeEntry]:
+    """
+    Lists the files that differ between two revisions without checking any
+    of them out. Works in bare repositories as well.
+
+    :param old: old revision, the empty tree is used if it is the all-zero name.
+    :param new: new revision.
+    :param path: path to a directory inside the repository.
+    :param diff_filter: statuses of the listed entries, as accepted by git diff --diff-filter.
+    :return: list of changed entries, sorted by path. Deleted entries have the all-zero name.
+    """
+    if is_null_sha(old):
+        old = empty_tree(path)
+
+    output = git(
+        "diff-tree",
+        "-r",
+        "-z",
+        "--no-abbrev",
+        "--no-renames",
+        f"--diff-filter={diff_filter}",
+        old,
+        new,
+        cwd=path,
+    )
+    entries = [
+        TreeEntry(os.fsdecode(name), mode, sha)
+        for name, mode, sha in parse_raw_diff(output)
+    ]
+
+    return sorted(entries, key=lambda entry: entry.path)
+
+
+def object_sizes(names: Iterable[str], path: str = ".") -> Dict[str, int]:
+    """
+    Finds the sizes of many objects with a single git cat-file --batch-check call.
+
+    :param names: names of the objects.
+    :param path: path to a directory inside the repository.
+    :return: mapping of the names of existing objects to their sizes in bytes.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+
+    output = subprocess.run(
+        ["git", "cat-file", "--batch-check=%(objectname) %(objectsize)"],
+        cwd=path,
+        check=True,
+        input="".join(f"{name}\n" for name in names).encode(),
+        stdout=subprocess.PIPE,
+    ).stdout
+
+    sizes = {}
+    for name, line in zip(names, output.decode().splitlines()):
+        if not line.endswith(" missing"):
+            sizes[name] = int(line.split(" ")[1])
+
+    return sizes
+
+
+def tree_entries(revision: str, path: str = ".") -> List[TreeEntry]:
+    """
+    Lists every file of a revision without checking it out.
+
+    :param revision: revision to list.
+    :param path: path to a directory inside the repository.
+    :return: list of entries, sorted by path.
+    """
+    output = git("ls-tree", "-r", "-z", "--full-tree", revision, cwd=path)
+
+    entries = []
+    # every entry is "<mode> <type> <sha>\t<path>" terminated with NUL
+    for record in output.split(b"\0"):
+        if record:
+            header, name = record.split(b"\t", 1)
+            mode, _, sha = header.decode().split(" ")
+            entries.append(TreeEntry(os.fsdecode(name), mode, sha))
+
+    return sorted(entries, key=lambda entry: entry.path)
+
+
+def git_directory(path: str = ".") -> pathlib.Path:
+    """
+    Finds the git directory of the repository, which is the repository itself
+    if it is bare.
+
+    :param path: path to a directory inside the repository.
+    :return: absolute path to the git directory.
+    """
+    output = git("rev-parse", "--absolute-git-dir", cwd=path)
+    return pathlib.Path(os.fsdecode(output.rstrip(b"\n")))
+
+
+class BlobReader:
+    """
+    Reads objects from the repository through a single long-lived
+    git cat-file --batch process, so reading many blobs does not spawn
+    a process per file.
+
+    :param path: path to a file or directory inside the repository.
+    :param bare: True if the repository has no working tree, e.g. on a server. Staged files cannot be read then.
+    """
+
+    def __init__(self, path: str = ".", bare: bool = False):
+        self.root = pathlib.Path(path) if bare else repository_root(path)
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the git process.
+        """
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+    def read(self, name: str) -> Optional[bytes]:
+        """
+        Reads the contents of an object.
+
+        :param name: object name understood by git, e.g. a SHA or ":<path>".
+        :return: contents of the object, None if it does not exist.
+        """
+        size = self._request(name)
+        if size is None:
+            return None
+
+        contents = self.process.stdout.read(size)
+        # every object is followed by a newline
+        self.process.stdout.read(1)
+
+        return contents
+
+    def read_prefix(self, name: str, length: int) -> Optional[bytes]:
+        """
+        Reads at most length bytes from the beginning of an object. The rest
+        of the object is discarded in chunks, without keeping it in memory.
+
+        :param name: object name understood by git, e.g. a SHA or ":<path>".
+        :param length: maximum number of bytes to return.
+        :return: beginning of the object, None if it does not exist.
+        """
+        size = self._request(name)
+        if size is None:
+            return None
+
+        prefix = self.process.stdout.read(min(size, length))
+
+        remaining = size - len(prefix)
+        while remaining:
+            chunk = self.process.stdout.read(min(remaining, DRAIN_SIZE))
+            if not chunk:
+                raise EOFError("git cat-file exited before sending the whole object")
+            remaining -= len(chunk)
+        self.process.stdout.read(1)
+
+        return prefix
+
+    def _request(self, name: str) -> Optional[int]:
+        if "\n" in name:
+            raise ValueError(f"Object name cannot contain a newline: {name!r}")
+
+        self.process.stdin.write(os.fsencode(name) + b"\n")
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline()
+        if header.endswith(b" missing\n"):
+            return None
+
+        return int(header.split()[2])
+
+    def read_staged(self, path: str) -> Optional[bytes]:
+        """
+        Reads the contents of a file as staged in the index.
+
+        :param path: path to the file in the working tree.
+        :return: staged contents of the file, None if the file is not in the index.
+        """
+        path = pathlib.Path(path).resolve().relative_to(self.root)
+        return self.read(f":{path.as_posix()}")
@@ -0,0 +1,148 @@
+"""
+Single-pass text normalization engine shared by the file hooks.
+
+Every transform is a pure function over the file contents. The engine reads
+each file once, applies the selected transforms in order and writes the
+result back only if it changed, so combining several hooks costs a single
+read and at most one write.
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence, Union
+
+from src.common import tracing
+from src.common.cache import hook_key
+from src.common.file_writer import write_if_changed
+from src.common.scanning import Buffer
+from src.common.sniffing import SNIFF_SIZE, is_binary, looks_binary
+
+ENCODING = "utf-8"
+
+
+@dataclass(frozen=True)
+class Transform:
+    """
+    A single content transformation applied by the normalization engine.
+
+    :param name: name of the hook the transform belongs to.
+    :param apply: function transforming the file contents.
+    :param binary: if True, the transform operates on raw bytes instead of decoded text.
+    :param version: version of the transform, bumped whenever its output changes.
+    """
+
+    name: str
+    apply: Callable[[Union[bytes, str]], Union[bytes, str]]
+    binary: bool = False
+    version: int = 1
+
+
+def transforms_key(transforms: Sequence[Transform]) -> str:
+    """
+    Identifies the combination of transforms in the result cache.
+
+    :param transforms: transforms to apply.
+    :return: key accepted by the result cache.
+    """
+    config = ";".join(
+        f"{transform.name}.{transform.apply.__name__}@{transform.version}"
+        for transform in transforms
+    )
+    return hook_key("normalize", 1, config)
+
+
+def apply_transform(
+    transform: Transform,
+    contents: Union[bytes, str],
+    timings: Optional[Dict[str, float]] = None,
+) -> Union[bytes, str]:
+    """
+    Applies a single transform, optionally measuring how long it takes.
+
+    :param transform: transform to apply.
+    :param contents: contents of the file, raw or decoded depending on the transform.
+    :param timings: seconds spent in each transform, updated in place if given.
+    :return: transformed contents.
+    """
+    with tracing.span(transform.name, "hook"):
+        if timings is None:
+            return transform.apply(contents)
+
+        start = time.perf_counter()
+        contents = transform.apply(contents)
+        timings[transform.name] = (
+            timings.get(transform.name, 0.0) + time.perf_counter() - start
+        )
+
+    return contents
+
+
+def normalize_contents(
+    contents: bytes,
+    transforms: Sequence[Transform],
+    timings: Optional[Dict[str, float]] = None,
+) -> bytes:
+    """
+    Applies the transforms to the contents. Binary transforms are applied first,
+    then the contents are decoded once and the text transforms are applied.
+
+    :param contents: raw contents of the file.
+    :param transforms: transforms to apply.
+    :param timings: seconds spent in each transform, updated in place if given.
+    :return: normalized contents of the file.
+    """
+    for transform in transforms:
+        if transform.binary:
+            contents = apply_transform(transform, contents, timings)
+
+    text_transforms = [transform for transform in transforms if not transform.binary]
+    if not text_transforms:
+        return contents
+
+    text = contents.decode(ENCODING)
+    for transform in text_transforms:
+        text = apply_transform(transform, text, timings)
+
+    return text.encode(ENCODING)
+
+
+def needs_normalization(contents: Buffer, transforms: Sequence[Transform]) -> bool:
+    """
+    Checks if any of the transforms would change the contents. Binary contents
+    are never reported.
+
+    :param contents: raw contents of the file, possibly memory-mapped.
+    :param transforms: transforms to check.
+    :return: True if the contents would be modified, else False.
+    """
+    if looks_binary(contents[:SNIFF_SIZE]):
+        return False
+
+    # memory-mapped files are copied, since the transforms need bytes
+    contents = bytes(contents)
+    return normalize_contents(contents, transforms) != contents
+
+
+def normalize_file(
+    file_name: str,
+    transforms: Sequence[Transform],
+    timings: Optional[Dict[str, float]] = None,
+) -> bool:
+    """
+    Applies the transforms to the file with a single read and at most one write.
+    Binary files are skipped without being read in full.
+
+    :param file_name: path to the file.
+    :param transforms: transforms to apply.
+    :param timings: seconds spent in each transform, updated in place if given.
+    :return: True if the file was modified, else False.
+    """
+    if is_binary(file_name):
+        return False
+
+    # read file contents
+    with open(file_name, "rb") as file:
+        original = file.read()
+
+    contents = normalize_contents(original, transforms, timings)
+
+    return write_if_changed(file_name, original, contents)
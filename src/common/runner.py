@@ -0,0 +1,158 @@
+"""
+Runs a per-file hook over many files using a pool of worker processes.
+
+Small files are grouped into batches so a single task carries enough work to
+outweigh the inter-process communication overhead. Results are returned in
+the order of the input paths, regardless of the order the workers finish in.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.common import tracing
+
+# a batch is closed once its files add up to this many bytes
+BATCH_SIZE = 1024 * 1024
+# ... or once it holds this many files
+BATCH_LENGTH = 64
+
+
+@dataclass
+class FileResult:
+    """
+    Outcome of running a hook on a single file.
+
+    :param path: path to the file.
+    :param modified: True if the hook modified the file.
+    :param error: description of the error raised by the hook, if any.
+    :param timings: seconds spent in each of the hooks run on the file.
+    :param message: description of the violation found in check mode, if any.
+    :param sha: blob SHA of the contents the hook found clean, if it was computed.
+    """
+
+    path: str
+    modified: bool = False
+    error: str = ""
+    timings: Dict[str, float] = field(default_factory=dict)
+    message: str = ""
+    sha: Optional[str] = None
+
+
+def make_batches(
+    paths: Sequence[str],
+    batch_size: int = BATCH_SIZE,
+    batch_length: int = BATCH_LENGTH,
+) -> List[List[str]]:
+    """
+    Groups consecutive paths into batches of roughly batch_size bytes.
+    Files larger than batch_size end up in a batch of their own.
+
+    :param paths: paths to the files.
+    :param batch_size: maximum number of bytes in a batch.
+    :param batch_length: maximum number of files in a batch.
+    :return: list of batches.
+    """
+    batches = []
+    batch = []
+    total_size = 0
+
+    for path in paths:
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            size = 0
+
+        if batch and (total_size + size > batch_size or len(batch) >= batch_length):
+            batches.append(batch)
+            batch = []
+            total_size = 0
+
+        batch.append(path)
+        total_size += size
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def run_batch(
+    func: Callable[[str], Union[bool, FileResult]], batch: Sequence[str]
+) -> List[FileResult]:
+    """
+    Runs the hook on every file of the batch, collecting errors instead of
+    raising them.
+
+    :param func: hook returning True if it modified the file, or a complete result.
+    :param batch: paths to the files.
+    :return: results in the order of the batch.
+    """
+    results = []
+
+    for path in batch:
+        try:
+            with tracing.span(str(path), "file"):
+                result = func(path)
+            if not isinstance(result, FileResult):
+                result = FileResult(str(path), bool(result))
+            results.append(result)
+        except Exception as error:
+            results.append(
+                FileResult(str(path), error=f"{type(error).__name__}: {error}")
+            )
+
+    return results
+
+
+def run_traced_batch(
+    func: Callable[[str], Union[bool, FileResult]], batch: Sequence[str]
+) -> Tuple[List[FileResult], List[Dict]]:
+    """
+    Runs the batch in a worker process with tracing enabled.
+
+    :param func: hook returning True if it modified the file, or a complete result.
+    :param batch: paths to the files.
+    :return: results in the order of the batch and the spans recorded while running it.
+    """
+    tracing.enable()
+    results = run_batch(func, batch)
+    return results, tracing.drain()
+
+
+def run_parallel(
+    func: Callable[[str], Union[bool, FileResult]],
+    paths: Sequence[str],
+    jobs: int = 0,
+    batch_size: int = BATCH_SIZE,
+    batch_length: int = BATCH_LENGTH,
+) -> List[FileResult]:
+    """
+    Runs the hook on every file using up to jobs worker processes.
+
+    :param func: picklable hook returning True if it modified the file, or a complete result.
+    :param paths: paths to the files.
+    :param jobs: number of worker processes, the number of CPUs if 0.
+    :param batch_size: maximum number of bytes in a batch.
+    :param batch_length: maximum number of files in a batch.
+    :return: results in the order of the paths.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    batches = make_batches(paths, batch_size, batch_length)
+
+    if jobs == 1 or len(batches) <= 1:
+        return [result for batch in batches for result in run_batch(func, batch)]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as executor:
+        if not tracing.is_enabled():
+            futures = [executor.submit(run_batch, func, batch) for batch in batches]
+            return [result for future in futures for result in future.result()]
+
+        futures = [executor.submit(run_traced_batch, func, batch) for batch in batches]
+        results = []
+        for future in futures:
+            batch_results, events = future.result()
+            results.extend(batch_results)
+            tracing.merge(events)
+
+        return results
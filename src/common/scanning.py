@@ -0,0 +1,109 @@
+"""
+Byte-level violation scanners used by the check mode of the hooks.
+
+The scanners work on any bytes-like object, including memory-mapped files,
+and locate violations with bytes regexes and find, without decoding the
+contents or splitting them into lines.
+"""
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+# number of bytes counted at once when computing line numbers
+COUNT_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Violation:
+    """
+    First violation of a rule found in a file.
+
+    :param line: number of the line holding the first violation, starting from 1.
+    :param offset: byte offset of the first violation.
+    :param count: total number of violations in the file.
+    :param message: description of the rule.
+    """
+
+    line: int
+    offset: int
+    count: int
+    message: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.line}: {self.message} at byte {self.offset} ({self.count} in total)"
+        )
+
+
+def line_number(contents: Buffer, offset: int) -> int:
+    """
+    Finds the number of the line holding the byte at the offset. Newlines are
+    counted in chunks, so no copy of the whole prefix is made.
+
+    :param contents: raw contents of the file.
+    :param offset: byte offset.
+    :return: line number, starting from 1.
+    """
+    newlines = 0
+    for start in range(0, offset, COUNT_CHUNK_SIZE):
+        newlines += contents[start : min(start + COUNT_CHUNK_SIZE, offset)].count(b"\n")
+
+    return newlines + 1
+
+
+def count_bytes(contents: Buffer, byte: bytes, start: int = 0) -> int:
+    """
+    Counts the occurrences of a single byte in chunks.
+
+    :param contents: raw contents of the file.
+    :param byte: byte to count.
+    :param start: offset to count from.
+    :return: number of occurrences.
+    """
+    return sum(
+        contents[index : index + COUNT_CHUNK_SIZE].count(byte)
+        for index in range(start, len(contents), COUNT_CHUNK_SIZE)
+    )
+
+
+def scan_byte(contents: Buffer, byte: bytes, message: str) -> Optional[Violation]:
+    """
+    Finds every occurrence of a single byte.
+
+    :param contents: raw contents of the file.
+    :param byte: forbidden byte.
+    :param message: description of the rule.
+    :return: first violation, None if there is none.
+    """
+    offset = contents.find(byte)
+    if offset == -1:
+        return None
+
+    return Violation(
+        line_number(contents, offset),
+        offset,
+        count_bytes(contents, byte, offset),
+        message,
+    )
+
+
+@contextmanager
+def mapped_file(file_name: str) -> Iterator[Buffer]:
+    """
+    Maps the file into memory for reading. Empty files cannot be mapped and
+    are represented by empty bytes.
+
+    :param file_name: path to the file.
+    :return: read-only view of the contents of the file.
+    """
+    with open(file_name, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+            yield contents
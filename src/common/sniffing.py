@@ -0,0 +1,86 @@
+"""
+Cheap binary/text classification used to skip binary files before they are
+read in full. Only the first few kilobytes of a file are inspected, and the
+verdict is cached per path, modification time and size.
+"""
+import codecs
+import functools
+import os
+
+# number of bytes inspected at the beginning of each file
+SNIFF_SIZE = 8192
+# byte order marks of text encodings that use NUL bytes, longest first
+UNICODE_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+# control characters that are common in text files
+TEXT_CONTROLS = set("\t\n\r\f\b\x1b")
+# share of other control characters above which data is not text
+CONTROL_RATIO = 0.3
+
+
+def looks_binary(head: bytes) -> bool:
+    """
+    Classifies a chunk of data taken from the beginning of a file.
+
+    :param head: first bytes of the file.
+    :return: True if the data contains NUL bytes or is not valid UTF-8, else False.
+    """
+    if b"\0" in head:
+        return True
+
+    # the chunk may end in the middle of a multibyte character, which must not
+    # be mistaken for invalid data
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        decoder.decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+
+    return False
+
+
+def looks_like_data(head: bytes) -> bool:
+    """
+    Classifies a chunk of data taken from the beginning of a file, accepting
+    text in any encoding. Unlike looks_binary, text that is not UTF-8, e.g.
+    latin-1 or UTF-16 with a byte order mark, is not reported.
+
+    :param head: first bytes of the file.
+    :return: True if the data contains NUL bytes or mostly control characters, else False.
+    """
+    text = head.decode("latin-1")
+    for bom, encoding in UNICODE_BOMS:
+        if head.startswith(bom):
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                text = decoder.decode(head[len(bom) :], final=False)
+            except UnicodeDecodeError:
+                return True
+            break
+    else:
+        if "\0" in text:
+            return True
+
+    controls = sum(1 for char in text if char < " " and char not in TEXT_CONTROLS)
+    return controls > len(text) * CONTROL_RATIO
+
+
+@functools.lru_cache(maxsize=65536)
+def _is_binary(path: str, mtime_ns: int, size: int) -> bool:
+    with open(path, "rb") as file:
+        return looks_binary(file.read(SNIFF_SIZE))
+
+
+def is_binary(file_name: str) -> bool:
+    """
+    Checks if the file is binary by reading only its first SNIFF_SIZE bytes.
+
+    :param file_name: path to the file.
+    :return: True if the file is binary, else False.
+    """
+    stat = os.stat(file_name)
+    return _is_binary(os.fspath(file_name), stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,139 @@
+"""
+Opt-in timing instrumentation in the Chrome trace-event format, which can be
+loaded in Perfetto or chrome://tracing.
+
+Spans are recorded only after enable() is called. Until then span() returns
+a shared no-op context manager, so instrumented code pays a single function
+call per span. Worker processes record their own spans, which are sent back
+to the parent with the results of every batch and merged into one trace.
+"""
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    """
+    Collects the spans recorded in the current process.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.pid = os.getpid()
+        self.events: List[Dict] = []
+
+    def reset_after_fork(self) -> None:
+        """
+        Drops the spans inherited from the parent process.
+        """
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.events = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, args: Dict):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (time.perf_counter_ns() - start) / 1000,
+                "pid": self.pid,
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+
+_tracer = Tracer()
+
+
+def enable() -> None:
+    """
+    Starts recording spans in the current process.
+    """
+    _tracer.reset_after_fork()
+    _tracer.enabled = True
+
+
+def start(file_name: str) -> None:
+    """
+    Enables tracing and writes the trace to the file when the process exits,
+    including exits through sys.exit.
+
+    :param file_name: path to the output file.
+    """
+    enable()
+    atexit.register(write, file_name)
+
+
+def is_enabled() -> bool:
+    return _tracer.enabled
+
+
+def span(name: str, category: str = "", **args):
+    """
+    Records the time spent in the block as a complete event.
+
+    :param name: name of the span, e.g. the path to a file or the name of a hook.
+    :param category: category of the span, e.g. file, hook, filter or validator.
+    :param args: extra values shown with the span.
+    :return: context manager measuring the block, a no-op if tracing is disabled.
+    """
+    if not _tracer.enabled:
+        return _NULL_SPAN
+
+    return _tracer.span(name, category, args)
+
+
+def drain() -> List[Dict]:
+    """
+    Removes and returns the spans recorded so far in the current process.
+
+    :return: recorded events.
+    """
+    _tracer.reset_after_fork()
+    events, _tracer.events = _tracer.events, []
+    return events
+
+
+def merge(events: List[Dict]) -> None:
+    """
+    Adds spans recorded by another process.
+
+    :param events: events returned by drain in the other process.
+    """
+    _tracer.events.extend(events)
+
+
+def write(file_name: str) -> None:
+    """
+    Writes the recorded spans to a JSON file in the Chrome trace-event format.
+
+    :param file_name: path to the output file.
+    """
+    events = drain()
+    main_pid = os.getpid()
+    metadata = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "args": {"name": "main" if pid == main_pid else f"worker {pid}"},
+        }
+        for pid in sorted({event["pid"] for event in events} | {main_pid})
+    ]
+
+    with open(file_name, "w") as file:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,307 @@
+"""
+Directory walker shared by the hooks.
+
+The walker reads the .gitignore file of every directory it enters and prunes
+ignored directories before descending into them, so ignored trees such as
+.git, node_modules, virtual environments or build outputs are never listed.
+Inside a git repository, the .gitignore files of the directories above the
+walked one, .git/info/exclude and core.excludesFile apply as well, like they
+do for git.
+Patterns follow the .gitignore syntax and are compiled once. Files are yielded
+as os.DirEntry objects, which cache the file type and stat results.
+"""
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+
+GITIGNORE = ".gitignore"
+# directories that are never walked
+ALWAYS_IGNORED = (".git",)
+
+
+@dataclass(frozen=True)
+class IgnorePattern:
+    """
+    Single compiled .gitignore pattern.
+
+    :param regex: compiled pattern.
+    :param negated: True if the pattern re-includes the paths it matches.
+    :param directory_only: True if the pattern only matches directories.
+    :param anchored: True if the pattern is matched against the path relative to base instead of the name.
+    :param base: path of the directory holding the pattern, relative to the root of the walk.
+    """
+
+    regex: Pattern[str]
+    negated: bool = False
+    directory_only: bool = False
+    anchored: bool = False
+    base: str = ""
+
+    def matches(self, path: str, name: str, is_dir: bool) -> bool:
+        """
+        Checks if the pattern matches the path.
+
+        :param path: path relative to the walked directory, separated with slashes.
+        :param name: last component of the path.
+        :param is_dir: True if the path is a directory.
+        :return: True if the pattern matches, else False.
+        """
+        if self.directory_only and not is_dir:
+            return False
+
+        if not self.anchored:
+            return self.regex.fullmatch(name) is not None
+
+        if self.base:
+            if not path.startswith(self.base + "/"):
+                return False
+            path = path[len(self.base) + 1 :]
+
+        return self.regex.fullmatch(path) is not None
+
+
+def translate(pattern: str) -> str:
+    """
+    Translates a .gitignore glob into a regular expression.
+
+    :param pattern: glob without the negation and the leading or trailing slash.
+    :return: regular expression matching the same paths.
+    """
+    regex = []
+    index = 0
+
+    while index < len(pattern):
+        char = pattern[index]
+
+        if pattern.startswith("**/", index) and (
+            index == 0 or pattern[index - 1] == "/"
+        ):
+            regex.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index) and index + 2 == len(pattern):
+            regex.append(".*")
+            index += 2
+            continue
+
+        if char == "\\" and index + 1 < len(pattern):
+            regex.append(re.escape(pattern[index + 1]))
+            index += 2
+            continue
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                chars = pattern[index + 1 : end]
+                if chars[0] == "!":
+                    chars = "^" + chars[1:]
+                regex.append(f"[{chars.replace(chr(92), chr(92) * 2)}]")
+                index = end
+        else:
+            regex.append(re.escape(char))
+
+        index += 1
+
+    return "".join(regex)
+
+
+def compile_patterns(lines: Iterable[str], base: str = "") -> List[IgnorePattern]:
+    """
+    Compiles the patterns of a .gitignore file.
+
+    :param lines: lines of the file.
+    :param base: path of the directory holding the file, relative to the walked directory.
+    :return: compiled patterns, in the order of the lines.
+    """
+    patterns = []
+
+    for line in lines:
+        line = line.rstrip("\n")
+        # trailing spaces are ignored unless escaped
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        # a slash anywhere but at the end anchors the pattern to its directory
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+
+        patterns.append(
+            IgnorePattern(
+                re.compile(translate(line)), negated, directory_only, anchored, base
+            )
+        )
+
+    return patterns
+
+
+def is_ignored(
+    patterns: List[IgnorePattern], path: str, name: str, is_dir: bool
+) -> bool:
+    """
+    Checks if the path is ignored. The last matching pattern decides.
+
+    :param patterns: compiled patterns, in order of precedence.
+    :param path: path relative to the walked directory, separated with slashes.
+    :param name: last component of the path.
+    :param is_dir: True if the path is a directory.
+    :return: True if the path is ignored, else False.
+    """
+    if is_dir and name in ALWAYS_IGNORED:
+        return True
+
+    for pattern in reversed(patterns):
+        if pattern.matches(path, name, is_dir):
+            return not pattern.negated
+
+    return False
+
+
+def is_path_ignored(patterns: List[IgnorePattern], path: str) -> bool:
+    """
+    Checks if a file or any of the directories containing it is ignored.
+
+    :param patterns: compiled patterns, in order of precedence.
+    :param path: path to the file relative to the walked directory, separated with slashes.
+    :return: True if the file is ignored, else False.
+    """
+    parts = path.split("/")
+    for index, name in enumerate(parts):
+        is_dir = index < len(parts) - 1
+        if is_ignored(patterns, "/".join(parts[: index + 1]), name, is_dir):
+            return True
+
+    return False
+
+
+def read_patterns(file_name: str, base: str = "") -> List[IgnorePattern]:
+    try:
+        with open(file_name, encoding="utf-8") as file:
+            return compile_patterns(file, base)
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+def read_gitignore(directory: str, base: str) -> List[IgnorePattern]:
+    return read_patterns(os.path.join(directory, GITIGNORE), base)
+
+
+def git_output(directory: str, *args: str) -> Optional[List[str]]:
+    try:
+        output = subprocess.run(
+            ["git", *args],
+            cwd=directory,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return os.fsdecode(output).splitlines()
+
+
+def excludes_file(directory: str) -> str:
+    """
+    Finds the file with the patterns every repository of the user ignores.
+
+    :param directory: path to a directory inside the repository.
+    :return: path to the file set by core.excludesFile, or its default location.
+    """
+    configured = git_output(directory, "config", "--path", "--get", "core.excludesFile")
+    if configured:
+        return configured[0]
+
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    return os.path.join(config_home, "git", "ignore")
+
+
+def repository_patterns(dir_name: str) -> Tuple[str, List[IgnorePattern]]:
+    """
+    Reads the patterns applying to the directory from above it: the exclude
+    files of the repository and the .gitignore files of the directories
+    between the root of the repository and the directory. Patterns are
+    relative to the root of the repository. Outside of a repository, the path
+    is empty and there are no patterns.
+
+    :param dir_name: path to the directory.
+    :return: path of the directory relative to the root and the patterns in order of precedence.
+    """
+    output = git_output(dir_name, "rev-parse", "--show-toplevel", "--git-common-dir")
+    if not output or len(output) != 2:
+        return "", []
+
+    root, git_dir = output
+    prefix = os.path.relpath(os.path.realpath(dir_name), root)
+    if prefix == os.curdir:
+        prefix = ""
+    elif prefix.startswith(os.pardir):
+        return "", []
+    prefix = prefix.replace(os.sep, "/")
+
+    patterns = read_patterns(excludes_file(dir_name))
+    patterns += read_patterns(os.path.join(dir_name, git_dir, "info", "exclude"))
+    base = ""
+    for part in prefix.split("/") if prefix else []:
+        patterns += read_gitignore(os.path.join(root, base), base)
+        base = f"{base}/{part}" if base else part
+
+    return prefix, patterns
+
+
+def walk(dir_name: str, ignore: Iterable[str] = ()) -> Iterator[os.DirEntry]:
+    """
+    Yields the files in the directory that are not ignored by the .gitignore
+    files, the exclude files of the repository or the extra patterns. Ignored
+    directories are pruned without being listed. Symbolic links are skipped,
+    so the hooks never rewrite a file outside of the directory through a link.
+
+    :param dir_name: path to the directory.
+    :param ignore: extra patterns in .gitignore syntax, relative to the directory.
+    :return: iterator over the entries of the files.
+    """
+    dir_name = os.fspath(dir_name)
+    # paths are matched relative to the root of the repository
+    prefix, patterns = repository_patterns(dir_name)
+    extra = compile_patterns(ignore, prefix)
+    patterns += read_gitignore(dir_name, prefix) + extra
+    stack = [(dir_name, prefix, patterns)]
+
+    while stack:
+        directory, relative, patterns = stack.pop()
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                path = f"{relative}/{entry.name}" if relative else entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_ignored(patterns, path, entry.name, is_dir):
+                    continue
+
+                if is_dir:
+                    nested = read_gitignore(entry.path, path)
+                    # extra patterns take precedence over every .gitignore file
+                    if nested:
+                        nested = patterns[: len(patterns) - len(extra)] + nested + extra
+                    stack.append((entry.path, path, nested or patterns))
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
@@ -1,29 +1,226 @@
+"""
+Replaces spaces with underscores and upper case letters with lower case ones
+in the names of all files and directories in a directory.
+
+The tree is walked once and every rename is planned before any is applied.
+Renames are ordered bottom-up, so renaming a directory never invalidates the
+paths of the entries beneath it, and names that would end up identical are
+reported instead of overwriting one another.
+"""
+import argparse
+import os
 import pathlib
+import shlex
 import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set
+
+
+@dataclass(frozen=True)
+class Rename:
+    """
+    Single planned rename.
+
+    :param source: current path of the file or directory.
+    :param target: path after the rename.
+    """
+
+    source: pathlib.Path
+    target: pathlib.Path
+
+
+@dataclass
+class RenamePlan:
+    """
+    Renames needed to correct the names in a directory tree.
+
+    :param renames: renames ordered so that entries are renamed before the directories containing them.
+    :param collisions: groups of paths whose corrected names are identical, keyed by that name.
+    """
+
+    renames: List[Rename] = field(default_factory=list)
+    collisions: Dict[pathlib.Path, List[pathlib.Path]] = field(default_factory=dict)
+
+
+def corrected_name(name: str) -> str:
+    """
+    Corrects a single path component.
+
+    :param name: name of the file or directory.
+    :return: name with spaces replaced by underscores, in lower case.
+    """
+    return name.replace(" ", "_").lower()
 
 
 def correct_file_name(file_name: str) -> None:
     path = pathlib.Path(file_name)
-    correct_file_name = path.name.replace(" ", "_").lower()
+    correct_file_name = corrected_name(path.name)
 
     if correct_file_name != path.name:
         path.rename(path.absolute().parent / correct_file_name)
 
 
-if __name__ == "__main__":
-    # check if user provided file name
-    if len(sys.argv) != 2:
-        print("Usage: python correct_file_names.py <dir_name>")
-        exit()
+def plan_directory(
+    plan: RenamePlan, directory: str, names: Iterable[str], existing: Iterable[str] = ()
+) -> None:
+    """
+    Adds the renames of entries of a single directory to the plan.
 
-    # check if file exists
-    file_name = sys.argv[1]
+    :param plan: plan to extend.
+    :param directory: path to the directory.
+    :param names: names of the entries to correct.
+    :param existing: names of all entries in the directory, which the renamed entries must not replace.
+    """
+    targets: Dict[str, List[str]] = {}
+    for name in names:
+        targets.setdefault(corrected_name(name), []).append(name)
+
+    existing = set(existing)
+    for target, names in targets.items():
+        # an entry that is not corrected itself, e.g. an ignored file
+        if target not in names and target in existing:
+            names = [*names, target]
+        if len(names) > 1:
+            plan.collisions[pathlib.Path(directory, target)] = sorted(
+                pathlib.Path(directory, name) for name in names
+            )
+        elif names[0] != target:
+            plan.renames.append(
+                Rename(
+                    pathlib.Path(directory, names[0]), pathlib.Path(directory, target)
+                )
+            )
+
+
+def sort_renames(plan: RenamePlan) -> RenamePlan:
+    """
+    Orders the renames so that entries are renamed before their directories.
+
+    :param plan: plan to sort in place.
+    :return: the sorted plan.
+    """
+    # deepest entries first, so the parents in their paths are not renamed yet
+    plan.renames.sort(key=lambda rename: (-len(rename.source.parts), rename.source))
+    return plan
+
+
+def plan_renames(dir_name: str) -> RenamePlan:
+    """
+    Walks the directory once and plans the renames of all entries beneath it.
+    Hidden entries are skipped, along with everything inside them.
+
+    :param dir_name: path to the directory.
+    :return: planned renames and collisions.
+    """
+    plan = RenamePlan()
+    directories = [dir_name]
+
+    while directories:
+        directory = directories.pop()
+        names = []
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                names.append(entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
 
-    if not pathlib.Path(file_name).is_dir():
+        plan_directory(plan, directory, names)
+
+    return sort_renames(plan)
+
+
+def plan_file_renames(dir_name: str, files: Iterable[pathlib.Path]) -> RenamePlan:
+    """
+    Plans the renames of the files and of the directories containing them
+    beneath the directory, without walking it again. Hidden entries are
+    skipped, along with everything inside them, and entries that are not
+    listed, e.g. ignored files, are neither renamed nor replaced.
+
+    :param dir_name: path to the directory.
+    :param files: paths to files inside the directory.
+    :return: planned renames and collisions.
+    """
+    root = pathlib.Path(os.path.realpath(dir_name))
+    directories: Dict[pathlib.Path, Set[str]] = {}
+
+    for file in map(pathlib.Path, files):
+        path = pathlib.Path(os.path.realpath(file.parent), file.name)
+        directory = pathlib.Path(dir_name)
+        for part in path.relative_to(root).parts:
+            if part.startswith("."):
+                break
+            directories.setdefault(directory, set()).add(part)
+            directory = directory / part
+
+    plan = RenamePlan()
+    for directory, names in directories.items():
+        plan_directory(plan, directory, sorted(names), os.listdir(directory))
+
+    return sort_renames(plan)
+
+
+def apply_renames(renames: List[Rename]) -> None:
+    """
+    Applies the planned renames in order.
+
+    :param renames: renames returned by plan_renames.
+    """
+    for rename in renames:
+        os.rename(rename.source, rename.target)
+
+
+def git_mv_script(renames: List[Rename]) -> str:
+    """
+    Formats the planned renames as a batch of git mv commands.
+
+    :param renames: renames returned by plan_renames.
+    :return: shell script applying the renames with git mv.
+    """
+    return "".join(
+        f"git mv -- {shlex.quote(str(rename.source))} {shlex.quote(str(rename.target))}\n"
+        for rename in renames
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replaces spaces with underscores and upper case letters "
+        "with lower case ones in file and directory names."
+    )
+    parser.add_argument("dir_name", help="Name of the directory to process")
+    parser.add_argument(
+        "-g",
+        "--git-mv",
+        help="Print a batch of git mv commands instead of renaming the files",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    # check if file exists
+    if not pathlib.Path(args.dir_name).is_dir():
         print("Dir does not exist")
-        exit()
+        sys.exit(1)
+
+    plan = plan_renames(args.dir_name)
 
-    # find all files in directory and make sure last line is empty
-    for file in pathlib.Path(file_name).glob("**/*"):
-        if file.is_file() or file.is_dir():
-            correct_file_name(file)
+    for target, paths in plan.collisions.items():
+        print(
+            f"Cannot rename {', '.join(map(str, paths))}: all would become {target}",
+            file=sys.stderr,
+        )
+
+    if args.git_mv:
+        print(git_mv_script(plan.renames), end="")
+    else:
+        apply_renames(plan.renames)
+        print(f"Renamed {len(plan.renames)} files")
+
+    if plan.collisions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,37 @@
 
 correct_file_name ()
 {
-    new_name=$(echo "$1" | sed -e 's/ /_/g' | tr '[:upper:]' '[:lower:]')
-    if [ "$1" != "$new_name" ]; then
-        mv -T "$1" "$new_name"
+    local dir
+    local name
+    dir=$(dirname "$1")
+    name=$(basename "$1")
+
+    local new_name="${name// /_}"
+    new_name="${new_name,,}"
+
+    if [ "$name" != "$new_name" ]; then
+        # never overwrite an entry that already has the corrected name
+        if [ -e "${dir}/${new_name}" ]; then
+            echo "Cannot rename $1: ${dir}/${new_name} already exists!"
+            return 1
+        fi
+        mv -T "$1" "${dir}/${new_name}"
     fi
 }
 
 find_files ()
 {
+    local status=0
 
-    find "$1" -maxdepth 1 \( ! -regex '.*/\..*' \) | while read -r file
+    # a single traversal, listing the contents of every directory before the
+    # directory itself, so renaming it does not invalidate paths still to come
+    while IFS= read -r -d '' file
     do
         echo "$file"
-        correct_file_name "$file"
-        if [ "$1" != "$file" ] && [ -d "$file" ]; then
-            find_files "$file"
-        fi
-
-    done
+        correct_file_name "$file" || status=1
+    done < <(find "$1" -mindepth 1 -depth \( ! -path '*/.*' \) -print0)
 
+    return "$status"
 }
 
 main() {
@@ -31,9 +43,9 @@ main() {
     fi
 
     if [ "$1" == '.' ] || [ -d "${1}" ]; then
-        find_files "$1"
+        find_files "$1" || exit 1
     elif [ -f "${1}" ]; then
-        correct_file_name "$1"
+        correct_file_name "$1" || exit 1
     else
         echo "$1 is not a valid path!"
     fi
@@ -41,4 +53,3 @@ main() {
 }
 
 main "$@"
-
@@ -1,6 +1,7 @@
 """
 Classes responsible for storing configuration for the script formatter.
 """
+import hashlib
 import json
 from dataclasses import dataclass, fields, is_dataclass, asdict, field
 from pathlib import Path
@@ -371,6 +372,15 @@ class MainFormatterConfig:
 
         return from_dict(cls, config_dict)
 
+    def config_hash(self) -> str:
+        """
+        Computes a digest of the configuration, used to invalidate cached results.
+
+        :return: hexadecimal SHA-256 of the configuration.
+        """
+        config_json = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha256(config_json.encode()).hexdigest()
+
     def to_json(self, json_path: Path) -> None:
         # Recursively convert nested dataclasses to dictionaries
         config_dict = asdict(self)
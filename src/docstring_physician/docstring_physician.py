@@ -1,5 +1,11 @@
 import argparse
 from pathlib import Path
+from src.common import tracing
+from src.common.cache import blob_sha, hook_key, open_cache, open_memo_cache
+from src.common.cli import filter_ignored
+from src.common.git import BlobReader, staged_files
+from src.common.runner import run_parallel
+from src.common.walker import walk
 from src.docstring_physician.config.config import (
     MainFormatterConfig,
     ensure_config_file_exists,
@@ -25,9 +31,11 @@ from src.docstring_physician.filters.docstrings_validators.public_function_param
 from src.docstring_physician.filters.docstrings_validators.public_function_parameter_presence_validator import (
     PublicFunctionParameterPresenceValidator,
 )
-from src.docstring_physician.main_formatter import Formatter
+from src.docstring_physician.main_formatter import ENCODING, Formatter, print_diff
 
 CONFIG_PATH = Path(__file__).parent / "correct_docstrings_config.json"
+# bumped whenever the validators or filters change their results
+CACHE_VERSION = 3
 
 
 class CustomArgumentParser(argparse.ArgumentParser):
@@ -40,6 +48,10 @@ class CustomArgumentParser(argparse.ArgumentParser):
     :param format: Format the python script by correcting mistakes in docstrings.
     :param diff: Only print diffs, without applying changes.
     :param ignore: Ignore files or directories. Takes one or more arguments.
+    :param staged: Only process files staged for commit.
+    :param no_cache: Process every file, even if it was found clean by a previous run.
+    :param trace: Write the time spent on every file, filter and validator to the file.
+    :param jobs: Number of worker processes, defaults to the number of CPUs.
     """
 
     def __init__(self):
@@ -69,9 +81,34 @@ class CustomArgumentParser(argparse.ArgumentParser):
         self.add_argument(
             "-i",
             "--ignore",
-            help="Ignore files or directories. Takes one or more arguments",
+            help="Ignore files or directories matching the patterns, in .gitignore "
+            "syntax. Takes one or more arguments",
             nargs="+",
         )
+        self.add_argument(
+            "-s",
+            "--staged",
+            help="Only process files staged for commit",
+            action="store_true",
+        )
+        self.add_argument(
+            "--no-cache",
+            help="Process every file, even if it was found clean by a previous run",
+            action="store_true",
+        )
+        self.add_argument(
+            "--trace",
+            help="Write the time spent on every file, filter and validator to the "
+            "file, in the Chrome trace-event format",
+            metavar="FILE",
+        )
+        self.add_argument(
+            "-j",
+            "--jobs",
+            help="Number of worker processes, defaults to the number of CPUs",
+            type=int,
+            default=0,
+        )
 
 
 def main():
@@ -96,18 +133,27 @@ def main():
         print("Provided path is not valid!")
         exit(-1)
 
-    files_to_check = []
+    if args.trace:
+        tracing.start(args.trace)
 
-    if path.is_file():
-        files_to_check.append(path)
+    files_to_check = []
 
-    if path.is_dir():
-        files_to_check.extend(path.glob("**/*"))
+    if args.staged:
         files_to_check = [
-            path
-            for path in files_to_check
-            if path.is_file() and path.name.endswith(".py")
+            path for path in staged_files(path) if path.name.endswith(".py")
         ]
+        if path.is_dir():
+            files_to_check = filter_ignored(files_to_check, path, args.ignore or [])
+
+    elif path.is_file():
+        files_to_check.append(path)
+
+    elif path.is_dir():
+        files_to_check = sorted(
+            Path(entry.path)
+            for entry in walk(path, args.ignore or [])
+            if entry.name.endswith(".py")
+        )
 
     config = MainFormatterConfig.from_json(CONFIG_PATH)
 
@@ -120,12 +166,101 @@ def main():
     if not args.format:
         filter_pipeline.clear()
 
-    formatter = Formatter(validator_pipeline, filter_pipeline)
+    # formatted docstrings only depend on the filters and their configuration
+    docstring_cache = open_memo_cache(
+        path,
+        hook_key("docstring_physician.filters", CACHE_VERSION, config.config_hash()),
+        enabled=not args.no_cache,
+    )
+
+    formatter = Formatter(
+        validator_pipeline,
+        filter_pipeline,
+        docstring_cache=docstring_cache if args.format else None,
+    )
+
+    # results depend on the configuration and on which pipelines are enabled
+    cache_key = hook_key(
+        "docstring_physician",
+        CACHE_VERSION,
+        f"{config.config_hash()}:{args.check}:{args.format}",
+    )
 
-    for path in files_to_check:
-        formatter(path)
+    with open_cache(
+        path, cache_key, enabled=not args.no_cache
+    ) as cache, docstring_cache:
+        if args.staged and not args.format:
+            # nothing is formatted, so the staged contents are validated directly
+            # from the index through a single git process
+            passed = True
+            with BlobReader(path) as reader:
+                for path in files_to_check:
+                    contents = reader.read_staged(path)
+                    if contents is None:
+                        continue
+                    sha = blob_sha(contents)
+                    if cache.is_clean(sha):
+                        continue
+                    with tracing.span(str(path), "file"):
+                        clean = formatter.check(contents.decode(ENCODING).split("\n"))
+                    if clean:
+                        cache.mark_clean(sha)
+                    else:
+                        print(f"Docstrings are missing or incorrect in {path} :(")
+                        passed = False
+
+            print("Done.")
+            exit(0 if passed else 1)
+
+        # only files whose stat data changed since a previous run are read,
+        # their SHAs are computed by the workers
+        files_to_process = [
+            str(path)
+            for path in files_to_check
+            if not cache.is_clean(cache.file_sha(path))
+        ]
+
+        # files are processed in worker processes, which only return their
+        # results, so everything is reported once all files are done
+        results = run_parallel(formatter.process, files_to_process, args.jobs)
+
+        passed = True
+        for result in results:
+            if result.error:
+                print(f"{result.path}: {result.error}")
+                passed = False
+                continue
+            docstring_cache.merge(result.docstrings)
+            if result.diff:
+                print(f"printing diff for {result.path}")
+                print_diff(result.diff)
+            if not result.passed:
+                passed = False
+            elif not result.modified:
+                cache.mark_clean(result.sha, result.path)
+
+        errors = sorted(
+            (result.path, error)
+            for result in results
+            if not result.error
+            for error in result.errors
+        )
+        for path, error in errors:
+            print(f"{path}: {error}")
+
+        for result in results:
+            if not result.error and not result.passed:
+                print(f"Docstrings are missing or incorrect in {result.path} :(")
+
+    if args.verbose:
+        print(
+            f"Docstring cache: {docstring_cache.hits} hits, "
+            f"{docstring_cache.misses} misses."
+        )
 
-    print("Done.")
+    modified = sum(1 for result in results if result.modified)
+    print(f"Done. Modified {modified} files.")
+    exit(0 if passed else 1)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 
 class DocstringFilterBase(ABC):
@@ -16,3 +16,40 @@ class DocstringFilterBase(ABC):
         :return: formatted list of lines in the docstring.
         """
         pass
+
+
+class LineFilterBase(DocstringFilterBase):
+    """
+    Base class for docstring filters that change every line on its own, without
+    looking at the lines around it. The pipeline applies consecutive line filters
+    together, in a single pass over the docstring.
+    """
+
+    @property
+    def keywords(self) -> Optional[Tuple[str]]:
+        """
+        Substrings of the lines the filter may change. Lines containing none of
+        them are left untouched and the pipeline does not pass them to the filter.
+
+        :return: the substrings, None if the filter may change any line.
+        """
+        return None
+
+    @abstractmethod
+    def format_line(self, line: str) -> str:
+        """
+        Formats a single line.
+
+        :param line: line of the docstring.
+        :return: formatted line.
+        """
+        pass
+
+    def format(self, docstring: List[str]) -> List[str]:
+        """
+        Formats every line of the docstring.
+
+        :param docstring: list of lines in the docstring.
+        :return: formatted list of lines in the docstring.
+        """
+        return [self.format_line(line) for line in docstring]
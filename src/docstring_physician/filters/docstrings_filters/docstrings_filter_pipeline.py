@@ -1,10 +1,50 @@
-from typing import List, Tuple
+import re
+from typing import List, Optional, Tuple
 
+from src.common import tracing
 from src.docstring_physician.filters.docstrings_filters.docstring_filter_base import (
     DocstringFilterBase,
+    LineFilterBase,
 )
 
 
+class LineFilterPass(DocstringFilterBase):
+    """
+    Applies consecutive line filters in a single pass over the docstring. Each
+    line is classified once, lines containing none of the keywords of the
+    filters are copied without calling any of them.
+
+    :param line_filters: line filters in the order they are applied.
+    """
+
+    def __init__(self, line_filters: List[LineFilterBase]):
+        self.filters = line_filters
+        self.name = "+".join(type(line_filter).__name__ for line_filter in line_filters)
+
+        keywords = [line_filter.keywords for line_filter in line_filters]
+        self.keyword_pattern: Optional[re.Pattern] = None
+        if all(keyword is not None for keyword in keywords):
+            self.keyword_pattern = re.compile(
+                "|".join(re.escape(keyword) for group in keywords for keyword in group)
+            )
+
+    def format(self, docstring: List[str]) -> List[str]:
+        """
+        Formats every line of the docstring with all the line filters.
+
+        :param docstring: list of lines in the docstring.
+        :return: formatted list of lines in the docstring.
+        """
+        formatted_docstring = []
+        for line in docstring:
+            if self.keyword_pattern is None or self.keyword_pattern.search(line):
+                for line_filter in self.filters:
+                    line = line_filter.format_line(line)
+            formatted_docstring.append(line)
+
+        return formatted_docstring
+
+
 class DocstringFilterPipeline:
     """
     Gathers the docstring filters and applies them to the docstring
@@ -15,10 +55,39 @@ class DocstringFilterPipeline:
 
     def __init__(self, docstring_filters: Tuple[DocstringFilterBase]):
         self.filters = docstring_filters
+        self._grouped_filters = ()
+        self._passes = []
 
     def clear(self):
         self.filters.clear()
 
+    def passes(self) -> List[DocstringFilterBase]:
+        """
+        Groups consecutive line filters into single passes. Filters that need
+        the whole docstring are applied on their own, in the original order.
+
+        :return: list of filters and line filter passes.
+        """
+        if tuple(self.filters) == self._grouped_filters:
+            return self._passes
+
+        passes = []
+        line_filters = []
+        for docstring_filter in self.filters:
+            if isinstance(docstring_filter, LineFilterBase):
+                line_filters.append(docstring_filter)
+                continue
+            if line_filters:
+                passes.append(LineFilterPass(line_filters))
+                line_filters = []
+            passes.append(docstring_filter)
+        if line_filters:
+            passes.append(LineFilterPass(line_filters))
+
+        self._grouped_filters = tuple(self.filters)
+        self._passes = passes
+        return passes
+
     def format(self, docstring: List[str]) -> List[str]:
         """
         Formats the docstring using the specified filters.
@@ -27,7 +96,11 @@ class DocstringFilterPipeline:
         :return: formatted list of lines in the docstring.
         """
 
-        for docstring_filter in self.filters:
-            docstring = docstring_filter.format(docstring)
+        for docstring_filter in self.passes():
+            name = type(docstring_filter).__name__
+            if isinstance(docstring_filter, LineFilterPass):
+                name = docstring_filter.name
+            with tracing.span(name, "filter"):
+                docstring = docstring_filter.format(docstring)
 
         return docstring
@@ -1,11 +1,11 @@
-from typing import Tuple, List
+from typing import Tuple
 
 from src.docstring_physician.filters.docstrings_filters.docstring_filter_base import (
-    DocstringFilterBase,
+    LineFilterBase,
 )
 
 
-class NoRepeatedWhitespacesFilter(DocstringFilterBase):
+class NoRepeatedWhitespacesFilter(LineFilterBase):
     """
     Docstring filter that removes repeated whitespaces from the docstring.
 
@@ -26,38 +26,38 @@ class NoRepeatedWhitespacesFilter(DocstringFilterBase):
         """
         self.prefixes = prefixes
 
-    def format(self, docstring: List[str]) -> List[str]:
+    @property
+    def keywords(self) -> Tuple[str]:
+        return tuple(self.prefixes)
+
+    def format_line(self, line: str) -> str:
         """
-        Removes repeated whitespaces from the docstring.
+        Removes repeated whitespaces from the line.
 
-        :param docstring: list of lines in docstring
-        :return: list of lines in docstring
+        :param line: line of the docstring
+        :return: line of the docstring
         """
-        for i, line in enumerate(docstring):
-            for prefix in self.prefixes:
-                index = line.find(prefix)
-                if index != -1:
-                    index_of_second_semicolon = line.find(":", index + len(prefix))
-                    if index_of_second_semicolon != -1:
-                        line_after_second_semicolon = line[
-                            index_of_second_semicolon + 1 :
-                        ]
-
-                        while line_after_second_semicolon.startswith(" "):
-                            line_after_second_semicolon = line_after_second_semicolon[
-                                1:
-                            ]
-
-                        if len(line_after_second_semicolon) > 1:
-                            line_after_second_semicolon = (
-                                " "
-                                + line_after_second_semicolon[0]
-                                + line_after_second_semicolon[1:]
-                            )
-
-                        docstring[i] = (
-                            line[: index_of_second_semicolon + 1]
-                            + line_after_second_semicolon
+        formatted_line = line
+        for prefix in self.prefixes:
+            index = line.find(prefix)
+            if index != -1:
+                index_of_second_semicolon = line.find(":", index + len(prefix))
+                if index_of_second_semicolon != -1:
+                    line_after_second_semicolon = line[index_of_second_semicolon + 1 :]
+
+                    while line_after_second_semicolon.startswith(" "):
+                        line_after_second_semicolon = line_after_second_semicolon[1:]
+
+                    if len(line_after_second_semicolon) > 1:
+                        line_after_second_semicolon = (
+                            " "
+                            + line_after_second_semicolon[0]
+                            + line_after_second_semicolon[1:]
                         )
 
-        return docstring
+                    formatted_line = (
+                        line[: index_of_second_semicolon + 1]
+                        + line_after_second_semicolon
+                    )
+
+        return formatted_line
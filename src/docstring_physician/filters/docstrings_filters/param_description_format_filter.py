@@ -1,11 +1,11 @@
-from typing import List
+from typing import Tuple
 
 from src.docstring_physician.filters.docstrings_filters.docstring_filter_base import (
-    DocstringFilterBase,
+    LineFilterBase,
 )
 
 
-class ParamDescriptionFormatFilter(DocstringFilterBase):
+class ParamDescriptionFormatFilter(LineFilterBase):
     """
     Docstring filter that is responsible for ensuring that each parameter description
     starts with ':param <param_name>:'.
@@ -22,29 +22,31 @@ class ParamDescriptionFormatFilter(DocstringFilterBase):
     def __init__(self, prefixes=[":param", ":return", ":raises"]):
         self.prefixes = prefixes
 
-    def format(self, docstring: List[str]) -> List[str]:
+    @property
+    def keywords(self) -> Tuple[str]:
+        return (":param", *self.prefixes)
+
+    def format_line(self, line: str) -> str:
         """
-        Makes sure that each parameter description starts with ':param <param_name>:'.
-        :param docstring: list of lines in the docstring.
-        :return: formatted list of lines in the docstring.
+        Makes sure that a parameter description starts with ':param <param_name>:'.
+        :param line: line of the docstring.
+        :return: formatted line of the docstring.
         """
-
-        for i, line in enumerate(docstring):
-            if not line:
-                continue
-
-            if line.strip().startswith(":param") and (
-                line.count(":") == 1 or len(line.strip().split(":")[1].split(" ")) != 2
-            ):
-                j = line.index(":")
-                # find the second word in the line after j and add a colon after it
-                j += line[j + 1 :].index(" ") + 1
-                j += line[j + 1 :].index(" ") + 1
-                docstring[i] = line[:j] + line[j:].replace(" ", ": ", 1)
-
-            for prefix in self.prefixes:
-                if docstring[i].strip().startswith(prefix):
-                    while "::" in docstring[i]:
-                        docstring[i] = docstring[i].replace("::", ":")
-
-        return docstring
+        if not line:
+            return line
+
+        if line.strip().startswith(":param") and (
+            line.count(":") == 1 or len(line.strip().split(":")[1].split(" ")) != 2
+        ):
+            j = line.index(":")
+            # find the second word in the line after j and add a colon after it
+            j += line[j + 1 :].index(" ") + 1
+            j += line[j + 1 :].index(" ") + 1
+            line = line[:j] + line[j:].replace(" ", ": ", 1)
+
+        for prefix in self.prefixes:
+            if line.strip().startswith(prefix):
+                while "::" in line:
+                    line = line.replace("::", ":")
+
+        return line
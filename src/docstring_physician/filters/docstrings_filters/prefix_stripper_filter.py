@@ -1,11 +1,11 @@
-from typing import Tuple, List
+from typing import Tuple
 
 from src.docstring_physician.filters.docstrings_filters.docstring_filter_base import (
-    DocstringFilterBase,
+    LineFilterBase,
 )
 
 
-class PrefixStripperFilter(DocstringFilterBase):
+class PrefixStripperFilter(LineFilterBase):
     """
     Docstring filter that removes unwanted prefixes from the docstring.
 
@@ -26,21 +26,23 @@ class PrefixStripperFilter(DocstringFilterBase):
         """
         self.prefixes = prefixes
 
-    def format(self, docstring: List[str]) -> List[str]:
+    @property
+    def keywords(self) -> Tuple[str]:
+        return tuple(self.prefixes)
+
+    def format_line(self, line: str) -> str:
         """
-        Removes unwanted prefixes from the docstring.
+        Removes unwanted prefixes from the line.
 
-        :param docstring: list of lines in docstring
-        :return: list of lines in docstring
+        :param line: line of the docstring
+        :return: line of the docstring
         """
-        for i, line in enumerate(docstring):
-            # check if one prefixes is in line
-            for prefix in self.prefixes:
-                index = line.find(prefix)
-                if index != -1:
-                    # make sure there is only whitespace before prefix
-                    # replace all characters before prefix with whitespace
-                    docstring[i] = " " * index + line[index:]
-                    break
-
-        return docstring
+        # check if one prefixes is in line
+        for prefix in self.prefixes:
+            index = line.find(prefix)
+            if index != -1:
+                # make sure there is only whitespace before prefix
+                # replace all characters before prefix with whitespace
+                return " " * index + line[index:]
+
+        return line
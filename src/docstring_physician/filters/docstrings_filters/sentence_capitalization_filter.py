@@ -1,11 +1,11 @@
-from typing import List, Tuple
+from typing import Tuple
 
 from src.docstring_physician.filters.docstrings_filters.docstring_filter_base import (
-    DocstringFilterBase,
+    LineFilterBase,
 )
 
 
-class SentenceCapitalizationFilter(DocstringFilterBase):
+class SentenceCapitalizationFilter(LineFilterBase):
     """
     Docstring filter that is responsible for ensuring that each sentence starts
     with a capital letter.
@@ -24,41 +24,39 @@ class SentenceCapitalizationFilter(DocstringFilterBase):
     def __init__(self, prefixes: Tuple[str] = (":param", ":return", ":raises")):
         self.prefixes = prefixes
 
-    def format(self, docstring: List[str]) -> List[str]:
+    @property
+    def keywords(self) -> Tuple[str]:
+        return tuple(self.prefixes)
+
+    def format_line(self, line: str) -> str:
         """
-        Makes sure that each sentence starts with a capital letter. If a sentence
-        spans multiple lines, the first line of the sentence is the one that starts
+        Makes sure that the description following the keyword of the line starts
         with a capital letter.
 
-        :param docstring: list of lines in the docstring.
-        :return: formatted list of lines in the docstring.
+        :param line: line of the docstring.
+        :return: formatted line of the docstring.
         """
-
-        for i, line in enumerate(docstring):
-            for prefix in self.prefixes:
-                index = line.find(prefix)
-                if index != -1:
-                    index_of_second_semicolon = line.find(":", index + len(prefix))
-                    if index_of_second_semicolon != -1:
-                        line_after_second_semicolon = line[
-                            index_of_second_semicolon + 1 :
-                        ]
-
-                        while line_after_second_semicolon.startswith(" "):
-                            line_after_second_semicolon = line_after_second_semicolon[
-                                1:
-                            ]
-
-                        if len(line_after_second_semicolon) > 1:
-                            line_after_second_semicolon = (
-                                " "
-                                + line_after_second_semicolon[0].upper()
-                                + line_after_second_semicolon[1:]
-                            )
-
-                        docstring[i] = (
-                            line[: index_of_second_semicolon + 1]
-                            + line_after_second_semicolon
+        formatted_line = line
+        for prefix in self.prefixes:
+            index = line.find(prefix)
+            if index != -1:
+                index_of_second_semicolon = line.find(":", index + len(prefix))
+                if index_of_second_semicolon != -1:
+                    line_after_second_semicolon = line[index_of_second_semicolon + 1 :]
+
+                    while line_after_second_semicolon.startswith(" "):
+                        line_after_second_semicolon = line_after_second_semicolon[1:]
+
+                    if len(line_after_second_semicolon) > 1:
+                        line_after_second_semicolon = (
+                            " "
+                            + line_after_second_semicolon[0].upper()
+                            + line_after_second_semicolon[1:]
                         )
 
-        return docstring
+                    formatted_line = (
+                        line[: index_of_second_semicolon + 1]
+                        + line_after_second_semicolon
+                    )
+
+        return formatted_line
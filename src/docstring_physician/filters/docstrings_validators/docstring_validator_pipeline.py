@@ -1,8 +1,11 @@
-from typing import Type, Tuple
+from typing import List, Type, Tuple
 
+from src.common import tracing
+from src.docstring_physician.filters.docstrings_validators.error_data import ErrorData
 from src.docstring_physician.filters.docstrings_validators.validator_base import (
     DocstringValidatorBase,
 )
+from src.docstring_physician.parsers.module_index.module_index import ModuleIndex
 
 
 class DocstringValidatorPipeline:
@@ -19,15 +22,27 @@ class DocstringValidatorPipeline:
     def clear(self):
         self.validators.clear()
 
-    def check(self, content: Tuple[str], verbosity: bool = True) -> bool:
+    def validate(
+        self, content: Tuple[str], verbosity: bool = True
+    ) -> Tuple[bool, List[ErrorData]]:
         """
-        Applies the formatting condition filters to the content and returns True
-        if everything passes, else False.
+        Applies the formatting condition filters to the content and collects
+        the errors they find. The content is parsed once and the index is
+        shared by all filters.
 
         :param content: list of content in the content.
-        :param verbosity: verbosity flag.
-        :return: True if everything passes, else False.
+        :param verbosity: verbosity flag passed to the filters.
+        :return: True if everything passes, else False, and the errors sorted by line.
         """
+        if not self.validators:
+            return True, []
+
+        try:
+            with tracing.span(ModuleIndex.__name__, "validator"):
+                index = ModuleIndex(content)
+        except (SyntaxError, ValueError) as error:
+            line_number = getattr(error, "lineno", None) or 0
+            return False, [ErrorData(line_number, f"Cannot parse: {error}")]
 
         error_list = list()
 
@@ -35,10 +50,26 @@ class DocstringValidatorPipeline:
         for validator in self.validators:
             if verbosity:
                 print(f"Starting checks using {validator}...")
-            if not validator.check(content, error_list, verbosity=verbosity):
-                flag = False
+            with tracing.span(type(validator).__name__, "validator"):
+                if not validator.check(
+                    content, error_list, verbosity=verbosity, index=index
+                ):
+                    flag = False
+
+        return flag, sorted(error_list)
+
+    def check(self, content: Tuple[str], verbosity: bool = True) -> bool:
+        """
+        Applies the formatting condition filters to the content, prints the
+        errors and returns True if everything passes, else False.
+
+        :param content: list of content in the content.
+        :param verbosity: verbosity flag.
+        :return: True if everything passes, else False.
+        """
+        flag, error_list = self.validate(content, verbosity)
 
-        for error in sorted(error_list):
+        for error in error_list:
             print(error)
 
         return flag
@@ -1,9 +1,10 @@
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 from src.docstring_physician.filters.docstrings_validators.error_data import ErrorData
 from src.docstring_physician.filters.docstrings_validators.validator_base import (
     DocstringValidatorBase,
 )
+from src.docstring_physician.parsers.module_index.module_index import ModuleIndex
 
 
 class ModuleDocstringValidator(DocstringValidatorBase):
@@ -12,23 +13,25 @@ class ModuleDocstringValidator(DocstringValidatorBase):
         content: Tuple[str],
         error_list: List[ErrorData] = [],
         verbosity: bool = True,
+        index: Optional[ModuleIndex] = None,
     ) -> bool:
         """
-        Checks if the first non-empty line of the content parameter
-        is a module docstring that starts with either \"\"\" or '''.
+        Checks if the first statement of the content parameter is a module
+        docstring.
 
         :param content: Text of Python script.
+        :param error_list: List of ErrorData objects to store any errors found.
         :param verbosity: Whether to display a message before returning False.
+        :param index: Index of the content, built from the content if None.
         :return: True if module docstring is present, else False.
         """
-        for line in content:
-            if line.strip() != "":
-                if line.strip().startswith('"""') or line.strip().startswith("'''"):
-                    return True
-                else:
-                    if verbosity:
-                        print("Module docstring is missing or improperly formatted.")
-                    return False
+        if index is None:
+            index = ModuleIndex(content)
+
+        if index.docstring_span is not None:
+            return True
+
+        error_list.append(ErrorData(1, "Module docstring is missing."))
         if verbosity:
             print("Module docstring is missing.")
         return False
@@ -1,9 +1,10 @@
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 from src.docstring_physician.filters.docstrings_validators.error_data import ErrorData
 from src.docstring_physician.filters.docstrings_validators.validator_base import (
     DocstringValidatorBase,
 )
+from src.docstring_physician.parsers.module_index.module_index import ModuleIndex
 
 
 class PublicClassDocstringValidator(DocstringValidatorBase):
@@ -12,6 +13,7 @@ class PublicClassDocstringValidator(DocstringValidatorBase):
         content: Tuple[str],
         error_list: List[ErrorData] = [],
         verbosity: bool = True,
+        index: Optional[ModuleIndex] = None,
     ) -> bool:
         """
         Checks if all public classes in the content parameter have docstrings
@@ -20,30 +22,20 @@ class PublicClassDocstringValidator(DocstringValidatorBase):
         :param content: Text of Python script.
         :param error_list: List of ErrorData objects to store any errors found.
         :param verbosity: Whether to display a message before returning False.
+        :param index: Index of the content, built from the content if None.
         :return: True if all public classes have docstrings, else False.
         """
+        if index is None:
+            index = ModuleIndex(content)
+
         error_found = False
 
-        for i, line in enumerate(content):
-            if line.strip().startswith("class"):
-                original_i = i + 1
-                class_name = line.split()[1]
-                if not class_name.startswith("_"):
-                    # Class is public
-                    next_line = i + 1
-                    if next_line < len(content) and content[
-                        next_line
-                    ].strip().startswith('"""'):
-                        # Public class has a docstring
-                        continue
-                    else:
-                        # Public class is missing docstring
-                        if verbosity:
-                            message = (
-                                f"The public class {class_name} is missing a docstring."
-                            )
-                            error_list.append(ErrorData(original_i, message))
-                            error_found = True
+        for class_data in index.classes:
+            if class_data.is_public() and class_data.docstring_span is None:
+                # Public class is missing docstring
+                message = f"The public class {class_data.name} is missing a docstring."
+                error_list.append(ErrorData(class_data.line_number, message))
+                error_found = True
 
         if error_found:
             if verbosity:
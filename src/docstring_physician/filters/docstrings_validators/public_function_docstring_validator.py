@@ -1,10 +1,10 @@
-import re
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 from src.docstring_physician.filters.docstrings_validators.error_data import ErrorData
 from src.docstring_physician.filters.docstrings_validators.validator_base import (
     DocstringValidatorBase,
 )
+from src.docstring_physician.parsers.module_index.module_index import ModuleIndex
 
 
 class PublicFunctionDocstringValidator(DocstringValidatorBase):
@@ -13,6 +13,7 @@ class PublicFunctionDocstringValidator(DocstringValidatorBase):
         content: Tuple[str],
         error_list: List[ErrorData] = [],
         verbosity: bool = True,
+        index: Optional[ModuleIndex] = None,
     ) -> bool:
         """
         Checks if all public functions in the content parameter have docstrings
@@ -21,48 +22,20 @@ class PublicFunctionDocstringValidator(DocstringValidatorBase):
         :param content: Text of Python script.
         :param error_list: List of ErrorData objects to store any errors found.
         :param verbosity: Whether to display appropriate message before returning False (default=True).
+        :param index: Index of the content, built from the content if None.
         :return: True if all public functions have docstrings, else False.
         """
-
-        def is_function_definition(line):
-            return line.strip().startswith("def ")
-
-        def get_function_name(line):
-            return line.split()[1].split("(")[0]
+        if index is None:
+            index = ModuleIndex(content)
 
         error_found = False
 
-        for i, line in enumerate(content):
-            if is_function_definition(line):
-                original_i = i + 1
-                # Check if function definition spans multiple lines
-
-                # Get function name
-                func_name = get_function_name(line)
-
-                # Check if function is public
-                if func_name.startswith("_") or (
-                    i - 1 >= 0 and re.findall(r"@\w+\.(setter|deleter)", content[i - 1])
-                ):
-                    continue
-
-                while not line.strip().endswith(":"):
-                    i += 1
-                    line = content[i]
-
-                # Function is public
-                next_line = i + 1
-                if next_line < len(content) and content[next_line].strip().startswith(
-                    '"""'
-                ):
-                    # Public function has a docstring
-                    continue
-                else:
-                    # Public function is missing docstring
-                    if verbosity:
-                        message = f"Function {func_name} is missing a docstring."
-                        error_list.append(ErrorData(original_i, message))
-                        error_found = True
+        for function in index.functions:
+            if function.is_public() and function.docstring_span is None:
+                # Public function is missing docstring
+                message = f"Function {function.name} is missing a docstring."
+                error_list.append(ErrorData(function.line_number, message))
+                error_found = True
 
         if error_found:
             if verbosity:
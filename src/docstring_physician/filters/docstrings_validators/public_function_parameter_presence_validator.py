@@ -1,13 +1,10 @@
-import re
-from typing import List
+from typing import List, Optional
 
 from src.docstring_physician.filters.docstrings_validators.error_data import ErrorData
 from src.docstring_physician.filters.docstrings_validators.validator_base import (
     DocstringValidatorBase,
 )
-from src.docstring_physician.parsers.param_parser.param_parser import (
-    ParametersExtractor,
-)
+from src.docstring_physician.parsers.module_index.module_index import ModuleIndex
 
 
 class PublicFunctionParameterPresenceValidator(DocstringValidatorBase):
@@ -17,7 +14,11 @@ class PublicFunctionParameterPresenceValidator(DocstringValidatorBase):
     """
 
     def check(
-        self, content: str, error_list: List[ErrorData] = [], verbosity: bool = True
+        self,
+        content: str,
+        error_list: List[ErrorData] = [],
+        verbosity: bool = True,
+        index: Optional[ModuleIndex] = None,
     ) -> bool:
         """
         Checks if all parameters in public function docstrings match the
@@ -26,58 +27,32 @@ class PublicFunctionParameterPresenceValidator(DocstringValidatorBase):
         :param content: Text of Python script.
         :param error_list: List to update with any errors found.
         :param verbosity: Whether to display appropriate messages before returning False (default: True).
+        :param index: Index of the content, built from the content if None.
         :return: True if all public function parameters match their docstring
         descriptions, else False.
         """
-        func_name = None
-        for i in range(len(content) - 1):
-            line = content[i].strip()
-            if line.startswith("def"):
-                original_i = i + 1
-
-                func_name = line.split()[1].split("(")[0]
-                if func_name.startswith("_") or (
-                    i - 1 >= 0 and re.findall(r"@\w+\.(setter|deleter)", content[i - 1])
-                ):
-                    continue
-                # Function is public
-                end_index = i
-                while not line.endswith(":"):
-                    end_index += 1
-                    line = content[end_index].strip()
-
-                extractor = ParametersExtractor(content[i:])
-                function_parameters = extractor.extract_parameters(i, end_index)
-
-                next_line = end_index + 1
-                if next_line < len(content) and content[next_line].strip().startswith(
-                    '"""'
-                ):
-                    docstring_content = []
-                    description_started = False
-                    for j in range(next_line, len(content)):
-                        docstring_line = content[j].strip()
-                        if not description_started and docstring_line.startswith('"""'):
-                            description_started = True
-                        elif description_started and docstring_line.endswith('"""'):
-                            break
-                        elif description_started:
-                            docstring_content.append(docstring_line)
-
-                    docstring = " ".join(docstring_content).strip()
-                    docstring_parameters = re.findall(r":param ([^:]+):", docstring)
-                    if not set(docstring_parameters).issubset(
-                        set([parameter.name for parameter in function_parameters])
-                    ):
-                        # Parameter mismatch between docstring and function signature
-                        if verbosity:
-                            print(
-                                f"{original_i}: Parameter mismatch in function {func_name}"
-                            )
-                        error_list.append(
-                            ErrorData(
-                                line_number=original_i,
-                                error_message=f"Parameter mismatch in function {func_name}",
-                            )
-                        )
-        return len(error_list) == 0
+        if index is None:
+            index = ModuleIndex(content)
+
+        error_found = False
+
+        for function in index.functions:
+            if not function.is_public() or function.docstring_span is None:
+                continue
+
+            function_parameters = {parameter.name for parameter in function.parameters}
+            if not function_parameters.issuperset(function.docstring_parameters):
+                # Parameter mismatch between docstring and function signature
+                if verbosity:
+                    print(
+                        f"{function.line_number}: Parameter mismatch in function {function.name}"
+                    )
+                error_list.append(
+                    ErrorData(
+                        line_number=function.line_number,
+                        error_message=f"Parameter mismatch in function {function.name}",
+                    )
+                )
+                error_found = True
+
+        return not error_found
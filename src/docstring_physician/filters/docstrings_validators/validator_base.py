@@ -1,7 +1,8 @@
 from abc import ABC
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 from src.docstring_physician.filters.docstrings_validators.error_data import ErrorData
+from src.docstring_physician.parsers.module_index.module_index import ModuleIndex
 
 
 class DocstringValidatorBase(ABC):
@@ -10,13 +11,18 @@ class DocstringValidatorBase(ABC):
     """
 
     def check(
-        self, content: Tuple[str], error_list: List[ErrorData], verbosity: bool = True
+        self,
+        content: Tuple[str],
+        error_list: List[ErrorData],
+        verbosity: bool = True,
+        index: Optional[ModuleIndex] = None,
     ) -> bool:
         """
         Checks the content.
 
         :param content: list of content in the docstring.
         :param verbosity:
+        :param index: index of the content shared by the validators, built from the content if None.
         :return: True if everything is fine, else otherwise.
         """
         pass
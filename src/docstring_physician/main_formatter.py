@@ -1,17 +1,61 @@
 import difflib
-import sys
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import List, Optional, Union
 
+from src.common.cache import MemoCache, MemoUpdates, blob_sha
+from src.common.file_writer import write_if_changed
+from src.common.runner import FileResult
 from src.docstring_physician.filters.docstrings_filters.docstrings_filter_pipeline import (
     DocstringFilterPipeline,
 )
 from src.docstring_physician.filters.docstrings_validators.docstring_validator_pipeline import (
     DocstringValidatorPipeline,
 )
+from src.docstring_physician.filters.docstrings_validators.error_data import ErrorData
 from src.docstring_physician.parsers.docstring_localizer.docstrings_localizer import (
     DocstringsLocalizer,
 )
 
+ENCODING = "utf-8"
+
+
+@dataclass
+class FormatterResult(FileResult):
+    """
+    Outcome of validating and formatting a single file, which can be sent
+    back from a worker process.
+
+    :param passed: True if all validators passed.
+    :param errors: errors found by the validators, sorted by line.
+    :param diff: lines of the diff between the file and the formatted file.
+    :param docstrings: changes made to the cache of formatted docstrings.
+    """
+
+    passed: bool = True
+    errors: List[ErrorData] = field(default_factory=list)
+    diff: List[str] = field(default_factory=list)
+    docstrings: MemoUpdates = field(default_factory=MemoUpdates)
+
+
+def print_diff(differences: List[str]) -> None:
+    """
+    Prints the lines of a diff, with added lines in green and removed ones in red.
+
+    :param differences: lines returned by difflib.Differ.
+    """
+    OK = "\033[92m"
+    FAIL = "\033[91m"
+    ENDC = "\033[0m"
+
+    for line in differences:
+        if line.startswith("+"):
+            print(OK + line + ENDC)
+        elif line.startswith("-"):
+            print(FAIL + line + ENDC)
+        else:
+            print(line)
+
 
 class Formatter:
     def __init__(
@@ -20,62 +64,113 @@ class Formatter:
         filter_pipeline: DocstringFilterPipeline,
         in_place: bool = True,
         print_diff: bool = True,
+        docstring_cache: Optional[MemoCache] = None,
     ):
         self.validator_pipeline = validator_pipeline
         self.filter_pipeline = filter_pipeline
         self.in_place = in_place
         self.print_diff = print_diff
+        self.docstring_cache = docstring_cache
 
     def __call__(self, path: Path) -> bool:
-        file_content = path.read_text().split("\n")
+        """
+        Validates and formats the file, printing the diff and the errors.
+
+        :param path: path to the python file.
+        :return: True if the file was modified, else False.
+        """
+        result = self.process(path)
+
+        if result.diff:
+            print(f"printing diff for {path}")
+            print_diff(result.diff)
+
+        for error in result.errors:
+            print(error)
+        if not result.passed:
+            print(f"Docstrings are missing or incorrect in {path} :(")
+
+        return result.modified
+
+    def check(self, file_content: List[str]) -> bool:
+        """
+        Validates the content without formatting it.
+
+        :param file_content: list of lines in the file.
+        :return: True if all validators pass, else False.
+        """
+        return self.validator_pipeline.check(file_content)
+
+    def process(self, path: Union[str, Path]) -> FormatterResult:
+        """
+        Validates and formats the file without printing anything, so that files
+        can be processed in worker processes. Files failing the validators are
+        not formatted.
+
+        :param path: path to the python file.
+        :return: errors found, diff of the formatted file, whether it was modified and the new formatted docstrings.
+        """
+        path = Path(path)
+        original = path.read_bytes()
+        # decoded like read_text does, translating the line endings
+        original_text = (
+            original.decode(ENCODING).replace("\r\n", "\n").replace("\r", "\n")
+        )
+        file_content = original_text.split("\n")
+
+        passed, errors = self.validator_pipeline.validate(file_content, verbosity=False)
+        if not passed:
+            return FormatterResult(str(path), passed=False, errors=errors)
 
-        self._apply_validator_pipeline(file_content)
         formatted_file_content = self._apply_filter_pipeline(file_content)
 
+        diff = []
         if self.print_diff:
-            print(f"printing diff for {path}")
-            self._print_diff(file_content, formatted_file_content)
+            diff = list(difflib.Differ().compare(file_content, formatted_file_content))
+
+        original_content = original_text.encode(ENCODING)
+        formatted_content = "\n".join(formatted_file_content).encode(ENCODING)
+        modified = self.in_place and write_if_changed(
+            path, original_content, formatted_content
+        )
 
-        if self.in_place:
-            path.write_text("\n".join(formatted_file_content))
+        result = FormatterResult(str(path), modified, errors=errors, diff=diff)
+        if formatted_content == original_content:
+            # the contents are clean, which the main process records by their SHA
+            result.sha = blob_sha(original)
+        if self.docstring_cache is not None:
+            result.docstrings = self.docstring_cache.drain()
 
-    def _apply_validator_pipeline(self, file_content):
-        # validators
-        if not self.validator_pipeline.check(file_content):
-            print("Docstrings are missing or incorrect in the file :(")
-            sys.exit(1)
+        return result
 
     def _apply_filter_pipeline(self, file_content):
-        # docstring filters
+        # docstring filters, the docstrings are located once and the formatted
+        # file is assembled from the lines between them and the formatted docstrings
+        formatted_file_content = []
+        previous_end = 0
 
-        formatted_file_content = file_content.copy()
-        localizer = DocstringsLocalizer(formatted_file_content)
-        start_index, end_index = localizer.find_next_docstring(0)
+        for start_index, end_index in DocstringsLocalizer(
+            file_content
+        ).find_all_docstrings():
+            formatted_file_content.extend(file_content[previous_end:start_index])
+            docstring = file_content[start_index : end_index + 1]
+            formatted_file_content.extend(self._format_docstring(docstring))
+            previous_end = end_index + 1
 
-        while start_index != -1:
-            docstring = formatted_file_content[start_index : end_index + 1]
-            formatted_docstring = self.filter_pipeline.format(docstring)
-            formatted_file_content[start_index : end_index + 1] = formatted_docstring
-            start_index, end_index = DocstringsLocalizer(
-                formatted_file_content
-            ).find_next_docstring(start_index + len(formatted_docstring) + 1)
+        formatted_file_content.extend(file_content[previous_end:])
 
         return formatted_file_content
 
-    def _print_diff(self, file_content, formatted_file_content):
-        OK = "\033[92m"
-        FAIL = "\033[91m"
-        ENDC = "\033[0m"
+    def _format_docstring(self, docstring: List[str]) -> List[str]:
+        # docstrings repeat across files and runs, so the formatted ones are
+        # looked up by their text before running the filters
+        if self.docstring_cache is None:
+            return self.filter_pipeline.format(docstring)
 
-        # create temporary file to see the differences
-        differences = list(
-            difflib.Differ().compare(file_content, formatted_file_content)
-        )
+        text = "\n".join(docstring)
+        formatted_docstring = self.docstring_cache.get(text)
+        if formatted_docstring is None:
+            formatted_docstring = self.filter_pipeline.format(docstring)
+            self.docstring_cache.put(text, formatted_docstring)
 
-        for line in differences:
-            if line.startswith("+"):
-                print(OK + line + ENDC)
-            elif line.startswith("-"):
-                print(FAIL + line + ENDC)
-            else:
-                print(line)
+        return formatted_docstring
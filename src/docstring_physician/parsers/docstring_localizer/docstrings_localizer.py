@@ -1,15 +1,106 @@
-from typing import List, Tuple
+import bisect
+import itertools
+import re
+from typing import Iterator, List, Optional, Tuple
+
+# string literals and comments, the only tokens that can hide brackets and
+# newlines, everything between them is inspected with string methods
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<string>
+        \"\"\"[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*\"\"\"
+      | '''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''
+      | "(?!"")[^"\\\n]*(?:\\.[^"\\\n]*)*"
+      | '(?!'')[^'\\\n]*(?:\\.[^'\\\n]*)*'
+    )
+  | (?P<unterminated>\"\"\"|''')
+  | (?P<comment>\#[^\n]*)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+STRING_PREFIX_LETTERS = "bBfFrRuU"
+# statements whose body may follow the colon on the same line
+COMPOUND_PATTERN = re.compile(
+    r"[ \t]*(?:async\s+)?"
+    r"(?:class|def|if|elif|else|for|while|with|try|except|finally|match|case)\b"
+)
+# delimiters recognised on lines of their own when the content is not valid python
+DOCSTRING_DELIMITERS = {
+    '"""': '"""',
+    "'''": "'''",
+    'r"""': '"""',
+    "r'''": "'''",
+}
+
+
+def opens_block(gap: str, depth: int, file_start: bool = False) -> Optional[bool]:
+    """
+    Checks if the statement the gap ends in is a compound statement, e.g. a
+    class or a function, whose body may follow on the same line.
+
+    :param gap: text between two tokens.
+    :param depth: bracket depth at the end of the gap.
+    :param file_start: True if the gap starts the file.
+    :return: True if the statement is compound, None if it started before the gap.
+    """
+    end = len(gap)
+    while True:
+        newline = gap.rfind("\n", 0, end)
+        if newline == -1:
+            return COMPOUND_PATTERN.match(gap) is not None if file_start else None
+
+        # the statement starts after the last newline outside of brackets
+        line = gap[newline + 1 : end]
+        depth -= line.count("(") + line.count("[") + line.count("{")
+        depth += line.count(")") + line.count("]") + line.count("}")
+        if depth <= 0:
+            return COMPOUND_PATTERN.match(gap, newline + 1) is not None
+        end = newline
+
+
+def opens_statement(gaps: List[Tuple[str, int, bool]], compound: bool) -> bool:
+    """
+    Checks if the current statement is a compound statement. Every gap comes
+    with the bracket depth at its end and a flag telling if it starts the file.
+
+    :param gaps: gaps that may start the statement since it was last checked.
+    :param compound: result of the previous check.
+    :return: True if the statement is compound, else False.
+    """
+    for gap, depth, file_start in reversed(gaps):
+        block = opens_block(gap, depth, file_start)
+        if block is not None:
+            return block
+
+    return compound
+
+
+def is_docstring_prefix(prefix: str) -> bool:
+    """
+    Checks if a string literal with the prefix can be a docstring, which rules
+    out bytes and f-strings.
+
+    :param prefix: text preceding the opening quotes of the literal.
+    :return: True if the literal can be a docstring, else False.
+    """
+    return not set(prefix.lower()) & {"b", "f"}
 
 
 class DocstringsLocalizer:
     """
-    Finds docstrings in a python file.
+    Finds docstrings in a python file. Every statement consisting of a single
+    string literal is a docstring, whatever its quotes, prefix or the number
+    of lines it spans, including the bodies following the colon of a class or
+    a function on the same line. All docstrings are found with a single pass
+    over the file when the localizer is created.
 
     :param content: python file content as a list of lines
     """
 
     def __init__(self, content: List[str]):
         self.content = content
+        self.spans = self._find_spans()
+        self._starts = [start for start, _ in self.spans]
 
     def find_next_docstring(self, index: int) -> Tuple[int, int]:
         """
@@ -18,23 +109,11 @@ class DocstringsLocalizer:
         :param index: index to start looking for docstring
         :return: start and end position of docstring
         """
-        possible_docstring_start = ['"""', "'''", 'r"""', "r'''"]
-        corresponding_docstring_end = {
-            '"""': '"""',
-            "'''": "'''",
-            'r"""': '"""',
-            "r'''": "'''",
-        }
+        position = bisect.bisect_left(self._starts, index)
+        if position == len(self.spans):
+            return -1, -1
 
-        for i in range(index, len(self.content)):
-            line = self.content[i].strip()
-            if line in possible_docstring_start:
-                for j in range(i + 1, len(self.content)):
-                    next_line = self.content[j].strip()
-                    if next_line == corresponding_docstring_end[line]:
-                        return i, j
-
-        return -1, -1
+        return self.spans[position]
 
     def find_all_docstrings(self) -> List[Tuple[int, int]]:
         """
@@ -42,10 +121,111 @@ class DocstringsLocalizer:
 
         :return: list of start and end position of docstrings
         """
-        docstrings = []
-        next_docstring_pos = self.find_next_docstring(0)
-        while next_docstring_pos != (-1, -1):
-            docstrings.append(next_docstring_pos)
-            next_docstring_pos = self.find_next_docstring(next_docstring_pos[1] + 1)
+        return list(self.spans)
+
+    def _find_spans(self) -> List[Tuple[int, int]]:
+        spans = self._scan_tokens()
+        if spans is None:
+            # the file is not valid python, e.g. it is still being written
+            return list(self._scan_lines())
+
+        return spans
+
+    def _scan_tokens(self) -> Optional[List[Tuple[int, int]]]:
+        """
+        Finds the statements consisting of a single string literal. Statements
+        end at newlines outside of brackets, like in the tokenizer.
+
+        :return: first and last line of every docstring, None if a bracket or a string is not closed.
+        """
+        text = "\n".join(self.content)
+        spans = []
+        line = 0
+        depth = 0
+        statement_start = True
+        # gaps that may start the current statement since it was last
+        # checked, only inspected when a string follows a colon
+        compound = False
+        pending = []
+        span = None
+        previous_end = 0
+
+        # a final empty match closes the statement at the end of the file
+        for match in itertools.chain(TOKEN_PATTERN.finditer(text), [None]):
+            gap = text[previous_end : len(text) if match is None else match.start()]
+            prefix = ""
+            if match is not None and match.lastgroup == "string":
+                # the prefix of the literal, e.g. r or rb, is matched as part of the gap
+                prefix = gap[len(gap.rstrip(STRING_PREFIX_LETTERS)) :]
+                gap = gap[: len(gap) - len(prefix)]
+            line += gap.count("\n")
+            if "\\\n" in gap:
+                # explicitly joined lines belong to the same statement
+                gap = gap.replace("\\\n", "  ")
+            newline = gap.find("\n")
+
+            if span is not None:
+                if newline != -1 and not gap[:newline].strip():
+                    spans.append(span)
+                    span = None
+                elif match is None and not gap.strip():
+                    spans.append(span)
+                    span = None
+                elif gap.strip() or match.lastgroup != "comment":
+                    span = None
+
+            depth += gap.count("(") + gap.count("[") + gap.count("{")
+            depth -= gap.count(")") + gap.count("]") + gap.count("}")
+            if newline != -1:
+                statement_start = depth == 0 and not gap[gap.rfind("\n") + 1 :].strip()
+                if statement_start:
+                    compound = False
+                    pending.clear()
+                else:
+                    pending.append((gap, depth, previous_end == 0))
+            elif gap.strip():
+                statement_start = False
+                if previous_end == 0:
+                    pending.append((gap, depth, True))
+
+            if match is None:
+                break
+            previous_end = match.end()
+
+            if match.lastgroup == "string":
+                # e.g. class A: """Description."""
+                body_start = False
+                if depth == 0 and gap.rstrip().endswith(":"):
+                    compound = opens_statement(pending, compound)
+                    pending.clear()
+                    body_start = compound
+                if (statement_start or body_start) and is_docstring_prefix(prefix):
+                    span = (line, line + match.group().count("\n"))
+                line += match.group().count("\n")
+                statement_start = False
+            elif match.lastgroup == "unterminated":
+                return None
+
+        if depth != 0:
+            return None
+
+        return spans
+
+    def _scan_lines(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the spans of the docstrings whose delimiters are on lines of their own.
+
+        :return: iterator over the first and last line of every docstring.
+        """
+        start = None
+        end_delimiter = None
 
-        return docstrings
+        for i, line in enumerate(self.content):
+            line = line.strip()
+            if start is None:
+                if line in DOCSTRING_DELIMITERS:
+                    start = i
+                    end_delimiter = DOCSTRING_DELIMITERS[line]
+            elif line == end_delimiter:
+                yield start, i
+                start = None
@@ -0,0 +1,176 @@
+import ast
+import re
+import textwrap
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.docstring_physician.parsers.param_parser.data import ParameterData
+from src.docstring_physician.parsers.param_parser.param_parser import (
+    parameters_from_arguments,
+)
+
+# decorators of property methods, which are documented by the getter
+ACCESSOR_DECORATOR_PATTERN = re.compile(r"\w+\.(setter|deleter)")
+DOCSTRING_PARAMETER_PATTERN = re.compile(r":param ([^:]+):")
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+@dataclass
+class FunctionData:
+    """
+    Holds information about a function or a method.
+
+    :param name: name of the function
+    :param line_number: line of the def statement, counted from 1
+    :param decorators: source of the decorators, without the @
+    :param parameters: parameters of the function, without self and cls
+    :param docstring_span: first and last line of the docstring, None if there is none
+    :param docstring_parameters: names of the parameters described in the docstring
+    """
+
+    name: str
+    line_number: int
+    decorators: List[str] = field(default_factory=list)
+    parameters: List[ParameterData] = field(default_factory=list)
+    docstring_span: Optional[Tuple[int, int]] = None
+    docstring_parameters: List[str] = field(default_factory=list)
+
+    def is_public(self) -> bool:
+        """
+        Checks if the function is part of the public interface. Setters and
+        deleters of properties are not, since the getter holds the docstring.
+
+        :return: True if the function is public, else False.
+        """
+        return not self.name.startswith("_") and not any(
+            ACCESSOR_DECORATOR_PATTERN.fullmatch(decorator)
+            for decorator in self.decorators
+        )
+
+
+@dataclass
+class ClassData:
+    """
+    Holds information about a class.
+
+    :param name: name of the class
+    :param line_number: line of the class statement, counted from 1
+    :param decorators: source of the decorators, without the @
+    :param docstring_span: first and last line of the docstring, None if there is none
+    :param docstring_parameters: names of the parameters described in the docstring
+    :param init: __init__ method of the class, None if it is inherited
+    """
+
+    name: str
+    line_number: int
+    decorators: List[str] = field(default_factory=list)
+    docstring_span: Optional[Tuple[int, int]] = None
+    docstring_parameters: List[str] = field(default_factory=list)
+    init: Optional[FunctionData] = None
+
+    def is_public(self) -> bool:
+        return not self.name.startswith("_")
+
+
+def extract_docstring_parameters(docstring: str) -> List[str]:
+    """
+    Finds the names of the parameters described in a docstring.
+
+    :param docstring: text of the docstring.
+    :return: names of the parameters, in the order of the descriptions.
+    """
+    text = " ".join(line.strip() for line in docstring.split("\n")).strip()
+    return DOCSTRING_PARAMETER_PATTERN.findall(text)
+
+
+def _docstring_node(
+    node: Union[ast.Module, ast.ClassDef, FunctionNode],
+) -> Optional[ast.Expr]:
+    if node.body and isinstance(node.body[0], ast.Expr):
+        value = node.body[0].value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return node.body[0]
+
+    return None
+
+
+def _docstring_data(
+    node: Union[ast.Module, ast.ClassDef, FunctionNode],
+) -> Tuple[Optional[Tuple[int, int]], List[str]]:
+    docstring = _docstring_node(node)
+    if docstring is None:
+        return None, []
+
+    return (
+        (docstring.lineno - 1, docstring.end_lineno - 1),
+        extract_docstring_parameters(docstring.value.value),
+    )
+
+
+def _function_data(node: FunctionNode) -> FunctionData:
+    docstring_span, docstring_parameters = _docstring_data(node)
+    return FunctionData(
+        node.name,
+        node.lineno,
+        [ast.unparse(decorator) for decorator in node.decorator_list],
+        parameters_from_arguments(node.args),
+        docstring_span,
+        docstring_parameters,
+    )
+
+
+class ModuleIndex:
+    """
+    Describes the functions and classes of a python file, found with a single
+    parse of the file. The validators share the index instead of scanning the
+    lines of the file on their own.
+
+    :param content: python file content as a list of lines
+    """
+
+    def __init__(self, content: List[str]):
+        # snippets may be indented as a whole, which does not change their line numbers
+        tree = ast.parse(textwrap.dedent("\n".join(content)))
+
+        self.docstring_span, _ = _docstring_data(tree)
+
+        functions = {}
+        class_nodes = []
+        for node in ast.walk(tree):
+            if isinstance(node, FUNCTION_NODES):
+                functions[node] = _function_data(node)
+            elif isinstance(node, ast.ClassDef):
+                class_nodes.append(node)
+
+        self.functions: List[FunctionData] = sorted(
+            functions.values(), key=lambda function: function.line_number
+        )
+        self.classes: List[ClassData] = sorted(
+            (self._class_data(node, functions) for node in class_nodes),
+            key=lambda class_data: class_data.line_number,
+        )
+
+    @staticmethod
+    def _class_data(
+        node: ast.ClassDef, functions: Dict[FunctionNode, FunctionData]
+    ) -> ClassData:
+        docstring_span, docstring_parameters = _docstring_data(node)
+        init = next(
+            (
+                functions[statement]
+                for statement in node.body
+                if isinstance(statement, FUNCTION_NODES)
+                and statement.name == "__init__"
+            ),
+            None,
+        )
+        return ClassData(
+            node.name,
+            node.lineno,
+            [ast.unparse(decorator) for decorator in node.decorator_list],
+            docstring_span,
+            docstring_parameters,
+            init,
+        )
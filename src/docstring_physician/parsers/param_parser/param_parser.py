@@ -1,71 +1,135 @@
+import ast
 import copy
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from src.docstring_physician.parsers.param_parser.data import ParameterData
 
+IGNORED_PARAMETERS = ("cls", "self", "__class__")
+FUNCTION_PATTERN = re.compile(r"\s*(?:async\s+)?def\s+\w+\s*\(")
+# string literals and comments, which may contain brackets and colons
+CODE_PATTERN = re.compile(r"\#.*|'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"")
+
+
+def _blank_literal(match: re.Match) -> str:
+    # comments are dropped, while strings are kept as empty literals
+    return "" if match.group().startswith("#") else '""'
+
+
+def parameters_from_arguments(
+    arguments: ast.arguments,
+    ignored_parameters=IGNORED_PARAMETERS,
+    source: Optional[List[str]] = None,
+) -> List[ParameterData]:
+    """
+    Converts the arguments of a function definition to parameters. Variadic
+    parameters are named without their asterisks.
+
+    :param arguments: arguments node of the function definition.
+    :param ignored_parameters: names of the parameters to leave out.
+    :param source: lines the arguments were parsed from, type hints and default values are copied from them if given.
+    :return: parameters in the order of the signature.
+    """
+
+    def text(node: Optional[ast.AST]) -> str:
+        if node is None:
+            return ""
+        if source is None:
+            return ast.unparse(node)
+        if node.lineno != node.end_lineno:
+            return ast.get_source_segment("".join(source), node)
+        # the offsets count bytes of the encoded line
+        line = source[node.lineno - 1].encode()
+        return line[node.col_offset : node.end_col_offset].decode()
+
+    positional = [*arguments.posonlyargs, *arguments.args]
+    defaults = [None] * (len(positional) - len(arguments.defaults))
+    defaults += arguments.defaults
+
+    pairs = list(zip(positional, defaults))
+    if arguments.vararg is not None:
+        pairs.append((arguments.vararg, None))
+    pairs += zip(arguments.kwonlyargs, arguments.kw_defaults)
+    if arguments.kwarg is not None:
+        pairs.append((arguments.kwarg, None))
+
+    return [
+        ParameterData(argument.arg, text(argument.annotation), text(default))
+        for argument, default in pairs
+        if argument.arg not in ignored_parameters
+    ]
+
 
 class ParametersExtractor:
     def __init__(self, content: List[str]):
         self.content = content
 
-    def _extract_first_function(self, content: List[str]) -> List[str]:
-        content_str = "".join(content)
-
-        # Locate the first function definition
-        function_match = re.search(r"\bdef\b\s+\w+\s*\(", content_str)
-        if not function_match:
-            return []
-
-        # Locate the end of the first function definition
-        open_brackets = 1
-        end_index = function_match.end()
-        while open_brackets > 0 and end_index < len(content_str):
-            if content_str[end_index] == "(":
-                open_brackets += 1
-            elif content_str[end_index] == ")":
-                open_brackets -= 1
-            end_index += 1
+    def _find_function_header(
+        self, start_index: int, end_index: int
+    ) -> Optional[List[str]]:
+        """
+        Finds the header of the first function defined between start_index and
+        end_index. Only the lines of the header are read.
 
-        first_function_str = content_str[function_match.start() : end_index]
-        return first_function_str.split("\n")
+        :param start_index: first line to search.
+        :param end_index: last line to search.
+        :return: lines from def to the one closing the brackets of the signature, None if there is no function.
+        """
+        first_line = next(
+            (
+                i
+                for i in range(start_index, end_index + 1)
+                if FUNCTION_PATTERN.match(self.content[i])
+            ),
+            None,
+        )
+        if first_line is None:
+            return None
+
+        header = []
+        depth = 0
+        for i in range(first_line, len(self.content)):
+            line = self.content[i]
+            header.append(line + "\n")
+            code = CODE_PATTERN.sub(_blank_literal, line)
+            depth += code.count("(") + code.count("[") + code.count("{")
+            depth -= code.count(")") + code.count("]") + code.count("}")
+            if depth <= 0:
+                header[0] = header[0].lstrip()
+                # the body is added when the header ends with a colon
+                if code.rstrip().endswith(":"):
+                    header.append(" pass\n")
+                return header
+
+        return None
 
     def extract_parameters(
         self,
         start_index=0,
         end_index=-1,
-        ignored_parameters=["cls", "self", "__class__"],
+        ignored_parameters=IGNORED_PARAMETERS,
     ) -> List[ParameterData]:
+        """
+        Parses the header of the first function defined between start_index and end_index and extracts its parameters.
 
-        content_str = self._extract_first_function(self.content)
-        content_str = "".join(content_str).replace("\n", " ")
-
-        # Extract the parameter string
-        parameter_start = content_str.find("(") + 1
-        parameter_end = content_str.find(")")
-        parameters_text = content_str[parameter_start:parameter_end]
+        :param start_index: start index of the text to parse
+        :param end_index: end index of the text to parse, if -1 then the end of the content
+        :param ignored_parameters: names of the parameters to leave out
+        :return: list of parameters extracted, empty if there is no function
+        """
+        if end_index == -1 or end_index >= len(self.content):
+            end_index = len(self.content) - 1
 
-        # A regex pattern to correctly handle parameters with and without type hints
-        pattern = re.compile(
-            r"\s*(?P<name>\w+)\s*(?::\s*(?P<type>(?:(?:[^\s,=]+\[.*?\])|(?:[^\s,=]+)))\s*)?(?:=\s*(?P<default>[^,]+))?\s*(?:,|$)"
-        )
+        header = self._find_function_header(start_index, end_index)
+        if header is None:
+            return []
 
-        parameters = []
-        for match in pattern.finditer(parameters_text):
-            name, type_hint, default_value = match.groups()
-            if type_hint is None:
-                type_hint = ""
-            if default_value is None:
-                default_value = ""
-            parameters.append(ParameterData(name, type_hint, default_value))
-
-        parameters = [
-            parameter
-            for parameter in parameters
-            if parameter.name not in ignored_parameters
-        ]
+        try:
+            function = ast.parse("".join(header)).body[0]
+        except SyntaxError:
+            return []
 
-        return parameters
+        return parameters_from_arguments(function.args, ignored_parameters, header)
 
     def extract_parameter_names(
         self, start_index: int = 0, end_index: int = -1
@@ -148,9 +212,9 @@ class ParametersExtractor:
                         line[:_start_index] + str(new_parameters[i]) + line[_end_index:]
                     )
 
-        considered_content[
-            start_index_of_header : end_index_of_header + 1
-        ] = new_content
+        considered_content[start_index_of_header : end_index_of_header + 1] = (
+            new_content
+        )
         self.content[start_index : end_index + 1] = considered_content
 
         return self.content
@@ -1,11 +1,14 @@
-import pathlib
-import sys
+from typing import Optional
 
+from src.common.cli import HookArgumentParser, run_hook
+from src.common.normalization import Transform, normalize_file, transforms_key
+from src.common.scanning import Buffer, Violation, line_number
 
-def make_sure_last_line_is_empty(file_name: str) -> None:
-    # read file contents
-    with open(file_name, "r", encoding="utf-8") as file:
-        contents = file.read()
+
+def ensure_single_trailing_newline(contents: str) -> str:
+    # empty file has no last line to fix
+    if not contents:
+        return contents
 
     # make sure last line is empty
     if contents[-1] != "\n":
@@ -15,25 +18,51 @@ def make_sure_last_line_is_empty(file_name: str) -> None:
     while contents[-2:] == "\n\n":
         contents = contents[:-1]
 
-    # write file contents
-    with open(file_name, "wb") as file:
-        file.write(bytes(contents, "UTF-8"))
+    return contents
+
+
+TRANSFORM = Transform("last_line_empty", ensure_single_trailing_newline)
+
+
+def make_sure_last_line_is_empty(file_name: str) -> bool:
+    return normalize_file(file_name, [TRANSFORM])
+
+
+def find_missing_last_line(contents: Buffer) -> Optional[Violation]:
+    # empty file has no last line to fix
+    size = len(contents)
+    if not size:
+        return None
+
+    if contents[-1:] != b"\n":
+        return Violation(
+            line_number(contents, size), size, 1, "no newline at end of file"
+        )
+
+    # walk back over the trailing newlines without copying the contents
+    offset = size - 1
+    while offset and contents[offset - 1 : offset] == b"\n":
+        offset -= 1
+
+    extra = size - 1 - offset
+    if not extra:
+        return None
+
+    return Violation(
+        line_number(contents, offset + 1),
+        offset + 1,
+        extra,
+        "empty line at end of file",
+    )
 
 
 if __name__ == "__main__":
-    # check if user provided file name
-    if len(sys.argv) != 2:
-        print("Usage: python last_line_empty.py <dir_name>")
-        exit()
-
-    # check if file exists
-    file_name = sys.argv[1]
-
-    if not pathlib.Path(file_name).is_dir():
-        print("Dir does not exist")
-        exit()
-
-    # find all files in directory and make sure last line is empty
-    for file in pathlib.Path(file_name).glob("**/*"):
-        if file.is_file():
-            make_sure_last_line_is_empty(file)
+    args = HookArgumentParser(
+        "Make sure every file in a directory ends with a single empty line"
+    ).parse_args()
+    run_hook(
+        make_sure_last_line_is_empty,
+        args,
+        check=find_missing_last_line,
+        cache_key=transforms_key([TRANSFORM]),
+    )
@@ -1,53 +1,82 @@
+"""
+Fails the commit if any of the files staged for commit is binary.
+
+Staged entries are listed straight from the index, their sizes are looked up
+with a single git cat-file --batch-check call and only the first SNIFF_SIZE
+bytes of each distinct blob are inspected through one long-lived
+git cat-file --batch process, so the check stays cheap for commits adding
+tens of thousands of files. A blob is binary if it contains NUL bytes or
+mostly control characters, so text in encodings other than UTF-8, e.g.
+latin-1 or UTF-16 with a byte order mark, does not block the commit.
+"""
+import argparse
 import pathlib
-import re
-import shutil
+import subprocess
 import sys
+from typing import List, Tuple
 
-if __name__ == "__main__":
-    # check if user provided file name
-    if len(sys.argv) != 2:
-        print("Usage: python no_binaries_in_staging_area.py <path>")
-        exit()
+from src.common.git import BlobReader, object_sizes, repository_root, staged_entries
+from src.common.sniffing import SNIFF_SIZE, looks_like_data
 
-    # check if file exists
-    path = sys.argv[1]
 
-    if not pathlib.Path(path).is_dir():
+def find_binaries(dir_name: str) -> List[Tuple[pathlib.Path, int]]:
+    """
+    Finds the binary files staged for commit in the directory.
+
+    :param dir_name: path to a directory inside the repository.
+    :return: paths to the binary files and the sizes of their staged blobs.
+    """
+    entries = staged_entries(dir_name)
+    if not entries:
+        return []
+
+    root = repository_root(dir_name)
+    sizes = object_sizes((entry.sha for entry in entries), root)
+
+    # identical files share a blob, which only has to be inspected once
+    verdicts = {}
+    with BlobReader(root) as reader:
+        for entry in entries:
+            if sizes.get(entry.sha, 0) and entry.sha not in verdicts:
+                verdicts[entry.sha] = looks_like_data(
+                    reader.read_prefix(entry.sha, SNIFF_SIZE)
+                )
+
+    return [
+        (entry.path, sizes[entry.sha])
+        for entry in entries
+        if verdicts.get(entry.sha, False)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fails if any file staged for commit is binary, i.e. contains "
+        "NUL bytes or mostly control characters. Text in any encoding is accepted."
+    )
+    parser.add_argument("dir_name", help="Name of the directory to check")
+    args = parser.parse_args()
+
+    # check if file exists
+    if not pathlib.Path(args.dir_name).is_dir():
         print("Dir does not exist")
-        exit()
-
-    # check if path is git repo
-    if not pathlib.Path(path + "/.git").is_dir():
-        print("Not a git repo")
-        exit()
-
-    # get list of files in staging area with pathlib
-    staging_area = path + "/.git/info/sparse-checkout"
-    files = []
-    for file in pathlib.Path(staging_area).iterdir():
-        files.append(file)
-
-    # check if there are any binaries in staging area
-    # binaries include: executables, shared libraries, static libraries,
-    # object files, archives, images, and unknown files
-    binaries = []
-    for file in files:
-        if re.search(r"\.(exe|dll|so|a|o|ar|img|bin|unknown)$", file.name):
-            binaries.append(file)
-
-    # if there are binaries in staging area, move them to
-    # .git/info/sparse-checkout/binaries
-    if len(binaries) > 0:
-        binaries_dir = path + "/.git/info/sparse-checkout/binaries"
-        if not pathlib.Path(binaries_dir).is_dir():
-            pathlib.Path(binaries_dir).mkdir(parents=True, exist_ok=True)
-        for binary in binaries:
-            shutil.move(binary, binaries_dir)
-        print(f"Moved {len(binaries)} binaries to {binaries_dir}")
-    else:
+        sys.exit(1)
+
+    try:
+        binaries = find_binaries(args.dir_name)
+    except subprocess.CalledProcessError:
+        # git already explained what went wrong
+        sys.exit(1)
+
+    if not binaries:
         print("No binaries in staging area")
-        exit()
+        return
+
+    print(f"Found {len(binaries)} binaries in staging area:")
+    for path, size in binaries:
+        print(f"{path} ({size} bytes)")
+    sys.exit(1)
 
-    # remove .git/info/sparse-checkout/binaries if empty
-    if not pathlib.Path(binaries_dir).is_dir():
-        shutil.rmtree(binaries_dir)
+
+if __name__ == "__main__":
+    main()
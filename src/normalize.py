@@ -0,0 +1,68 @@
+import functools
+
+from src import (
+    last_line_empty,
+    remove_carriage_return,
+    remove_diacritics,
+    remove_trailing_whitespaces,
+)
+from src.common.cli import HookArgumentParser, run_hook
+from src.common.normalization import (
+    needs_normalization,
+    normalize_file,
+    transforms_key,
+)
+
+# transforms in the order they are applied to every file
+TRANSFORMS = {
+    transform.name: transform
+    for transform in (
+        remove_carriage_return.TRANSFORM,
+        remove_diacritics.TRANSFORM,
+        remove_trailing_whitespaces.TRANSFORM,
+        last_line_empty.TRANSFORM,
+    )
+}
+
+
+def selected_transforms(names) -> list:
+    """
+    Returns the transforms with the given names in the order they are applied.
+
+    :param names: names of the transforms.
+    :return: list of transforms.
+    """
+    return [TRANSFORMS[name] for name in TRANSFORMS if name in names]
+
+
+def normalize(file_name: str, names=tuple(TRANSFORMS)) -> bool:
+    """
+    Applies the selected transforms to the file in a single pass.
+
+    :param file_name: path to the file.
+    :param names: names of the transforms to apply.
+    :return: True if the file was modified, else False.
+    """
+    return normalize_file(file_name, selected_transforms(names))
+
+
+if __name__ == "__main__":
+    parser = HookArgumentParser(
+        "Apply several file hooks with one read and one write per file"
+    )
+    parser.add_argument(
+        "-t",
+        "--transforms",
+        help="Transforms to apply, all of them by default",
+        nargs="+",
+        choices=list(TRANSFORMS),
+        default=list(TRANSFORMS),
+    )
+    args = parser.parse_args()
+    transforms = selected_transforms(args.transforms)
+    run_hook(
+        functools.partial(normalize, names=args.transforms),
+        args,
+        check=functools.partial(needs_normalization, transforms=transforms),
+        cache_key=transforms_key(transforms),
+    )
@@ -0,0 +1,232 @@
+"""
+Pre-receive hook rejecting pushes with Python files that are not formatted
+with black.
+
+Only the .py and .pyi blobs changed between the old and the new revision of
+every pushed branch are checked. They are streamed through a single
+git cat-file --batch process and formatted with the in-process API of black,
+so nothing is checked out and the cost of a push depends on the size of the
+change, not of the repository. The configuration of black is read from the
+pyproject.toml file of the pushed revision.
+"""
+import argparse
+import io
+import re
+import sys
+import tokenize
+from typing import Dict, List, Optional, TextIO
+
+from src.common.git import (
+    GITLINK_MODE,
+    SYMLINK_MODE,
+    BlobReader,
+    changed_entries,
+    is_null_sha,
+)
+
+try:
+    import black
+except ImportError:
+    black = None
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+# files checked by black when no include pattern is configured
+DEFAULT_INCLUDE = r"\.pyi?$"
+DEFAULT_EXCLUDE = (
+    r"/(\.direnv|\.eggs|\.git|\.hg|\.ipynb_checkpoints|\.mypy_cache|\.nox"
+    r"|\.pytest_cache|\.ruff_cache|\.tox|\.svn|\.venv|\.vscode|__pypackages__"
+    r"|_build|buck-out|build|dist|venv)/"
+)
+
+
+def read_black_config(reader: BlobReader, revision: str) -> Dict:
+    """
+    Reads the [tool.black] table of the pyproject.toml file of the revision.
+
+    :param reader: reader of the repository.
+    :param revision: revision being pushed.
+    :return: options of black with dashes replaced by underscores, empty if there are none.
+    """
+    contents = reader.read(f"{revision}:pyproject.toml")
+    if contents is None:
+        return {}
+
+    config = tomllib.loads(contents.decode("utf-8")).get("tool", {}).get("black", {})
+    return {key.replace("-", "_"): value for key, value in config.items()}
+
+
+def black_mode(config: Dict, is_pyi: bool = False) -> "black.Mode":
+    """
+    Builds the mode black formats the files with.
+
+    :param config: options of black returned by read_black_config.
+    :param is_pyi: True if the mode is used for stub files.
+    :return: formatting mode.
+    """
+    return black.Mode(
+        target_versions={
+            black.TargetVersion[version.upper()]
+            for version in config.get("target_version", [])
+        },
+        line_length=config.get("line_length", black.DEFAULT_LINE_LENGTH),
+        string_normalization=not config.get("skip_string_normalization", False),
+        is_pyi=is_pyi,
+        magic_trailing_comma=not config.get("skip_magic_trailing_comma", False),
+        preview=config.get("preview", False),
+    )
+
+
+def is_checked(path: str, config: Dict) -> bool:
+    """
+    Checks if black would check the file when run on the whole tree.
+
+    :param path: path to the file relative to the root of the repository.
+    :param config: options of black returned by read_black_config.
+    :return: True if the file is included and not excluded, else False.
+    """
+    path = f"/{path}"
+    if not re.search(config.get("include", DEFAULT_INCLUDE), path):
+        return False
+
+    excludes = [
+        config.get("exclude", DEFAULT_EXCLUDE),
+        config.get("extend_exclude"),
+        config.get("force_exclude"),
+    ]
+    return not any(
+        re.search(pattern, path, re.VERBOSE) for pattern in excludes if pattern
+    )
+
+
+def decode_source(contents: bytes) -> str:
+    """
+    Decodes a Python file the way black does, honouring the encoding
+    declaration and translating all line endings to newlines.
+
+    :param contents: raw contents of the file.
+    :return: decoded contents.
+    """
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(contents).readline)
+    with io.TextIOWrapper(io.BytesIO(contents), encoding) as text:
+        return text.read()
+
+
+def is_formatted(contents: bytes, mode: "black.Mode") -> bool:
+    """
+    Checks if black would leave the file unchanged.
+
+    :param contents: raw contents of the file.
+    :param mode: formatting mode.
+    :return: True if the file is formatted, else False.
+    """
+    try:
+        black.format_file_contents(decode_source(contents), fast=False, mode=mode)
+    except black.NothingChanged:
+        return True
+
+    return False
+
+
+def unformatted_files(
+    old: str, new: str, path: str = ".", reader: Optional[BlobReader] = None
+) -> List[str]:
+    """
+    Finds the files changed between two revisions that are not formatted.
+
+    :param old: old revision, all files of the new revision are checked if it is the all-zero name.
+    :param new: new revision.
+    :param path: path to the repository, which may be bare.
+    :param reader: reader of the repository, a new one is started if None.
+    :return: paths to the unformatted files, relative to the root of the repository.
+    """
+    if reader is None:
+        with BlobReader(path, bare=True) as reader:
+            return unformatted_files(old, new, path, reader)
+
+    config = read_black_config(reader, new)
+    entries = [
+        entry
+        for entry in changed_entries(old, new, path)
+        if entry.mode not in (SYMLINK_MODE, GITLINK_MODE)
+        and is_checked(entry.path, config)
+    ]
+
+    # identical files share a blob, which only has to be formatted once
+    verdicts = {}
+    files = []
+    for entry in entries:
+        key = (entry.sha, entry.path.endswith(".pyi"))
+        if key not in verdicts:
+            try:
+                verdicts[key] = is_formatted(
+                    reader.read(entry.sha), black_mode(config, key[1])
+                )
+            except Exception:
+                # black --check fails on files it cannot parse as well
+                verdicts[key] = False
+        if not verdicts[key]:
+            files.append(entry.path)
+
+    return files
+
+
+def check_refs(lines: TextIO, branches: List[str], path: str = ".") -> bool:
+    """
+    Checks the branches updated by a push, as listed on the standard input
+    of the pre-receive hook.
+
+    :param lines: lines of the form "<old revision> <new revision> <ref name>".
+    :param branches: names of the branches to check.
+    :param path: path to the repository, which may be bare.
+    :return: True if every checked file is formatted, else False.
+    """
+    refs = {f"refs/heads/{branch}" for branch in branches}
+    passed = True
+
+    with BlobReader(path, bare=True) as reader:
+        for line in lines:
+            if not line.strip():
+                continue
+            old, new, ref = line.split()
+            # deleted branches have nothing to check
+            if ref not in refs or is_null_sha(new):
+                continue
+
+            for file in unformatted_files(old, new, path, reader):
+                print(f"{ref}: would reformat {file}")
+                passed = False
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rejects pushes with Python files that are not formatted with black. "
+        "Reads the updated refs from the standard input, as passed to a pre-receive hook"
+    )
+    parser.add_argument(
+        "-b",
+        "--branches",
+        help="Branches to check, master by default",
+        nargs="+",
+        default=["master"],
+    )
+    args = parser.parse_args()
+
+    if black is None:
+        print("black formatter is not installed, please install it")
+        sys.exit(1)
+
+    if not check_refs(sys.stdin, args.branches):
+        print(
+            "The code is not formatted correctly, please run black on the code before pushing"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
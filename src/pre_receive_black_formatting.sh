@@ -1,39 +1,8 @@
 #!/bin/bash
 
-# Check if black is installed
-if ! command -v black &> /dev/null; then
-  echo "black formatter is not installed, please install it"
-  exit 1
-fi
+# Only the Python files changed by the push are checked, in-process and without
+# checking anything out, see src/pre_receive_black_formatting.py. The hooks
+# repository is expected one level above this script, unless GIT_HOOKS_ROOT is set.
+root="${GIT_HOOKS_ROOT:-$(cd "$(dirname "$0")/.." && pwd)}"
 
-while read oldrev newrev refname; do
-
-  # Get the name of the branch being pushed
-  branch=$(git rev-parse --symbolic --abbrev-ref $refname)
-
-  # Check only if the branch is master
-  if [ "$branch" != "master" ]; then
-   exit 0
-  fi
-
-  # Create an empty dir
-  tmptree=$(mktemp -d)
-
-  # Extract the content from the new revision
-  git archive $newrev | tar x --warning=none -C ${tmptree}
-
-  echo "$tmptree"
-
-  # Navigate to the temporary directory
-  cd $tmptree
-
-
-  # Check if the code is formatted correctly
-  black --check .
-
-  # Exit with an error if black returns any issues
-  if [ $? -ne 0 ]; then
-    echo "The code is not formatted correctly, please run black on the code before pushing"
-    exit 1
-  fi
-done
+PYTHONPATH="${root}${PYTHONPATH:+:${PYTHONPATH}}" exec python -m src.pre_receive_black_formatting "$@"
@@ -0,0 +1,442 @@
+"""
+Pre-receive hook rejecting pushes that break the unit tests.
+
+With --impact, only the tests affected by the push are run. A map from every
+Python file to the modules it imports is kept for every branch in the git
+directory and found by static analysis of the sources, without importing
+them. The map is refreshed incrementally: only files whose blobs changed since
+the last push are parsed again. The tests run are the test modules that
+import a changed file, directly or through other modules. Modules are named
+after their path from the root of the repository and from every source root,
+e.g. src. The full suite is run whenever the map may not describe the old
+revision of the branch, when a new branch is pushed, when a file other than a
+Python module changed, or when a changed module is not imported by any file.
+"""
+import argparse
+import ast
+import fnmatch
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, TextIO
+
+from src.common.git import (
+    BlobReader,
+    changed_entries,
+    git_directory,
+    is_null_sha,
+    tree_entries,
+)
+
+MAP_FILE_NAME = "hooks-test-impact.json"
+# bumped whenever the format of the map or the import analysis changes
+MAP_VERSION = 1
+# pattern of the test modules found by unittest discover
+TEST_PATTERN = "test*.py"
+# changes to these files never affect the tests
+IGNORED_SUFFIXES = (".md", ".rst")
+# directories besides the root of the repository that modules are imported from
+SOURCE_ROOTS = ("src",)
+# the repository of the hooks, which the wrapper script adds to PYTHONPATH
+HOOKS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def module_name(path: str) -> str:
+    """
+    Finds the name of the module defined by a Python file.
+
+    :param path: path to the file relative to the root of the repository.
+    :return: dotted name of the module, the package name for __init__.py files.
+    """
+    parts = path[: -len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+
+    return ".".join(parts)
+
+
+def module_names(path: str, source_roots: Sequence[str] = SOURCE_ROOTS) -> List[str]:
+    """
+    Finds the names a Python file may be imported by, from the root of the
+    repository and from every source root containing it.
+
+    :param path: path to the file relative to the root of the repository.
+    :param source_roots: paths to the source roots relative to the root of the repository.
+    :return: dotted names of the module.
+    """
+    names = [module_name(path)]
+    for root in source_roots:
+        root = root.strip("/")
+        if root and path.startswith(f"{root}/"):
+            names.append(module_name(path[len(root) + 1 :]))
+
+    return names
+
+
+def imported_modules(source: bytes, path: str) -> List[str]:
+    """
+    Finds the modules a Python file may import, including imports nested in
+    functions. Names imported from a package are listed as well, since they
+    may be submodules.
+
+    :param source: contents of the file.
+    :param path: path to the file relative to the root of the repository.
+    :return: sorted dotted names of the modules, empty if the file cannot be parsed.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    package = module_name(path)
+    if not path.endswith("__init__.py"):
+        package = package.rpartition(".")[0]
+
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                parts = parts[: len(parts) - node.level + 1]
+                base = ".".join(filter(None, [*parts, base]))
+            if base:
+                modules.add(base)
+            modules.update(
+                f"{base}.{alias.name}" if base else alias.name
+                for alias in node.names
+                if alias.name != "*"
+            )
+
+    return sorted(modules)
+
+
+def is_test_module(path: str, paths: Set[str]) -> bool:
+    """
+    Checks if unittest discover would find the file, which requires every
+    directory above it to be a package.
+
+    :param path: path to the file relative to the root of the repository.
+    :param paths: paths to all files of the revision.
+    :return: True if the file is a discoverable test module, else False.
+    """
+    if not fnmatch.fnmatch(path.rpartition("/")[2], TEST_PATTERN):
+        return False
+
+    parts = path.split("/")[:-1]
+    return all(
+        "/".join([*parts[: index + 1], "__init__.py"]) in paths
+        for index in range(len(parts))
+    )
+
+
+def map_file(path: str = ".") -> str:
+    return os.path.join(git_directory(path), MAP_FILE_NAME)
+
+
+def load_maps(file_name: str) -> Dict:
+    """
+    Loads the import maps of all branches.
+
+    :param file_name: path to the file holding the maps.
+    :return: maps keyed by the ref name, empty if there are none or they are outdated.
+    """
+    try:
+        with open(file_name) as file:
+            maps = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    return maps.get("refs", {}) if maps.get("version") == MAP_VERSION else {}
+
+
+def save_maps(file_name: str, maps: Dict) -> None:
+    """
+    Saves the import maps of all branches, replacing the file atomically.
+
+    :param file_name: path to the file holding the maps.
+    :param maps: maps keyed by the ref name.
+    """
+    temporary = f"{file_name}.{os.getpid()}"
+    with open(temporary, "w") as file:
+        json.dump({"version": MAP_VERSION, "refs": maps}, file)
+    os.replace(temporary, file_name)
+
+
+def refresh_map(
+    files: Dict[str, Dict], revision: str, path: str, reader: BlobReader
+) -> Dict[str, Dict]:
+    """
+    Updates the imports of every Python file of the revision. Files whose
+    blobs did not change are not read again.
+
+    :param files: imports of the files, keyed by path, as stored in a previous map.
+    :param revision: revision to describe.
+    :param path: path to the repository, which may be bare.
+    :param reader: reader of the repository.
+    :return: blob name and imported modules of every Python file of the revision.
+    """
+    refreshed = {}
+
+    for entry in tree_entries(revision, path):
+        if not entry.path.endswith(".py"):
+            continue
+        known = files.get(entry.path)
+        if known is not None and known["sha"] == entry.sha:
+            refreshed[entry.path] = known
+        else:
+            refreshed[entry.path] = {
+                "sha": entry.sha,
+                "imports": imported_modules(reader.read(entry.sha) or b"", entry.path),
+            }
+
+    return refreshed
+
+
+def affected_tests(
+    files: Dict[str, Dict],
+    changed: Iterable[str],
+    source_roots: Sequence[str] = SOURCE_ROOTS,
+) -> Optional[List[str]]:
+    """
+    Finds the test modules that import any of the changed files, directly or
+    through other modules. Importing a module imports the packages containing
+    it as well. A changed module that no file imports may be loaded in a way
+    the map does not know, so all the tests are affected then.
+
+    :param files: imports of every Python file, as returned by refresh_map.
+    :param changed: paths to the changed Python files, including deleted ones.
+    :param source_roots: paths to the source roots relative to the root of the repository.
+    :return: sorted paths to the affected test modules, None if the full suite has to be run.
+    """
+    changed = set(changed)
+    modules = {
+        name: path
+        for path in [*files, *changed]
+        for name in module_names(path, source_roots)
+    }
+
+    dependents = defaultdict(set)
+    for path, data in files.items():
+        for name in data["imports"]:
+            parts = name.split(".")
+            for index in range(len(parts)):
+                dependency = modules.get(".".join(parts[: index + 1]))
+                if dependency is not None and dependency != path:
+                    dependents[dependency].add(path)
+
+    paths = set(files)
+    if any(
+        not dependents[path] and not is_test_module(path, paths) for path in changed
+    ):
+        return None
+
+    affected = set(changed)
+    stack = list(changed)
+    while stack:
+        for path in dependents[stack.pop()] - affected:
+            affected.add(path)
+            stack.append(path)
+
+    return sorted(path for path in affected if is_test_module(path, paths))
+
+
+def select_tests(
+    old: str,
+    new: str,
+    ref: str,
+    maps: Dict,
+    path: str,
+    reader: BlobReader,
+    source_roots: Sequence[str] = SOURCE_ROOTS,
+) -> Optional[List[str]]:
+    """
+    Selects the tests affected by an update of a branch and refreshes its map.
+
+    :param old: old revision of the branch.
+    :param new: new revision of the branch.
+    :param ref: name of the branch.
+    :param maps: import maps keyed by the ref name, updated in place.
+    :param path: path to the repository, which may be bare.
+    :param reader: reader of the repository.
+    :param source_roots: paths to the source roots relative to the root of the repository.
+    :return: paths to the affected test modules, None if the full suite has to be run.
+    """
+    previous = maps.get(ref, {})
+    files = refresh_map(previous.get("files", {}), new, path, reader)
+    maps[ref] = {"revision": new, "files": files}
+
+    # the map is stale unless it was built for the old revision of the branch
+    if is_null_sha(old) or previous.get("revision") != old:
+        return None
+
+    changed = [
+        entry.path
+        for entry in changed_entries(old, new, path, diff_filter="ACDMRT")
+        if not entry.path.endswith(IGNORED_SUFFIXES)
+    ]
+    if any(not file.endswith(".py") for file in changed):
+        return None
+
+    return affected_tests(files, changed, source_roots)
+
+
+def unit_test_environment() -> Dict[str, str]:
+    """
+    Copies the environment of the hook without the entry the wrapper script
+    adds to PYTHONPATH, so that the tests cannot import the modules of the hooks
+    instead of their own.
+
+    :return: environment variables for the tests.
+    """
+    environment = dict(os.environ)
+    entries = [
+        entry
+        for entry in environment.get("PYTHONPATH", "").split(os.pathsep)
+        if entry and os.path.abspath(entry) != HOOKS_ROOT
+    ]
+    if entries:
+        environment["PYTHONPATH"] = os.pathsep.join(entries)
+    else:
+        environment.pop("PYTHONPATH", None)
+
+    return environment
+
+
+def run_tests(
+    revision: str,
+    tests: Optional[List[str]],
+    path: str = ".",
+    env: Optional[Dict[str, str]] = None,
+) -> bool:
+    """
+    Runs the unit tests on the files of the revision, extracted into
+    a temporary directory.
+
+    :param revision: revision to test.
+    :param tests: paths to the test modules to run, None to discover all of them.
+    :param path: path to the repository, which may be bare.
+    :param env: environment variables of the tests, those of the hook if None.
+    :return: True if the tests passed, else False.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        archive = subprocess.Popen(
+            ["git", "archive", revision], cwd=path, stdout=subprocess.PIPE
+        )
+        with tarfile.open(fileobj=archive.stdout, mode="r|") as tar:
+            # the data filter rejects absolute paths and links leaving the directory
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(directory, filter="data")
+            else:
+                tar.extractall(directory)
+        if archive.wait() != 0:
+            return False
+
+        if tests is None:
+            arguments = ["discover", "-v"]
+        else:
+            arguments = ["-v", *map(module_name, tests)]
+
+        return (
+            subprocess.run(
+                [sys.executable, "-m", "unittest", *arguments], cwd=directory, env=env
+            ).returncode
+            == 0
+        )
+
+
+def check_refs(
+    lines: TextIO,
+    branches: List[str],
+    impact: bool = False,
+    path: str = ".",
+    source_roots: Sequence[str] = SOURCE_ROOTS,
+) -> bool:
+    """
+    Tests the branches updated by a push, as listed on the standard input
+    of the pre-receive hook.
+
+    :param lines: lines of the form "<old revision> <new revision> <ref name>".
+    :param branches: names of the branches to test.
+    :param impact: if True, only the tests affected by the push are run.
+    :param path: path to the repository, which may be bare.
+    :param source_roots: paths to the source roots relative to the root of the repository.
+    :return: True if the tests of every branch passed, else False.
+    """
+    refs = {f"refs/heads/{branch}" for branch in branches}
+    file_name = map_file(path)
+    maps = load_maps(file_name) if impact else {}
+    env = unit_test_environment()
+    passed = True
+
+    with BlobReader(path, bare=True) as reader:
+        for line in lines:
+            if not line.strip():
+                continue
+            old, new, ref = line.split()
+            # deleted branches have nothing to test
+            if ref not in refs or is_null_sha(new):
+                continue
+
+            tests = None
+            if impact:
+                tests = select_tests(old, new, ref, maps, path, reader, source_roots)
+                if tests is None:
+                    print(f"{ref}: running the full suite")
+                elif not tests:
+                    print(f"{ref}: no test module imports the changed files")
+                    continue
+                else:
+                    print(f"{ref}: running {len(tests)} affected test modules")
+
+            if not run_tests(new, tests, path, env):
+                passed = False
+
+    # a map is only valid once the push is accepted, which requires every test to pass
+    if impact and passed:
+        save_maps(file_name, maps)
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rejects pushes that break the unit tests. Reads the updated "
+        "refs from the standard input, as passed to a pre-receive hook"
+    )
+    parser.add_argument(
+        "-b",
+        "--branches",
+        help="Branches to test, master by default",
+        nargs="+",
+        default=["master"],
+    )
+    parser.add_argument(
+        "--impact",
+        help="Only run the tests importing the files changed by the push",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--source-roots",
+        help="Directories the modules are imported from, besides the root of the "
+        "repository, src by default",
+        nargs="+",
+        default=list(SOURCE_ROOTS),
+    )
+    args = parser.parse_args()
+
+    if not check_refs(
+        sys.stdin, args.branches, args.impact, source_roots=args.source_roots
+    ):
+        print("Unit tests failed, please fix the tests before pushing")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
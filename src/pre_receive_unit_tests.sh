@@ -1,4 +1,4 @@
-#!/bin/sh
+#!/bin/bash
 
 # Check if Python is installed
 if ! command -v python &> /dev/null; then
@@ -6,22 +6,9 @@ if ! command -v python &> /dev/null; then
   exit 1
 fi
 
-# Get the name of the branch being pushed
-branch=$(git rev-parse --symbolic --abbrev-ref $1)
+# Only the tests importing the files changed by the push are run, see
+# src/pre_receive_unit_tests.py. The hooks repository is expected one level
+# above this script, unless GIT_HOOKS_ROOT is set.
+root="${GIT_HOOKS_ROOT:-$(cd "$(dirname "$0")/.." && pwd)}"
 
-# Check only if the branch is master
-if [ "$branch" != "master" ]; then
-  exit 0
-fi
-
-# Run unit tests using unittest discover
-python -m unittest discover -v
-
-# Exit with an error if any tests fail
-if [ $? -ne 0 ]; then
-  echo "Unit tests failed, please fix the tests before pushing"
-  exit 1
-fi
-
-# Continue with the push if everything is ok
-exit 0
+PYTHONPATH="${root}${PYTHONPATH:+:${PYTHONPATH}}" exec python -m src.pre_receive_unit_tests --impact "$@"
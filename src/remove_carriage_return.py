@@ -1,38 +1,75 @@
-# get file name from command line
-import pathlib
-import sys
+from typing import Optional
 
+from src.common.cli import HookArgumentParser, run_hook
+from src.common.file_writer import atomic_replace
+from src.common.normalization import Transform, transforms_key
+from src.common.scanning import Buffer, Violation, scan_byte
+from src.common.sniffing import is_binary
 
-def remove_carriage_return(file_name: str) -> None:
+
+def strip_carriage_returns(contents: bytes) -> bytes:
+    """
+    Remove carriage return from bytes
+    """
+    return contents.replace(b"\r", b"")
+
+
+TRANSFORM = Transform("remove_carriage_return", strip_carriage_returns, binary=True)
+
+# size of the blocks the file is streamed in
+CHUNK_SIZE = 1024 * 1024
+
+
+def contains_carriage_return(file_name: str, chunk_size: int = CHUNK_SIZE) -> bool:
     """
-    Remove carriage return from file
+    Check if file contains a carriage return without loading it into memory
     """
-    # read file contents
-    with open(file_name, "rb") as file:
-        contents = file.read()
+    buffer = bytearray(chunk_size)
+
+    with open(file_name, "rb") as source:
+        while size := source.readinto(buffer):
+            if buffer.find(b"\r", 0, size) != -1:
+                return True
+
+    return False
+
+
+def find_carriage_return(contents: Buffer) -> Optional[Violation]:
+    """
+    Find the first carriage return and count all of them
+    """
+    return scan_byte(contents, b"\r", "carriage return")
+
+
+def remove_carriage_return(file_name: str, chunk_size: int = CHUNK_SIZE) -> bool:
+    """
+    Remove carriage return from file. The file is streamed in chunks to a
+    temporary sibling file which then atomically replaces the original, so
+    memory use does not grow with the file size. Binary files and files
+    without carriage returns are left untouched.
+    """
+    if is_binary(file_name) or not contains_carriage_return(file_name, chunk_size):
+        return False
+
+    buffer = bytearray(chunk_size)
 
-    # remove carriage return from bytes
-    contents = contents.replace(b"\r", b"")
+    with atomic_replace(file_name) as target, open(file_name, "rb") as source:
+        # every carriage return is dropped on its own, so a \r that ends
+        # a chunk needs no look-ahead into the next one
+        with memoryview(buffer) as view:
+            while size := source.readinto(buffer):
+                target.write(strip_carriage_returns(view[:size].tobytes()))
 
-    # write file contents in binary mode
-    with open(file_name, "wb") as file:
-        file.write(contents)
+    return True
 
 
 if __name__ == "__main__":
-    # check if user provided file name
-    if len(sys.argv) != 2:
-        print("Usage: python remove_carriage_return.py <dir_name>")
-        exit()
-
-    # check if file exists
-    file_name = sys.argv[1]
-
-    if not pathlib.Path(file_name).is_dir():
-        print("Dir does not exist")
-        exit()
-
-    # find all files in directory and remove carriage return
-    for file in pathlib.Path(file_name).glob("**/*"):
-        if file.is_file():
-            remove_carriage_return(file)
+    args = HookArgumentParser(
+        "Remove carriage returns from every file in a directory"
+    ).parse_args()
+    run_hook(
+        remove_carriage_return,
+        args,
+        check=find_carriage_return,
+        cache_key=transforms_key([TRANSFORM]),
+    )
@@ -1,112 +1,151 @@
-# get file name from command line
-import pathlib
-import sys
-
-
-def remove_diacritics(file_name: str) -> None:
-    # read file contents
-    with open(file_name, "r", encoding="utf-8") as file:
-        contents = file.read()
-
-    # replace each character from aaaaaceeeeeiiiilnooooosuuuuüüüüzzAAAAACEEEEEIIIILNOOOOOSUUUUÜÜÜÜZZ
-    # with a respective character from
-    # aaaaaceeeeeiiiilnooooosuuuuüüüüzzAAAAACEEEEEIIIILNOOOOOSUUUUÜÜÜÜZZ
-
-    mapping = {
-        "ą": "a",
-        "ā": "a",
-        "á": "a",
-        "ǎ": "a",
-        "à": "a",
-        "ć": "c",
-        "č": "c",
-        "ĉ": "c",
-        "ċ": "c",
-        "ę": "e",
-        "ē": "e",
-        "ė": "e",
-        "ě": "e",
-        "ī": "i",
-        "į": "i",
-        "ĩ": "i",
-        "ĭ": "i",
-        "ł": "l",
-        "ń": "n",
-        "ň": "n",
-        "ņ": "n",
-        "ō": "o",
-        "ŏ": "o",
-        "ó": "o",
-        "ő": "o",
-        "ś": "s",
-        "ŝ": "s",
-        "š": "s",
-        "ŭ": "u",
-        "ų": "u",
-        "ű": "u",
-        "ũ": "u",
-        "ů": "u",
-        "ź": "z",
-        "ż": "z",
-        "Ą": "A",
-        "Ā": "A",
-        "Á": "A",
-        "Ǎ": "A",
-        "À": "A",
-        "Ć": "C",
-        "Č": "C",
-        "Ĉ": "C",
-        "Ċ": "C",
-        "Ę": "E",
-        "Ē": "E",
-        "Ė": "E",
-        "Ě": "E",
-        "Ī": "I",
-        "Į": "I",
-        "Ĩ": "I",
-        "Ĭ": "I",
-        "Ł": "L",
-        "Ń": "N",
-        "Ň": "N",
-        "Ņ": "N",
-        "Ō": "O",
-        "Ŏ": "O",
-        "Ó": "O",
-        "Ő": "O",
-        "Ś": "S",
-        "Ŝ": "S",
-        "Š": "S",
-        "Ŭ": "U",
-        "Ų": "U",
-        "Ű": "U",
-        "Ũ": "U",
-        "Ů": "U",
-        "Ź": "Z",
-        "Ż": "Z",
-    }
-
-    for old_value, new_value in mapping.items():
-        contents = contents.replace(old_value, new_value)
-
-    # write file contents
-    with open(file_name, "wb") as file:
-        file.write(bytes(contents, "UTF-8"))
+import functools
+import unicodedata
+
+from src.common.cli import HookArgumentParser, run_hook
+from src.common.normalization import (
+    Transform,
+    needs_normalization,
+    normalize_file,
+    transforms_key,
+)
+
+# replace each character from aaaaaceeeeeiiiilnooooosuuuuüüüüzzAAAAACEEEEEIIIILNOOOOOSUUUUÜÜÜÜZZ
+# with a respective character from
+# aaaaaceeeeeiiiilnooooosuuuuüüüüzzAAAAACEEEEEIIIILNOOOOOSUUUUÜÜÜÜZZ
+MAPPING = {
+    "ą": "a",
+    "ā": "a",
+    "á": "a",
+    "ǎ": "a",
+    "à": "a",
+    "ć": "c",
+    "č": "c",
+    "ĉ": "c",
+    "ċ": "c",
+    "ę": "e",
+    "ē": "e",
+    "ė": "e",
+    "ě": "e",
+    "ī": "i",
+    "į": "i",
+    "ĩ": "i",
+    "ĭ": "i",
+    "ł": "l",
+    "ń": "n",
+    "ň": "n",
+    "ņ": "n",
+    "ō": "o",
+    "ŏ": "o",
+    "ó": "o",
+    "ő": "o",
+    "ś": "s",
+    "ŝ": "s",
+    "š": "s",
+    "ŭ": "u",
+    "ų": "u",
+    "ű": "u",
+    "ũ": "u",
+    "ů": "u",
+    "ź": "z",
+    "ż": "z",
+    "Ą": "A",
+    "Ā": "A",
+    "Á": "A",
+    "Ǎ": "A",
+    "À": "A",
+    "Ć": "C",
+    "Č": "C",
+    "Ĉ": "C",
+    "Ċ": "C",
+    "Ę": "E",
+    "Ē": "E",
+    "Ė": "E",
+    "Ě": "E",
+    "Ī": "I",
+    "Į": "I",
+    "Ĩ": "I",
+    "Ĭ": "I",
+    "Ł": "L",
+    "Ń": "N",
+    "Ň": "N",
+    "Ņ": "N",
+    "Ō": "O",
+    "Ŏ": "O",
+    "Ó": "O",
+    "Ő": "O",
+    "Ś": "S",
+    "Ŝ": "S",
+    "Š": "S",
+    "Ŭ": "U",
+    "Ų": "U",
+    "Ű": "U",
+    "Ũ": "U",
+    "Ů": "U",
+    "Ź": "Z",
+    "Ż": "Z",
+}
+
+# Latin Extended-A and Latin Extended-B blocks
+EXTENDED_RANGE = range(0x0100, 0x0250)
+
+
+def build_translation_table(extended: bool = False) -> dict:
+    """
+    Builds a translation table for str.translate from the explicit mapping.
+    If extended is True, every letter of Latin Extended-A/B that decomposes
+    into an ASCII letter followed by combining marks is mapped as well.
+    """
+    mapping = {}
+
+    if extended:
+        for code_point in EXTENDED_RANGE:
+            base, *marks = unicodedata.normalize("NFD", chr(code_point))
+            if (
+                marks
+                and base.isascii()
+                and base.isalpha()
+                and all(unicodedata.combining(mark) for mark in marks)
+            ):
+                mapping[chr(code_point)] = base
+
+    mapping.update(MAPPING)
+
+    return str.maketrans(mapping)
+
+
+DIACRITICS_TABLE = build_translation_table()
+EXTENDED_DIACRITICS_TABLE = build_translation_table(extended=True)
+
+
+def strip_diacritics(contents: str) -> str:
+    return contents.translate(DIACRITICS_TABLE)
+
+
+def strip_extended_diacritics(contents: str) -> str:
+    return contents.translate(EXTENDED_DIACRITICS_TABLE)
+
+
+TRANSFORM = Transform("remove_diacritics", strip_diacritics)
+EXTENDED_TRANSFORM = Transform("remove_diacritics", strip_extended_diacritics)
+
+
+def remove_diacritics(file_name: str, extended: bool = False) -> bool:
+    return normalize_file(file_name, [EXTENDED_TRANSFORM if extended else TRANSFORM])
 
 
 if __name__ == "__main__":
-    # check if user provided file name
-    if len(sys.argv) != 2:
-        print("Usage: python remove_diacritics.py <dir_name>")
-        exit()
-
-    # check if file exists
-    file_name = sys.argv[1]
-
-    if not pathlib.Path(file_name).is_dir():
-        print("Dir does not exist")
-        exit()
-
-    # find all files in directory and remove diacritics
-    for file in pathlib.Path(file_name).glob("**/*"):
-        if file.is_file():
-            remove_diacritics(file)
+    parser = HookArgumentParser("Remove diacritics from every file in a directory")
+    parser.add_argument(
+        "-e",
+        "--extended",
+        help="Also remove diacritics from every letter of Latin Extended-A/B",
+        action="store_true",
+    )
+    args = parser.parse_args()
+    transforms = [EXTENDED_TRANSFORM if args.extended else TRANSFORM]
+    run_hook(
+        functools.partial(remove_diacritics, extended=args.extended),
+        args,
+        check=functools.partial(needs_normalization, transforms=transforms),
+        cache_key=transforms_key(transforms),
+    )
@@ -1,34 +1,84 @@
-import pathlib
-import sys
+import re
+from typing import Optional
 
+from src.common.cli import HookArgumentParser, run_hook
+from src.common.normalization import Transform, normalize_file, transforms_key
+from src.common.scanning import Buffer, Violation, line_number
 
-def remove_trailing_whitespaces(file_name: str) -> None:
-    # read file contents
-    with open(file_name, "r", encoding="utf-8") as file:
-        contents = file.read()
+WHITESPACE = b" \t\f\v"
+# line ending preceded by whitespace, matched from the newline so that the
+# regex engine can skip ahead with a fast literal search
+TRAILING_WHITESPACE = re.compile(rb"\n(?:(?<=[ \t\f\v]\n)|(?<=[ \t\f\v]\r\n))")
+# whitespace at the end of a last line without a line ending
+TRAILING_WHITESPACE_AT_END = re.compile(rb"[ \t\f\v]+\r?\Z")
+# whitespace at the end of any line, before its line terminator if it has one
+TRAILING_WHITESPACE_RUN = re.compile(rb"[ \t\f\v]+(?=\r?$)", re.MULTILINE)
 
-    # check each line for trailing whitespaces
-    contents = [line.rstrip() for line in contents.splitlines()]
 
-    # write file contents
-    with open(file_name, "w", encoding="utf-8") as file:
-        file.write("\n".join(contents))
+def has_trailing_whitespaces(contents: Buffer) -> bool:
+    return bool(
+        TRAILING_WHITESPACE.search(contents)
+        or TRAILING_WHITESPACE_AT_END.search(contents, contents.rfind(b"\n") + 1)
+    )
+
+
+def strip_trailing_whitespaces(contents: bytes) -> bytes:
+    # clean files are detected with the fast search and returned as they are,
+    # the others are rewritten with a single substitution that leaves the
+    # line terminators and the final newline in place
+    if not has_trailing_whitespaces(contents):
+        return contents
+
+    return TRAILING_WHITESPACE_RUN.sub(b"", contents)
+
+
+TRANSFORM = Transform(
+    "remove_trailing_whitespaces", strip_trailing_whitespaces, binary=True, version=2
+)
+
+
+def remove_trailing_whitespaces(file_name: str) -> bool:
+    return normalize_file(file_name, [TRANSFORM])
+
+
+def find_trailing_whitespaces(contents: Buffer) -> Optional[Violation]:
+    """
+    Find the first line with trailing whitespace and count all of them
+    """
+    count = 0
+    match = None
+    for count, found in enumerate(TRAILING_WHITESPACE.finditer(contents), 1):
+        match = match or found
+
+    last_line = contents.rfind(b"\n") + 1
+    at_end = TRAILING_WHITESPACE_AT_END.search(contents, last_line)
+    if at_end:
+        count += 1
+
+    if match:
+        # the whitespace run ends right before the line ending
+        offset = match.start()
+        if contents[offset - 1 : offset] == b"\r":
+            offset -= 1
+        while offset and contents[offset - 1] in WHITESPACE:
+            offset -= 1
+    elif at_end:
+        offset = at_end.start()
+    else:
+        return None
+
+    return Violation(
+        line_number(contents, offset), offset, count, "trailing whitespace"
+    )
 
 
 if __name__ == "__main__":
-    # check if user provided file name
-    if len(sys.argv) != 2:
-        print("Usage: python remove_trailing_whitespaces.py <dir_name>")
-        exit()
-
-    # check if file exists
-    file_name = sys.argv[1]
-
-    if not pathlib.Path(file_name).is_dir():
-        print("Dir does not exist")
-        exit()
-
-    # find all files in directory and remove diacritics
-    for file in pathlib.Path(file_name).glob("**/*"):
-        if file.is_file():
-            remove_trailing_whitespaces(file)
+    args = HookArgumentParser(
+        "Remove trailing whitespaces from every file in a directory"
+    ).parse_args()
+    run_hook(
+        remove_trailing_whitespaces,
+        args,
+        check=find_trailing_whitespaces,
+        cache_key=transforms_key([TRANSFORM]),
+    )
@@ -0,0 +1,377 @@
+"""
+Runs the selected hooks in a single process, in place of starting every hook
+script on its own.
+
+The files are collected with a single walk and every file is read once,
+passed through all of the selected content hooks and written at most once.
+The external formatters only receive the files they apply to and run
+concurrently with each other, while the staged binary check runs alongside
+everything else. Files found clean by the content hooks in a previous run
+are skipped by them, through the same result cache the single hooks use.
+A table with the time spent in each hook is printed at the end.
+
+update_type_annotations is not run, since it executes every python file
+with monkeytype instead of formatting it.
+"""
+import argparse
+import functools
+import pathlib
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from src.common import tracing
+from src.common.cache import blob_sha, open_cache
+from src.common.cli import collect_files, filter_ignored, skip_clean_files
+from src.common.git import staged_files
+from src.common.normalization import normalize_file, transforms_key
+from src.common.runner import FileResult, run_parallel
+from src.common.sniffing import is_binary
+from src.correct_file_names import apply_renames, plan_file_renames
+from src.no_binaries import find_binaries
+from src.normalize import TRANSFORMS, selected_transforms
+
+
+@dataclass(frozen=True)
+class CommandHook:
+    """
+    External formatter run once over all files it applies to.
+
+    :param name: name of the hook.
+    :param suffixes: suffixes of the files the hook applies to.
+    :param commands: commands run in order, each followed by the paths to the files.
+    """
+
+    name: str
+    suffixes: Tuple[str, ...]
+    commands: Tuple[Tuple[str, ...], ...]
+
+
+COMMAND_HOOKS = {
+    hook.name: hook
+    for hook in (
+        CommandHook(
+            "python_format",
+            (".py",),
+            (
+                ("autopep8", "--in-place", "--aggressive"),
+                (
+                    "autoflake",
+                    "--in-place",
+                    "--remove-unused-variables",
+                    "--remove-all-unused-imports",
+                    "--expand-star-imports",
+                ),
+                ("isort",),
+                ("black", "--quiet"),
+            ),
+        ),
+        CommandHook(
+            "cpp_format",
+            (".cpp", ".hpp", ".cu", ".c", ".h"),
+            (("clang-format", "-style=file", "-i"),),
+        ),
+        CommandHook("shell_format", (".sh",), (("beautysh",),)),
+    )
+}
+
+NO_BINARIES = "no_binaries"
+CORRECT_FILE_NAMES = "correct_file_names"
+
+HOOKS = [*TRANSFORMS, *COMMAND_HOOKS, NO_BINARIES, CORRECT_FILE_NAMES]
+
+
+@dataclass
+class HookReport:
+    """
+    Summary of running a single hook.
+
+    :param files: number of files the hook was run on.
+    :param seconds: time spent in the hook.
+    :param failed: True if the hook reported a problem.
+    """
+
+    files: int = 0
+    seconds: float = 0.0
+    failed: bool = False
+
+
+def process_file(
+    file_name: str, names: Sequence[str], hash_contents: bool = False
+) -> FileResult:
+    """
+    Passes the file through all of the selected content hooks with a single
+    read and at most one write.
+
+    :param file_name: path to the file.
+    :param names: names of the content hooks to apply.
+    :param hash_contents: if True, the SHA of text contents left unchanged is returned with the result.
+    :return: result of processing the file, with the time spent in each hook.
+    """
+    result = FileResult(str(file_name))
+    result.modified = normalize_file(
+        file_name, selected_transforms(names), result.timings
+    )
+    if hash_contents and not result.modified and not is_binary(file_name):
+        result.sha = blob_sha(pathlib.Path(file_name).read_bytes())
+
+    return result
+
+
+def run_content_hooks(
+    files: List[pathlib.Path],
+    names: Sequence[str],
+    dir_name: str,
+    jobs: int,
+    cache: bool,
+) -> List[FileResult]:
+    """
+    Runs the content hooks on the files that are not known to be clean.
+
+    :param files: paths to the files.
+    :param names: names of the content hooks to apply.
+    :param dir_name: path to the directory.
+    :param jobs: number of worker processes, the number of CPUs if 0.
+    :param cache: if False, every file is processed, even if it was found clean by a previous run.
+    :return: results of the processed files.
+    """
+    key = transforms_key(selected_transforms(names))
+    with open_cache(dir_name, key, enabled=cache) as result_cache:
+        shas = skip_clean_files(files, result_cache, False, dir_name)
+        files = list(shas)
+        results = run_parallel(
+            functools.partial(
+                process_file, names=names, hash_contents=result_cache.enabled
+            ),
+            files,
+            jobs,
+        )
+
+        for file, result in zip(files, results):
+            if not result.modified and not result.error:
+                result_cache.mark_clean(result.sha or shas[file], file)
+
+    return results
+
+
+def run_command_hook(hook: CommandHook, files: List[pathlib.Path]) -> Tuple[int, bool]:
+    """
+    Runs the external formatter on the files it applies to.
+
+    :param hook: hook to run.
+    :param files: paths to all of the files.
+    :return: number of files the hook applies to and True if any command failed.
+    """
+    files = [str(file) for file in files if file.suffix in hook.suffixes]
+    failed = False
+
+    for command in hook.commands:
+        if not files:
+            break
+        if shutil.which(command[0]) is None:
+            print(f"{hook.name}: {command[0]} is not installed, skipping")
+            continue
+        failed |= subprocess.run([*command, *files]).returncode != 0
+
+    return len(files), failed
+
+
+def run_no_binaries(dir_name: str) -> Tuple[int, bool]:
+    """
+    Checks the files staged for commit for binaries.
+
+    :param dir_name: path to a directory inside the repository.
+    :return: number of binaries found and True if any was found or git failed.
+    """
+    try:
+        binaries = find_binaries(dir_name)
+    except subprocess.CalledProcessError:
+        return 0, True
+
+    for path, size in binaries:
+        print(f"{path}: binary file staged for commit ({size} bytes)")
+
+    return len(binaries), bool(binaries)
+
+
+def timed(name: str, func, *args) -> Tuple[float, Tuple[int, bool]]:
+    with tracing.span(name, "hook"):
+        start = time.perf_counter()
+        outcome = func(*args)
+    return time.perf_counter() - start, outcome
+
+
+def run_hooks(
+    dir_name: str,
+    names: Sequence[str],
+    jobs: int = 0,
+    staged: bool = False,
+    ignore: Sequence[str] = (),
+    cache: bool = True,
+) -> Tuple[Dict[str, HookReport], List[FileResult]]:
+    """
+    Runs the selected hooks on the files in the directory.
+
+    :param dir_name: path to the directory.
+    :param names: names of the hooks to run.
+    :param jobs: number of worker processes for the content hooks, the number of CPUs if 0.
+    :param staged: if True, only files staged for commit are processed.
+    :param ignore: extra patterns in .gitignore syntax, relative to the directory.
+    :param cache: if False, the content hooks process every file, even if it was found clean by a previous run.
+    :return: report of every hook that was run and the results of the content hooks.
+    """
+    if staged:
+        files = filter_ignored(staged_files(dir_name), dir_name, ignore)
+    else:
+        files = collect_files(dir_name, ignore)
+    reports = {name: HookReport() for name in HOOKS if name in names}
+    transforms = [name for name in TRANSFORMS if name in names]
+    commands = [COMMAND_HOOKS[name] for name in COMMAND_HOOKS if name in names]
+
+    with ThreadPoolExecutor(max_workers=max(len(commands), 1) + 1) as executor:
+        # the binary check only reads the index, so it never races the writers
+        no_binaries = None
+        if NO_BINARIES in reports:
+            no_binaries = executor.submit(timed, NO_BINARIES, run_no_binaries, dir_name)
+
+        results = []
+        if transforms:
+            results = run_content_hooks(files, transforms, dir_name, jobs, cache)
+            for result in results:
+                for name, seconds in result.timings.items():
+                    reports[name].files += 1
+                    reports[name].seconds += seconds
+
+        # every formatter owns a different set of files, so they run concurrently
+        futures = {
+            hook.name: executor.submit(timed, hook.name, run_command_hook, hook, files)
+            for hook in commands
+        }
+        if no_binaries is not None:
+            futures[NO_BINARIES] = no_binaries
+
+        for name, future in futures.items():
+            seconds, (count, failed) = future.result()
+            reports[name] = HookReport(count, seconds, failed)
+
+    # renaming invalidates the paths used by the other hooks, so it runs last
+    if CORRECT_FILE_NAMES in reports:
+        start = time.perf_counter()
+        with tracing.span(CORRECT_FILE_NAMES, "hook"):
+            plan = plan_file_renames(dir_name, files)
+            apply_renames(plan.renames)
+        for target, paths in plan.collisions.items():
+            print(
+                f"Cannot rename {', '.join(map(str, paths))}: all would become {target}"
+            )
+        reports[CORRECT_FILE_NAMES] = HookReport(
+            len(plan.renames), time.perf_counter() - start, bool(plan.collisions)
+        )
+
+    return reports, results
+
+
+def print_timings(reports: Dict[str, HookReport]) -> None:
+    """
+    Prints the time spent in each hook, slowest first. The time of the content
+    hooks is summed over all worker processes.
+
+    :param reports: reports returned by run_hooks.
+    """
+    width = max(map(len, reports), default=0)
+    print(f"{'Hook':<{width}}  {'Files':>7}  {'Time [s]':>9}  Status")
+
+    for name, report in sorted(
+        reports.items(), key=lambda item: item[1].seconds, reverse=True
+    ):
+        status = "failed" if report.failed else "ok"
+        print(f"{name:<{width}}  {report.files:>7}  {report.seconds:>9.3f}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the selected hooks with a single pass over the files"
+    )
+    parser.add_argument("dir_name", help="Name of the directory to process")
+    parser.add_argument(
+        "--hooks",
+        help="Hooks to run, all of them by default",
+        nargs="+",
+        choices=HOOKS,
+        default=HOOKS,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes, defaults to the number of CPUs",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "-s",
+        "--staged",
+        help="Only process files staged for commit in the directory",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-i",
+        "--ignore",
+        help="Ignore files or directories matching the patterns, in .gitignore "
+        "syntax. Files ignored by .gitignore are always skipped",
+        nargs="+",
+        default=[],
+    )
+    parser.add_argument(
+        "--no-cache",
+        help="Process every file, even if it was found clean by a previous run",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Write the time spent on every file and hook to the file, "
+        "in the Chrome trace-event format",
+        metavar="FILE",
+    )
+    args = parser.parse_args()
+
+    # check if file exists
+    if not pathlib.Path(args.dir_name).is_dir():
+        print("Dir does not exist")
+        sys.exit(1)
+
+    if args.trace:
+        tracing.start(args.trace)
+
+    start = time.perf_counter()
+    try:
+        reports, results = run_hooks(
+            args.dir_name,
+            args.hooks,
+            args.jobs,
+            args.staged,
+            args.ignore,
+            not args.no_cache,
+        )
+    except subprocess.CalledProcessError:
+        # git already explained what went wrong
+        sys.exit(1)
+
+    for result in results:
+        if result.error:
+            print(f"{result.path}: {result.error}")
+
+    print_timings(reports)
+    modified = sum(result.modified for result in results)
+    print(f"Modified {modified} files in {time.perf_counter() - start:.3f}s")
+
+    failed = [report for report in reports.values() if report.failed]
+    if failed or any(result.error for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import subprocess
+
+import pytest
+
+
+@pytest.fixture
+def git_repository(tmpdir):
+    """
+    Creates an empty git repository in a temporary directory.
+
+    :return: path to the repository.
+    """
+    subprocess.run(["git", "init", "-q", str(tmpdir)], check=True)
+    subprocess.run(
+        ["git", "config", "user.email", "hooks@example.com"], cwd=tmpdir, check=True
+    )
+    subprocess.run(["git", "config", "user.name", "Hooks"], cwd=tmpdir, check=True)
+    return tmpdir
+
+
+def git_add(repository, *paths):
+    subprocess.run(["git", "add", "--", *map(str, paths)], cwd=repository, check=True)
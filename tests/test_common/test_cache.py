@@ -0,0 +1,110 @@
+import pickle
+import subprocess
+
+from src.common.cache import (
+    MemoCache,
+    ResultCache,
+    blob_sha,
+    hook_key,
+    open_cache,
+    open_memo_cache,
+)
+
+
+def test_blob_sha(git_repository):
+    # the SHA matches the one git assigns to the blob.
+    file_name = git_repository / "file.txt"
+    file_name.write_binary(b"contents\r\n")
+    output = subprocess.run(
+        ["git", "hash-object", str(file_name)], check=True, stdout=subprocess.PIPE
+    ).stdout
+    assert blob_sha(b"contents\r\n") == output.decode().strip()
+
+
+def test_result_cache(git_repository):
+    # results survive between runs and are kept apart per hook.
+    hook = hook_key("hook", 1)
+    with open_cache(git_repository, hook) as cache:
+        assert cache.enabled
+        assert not cache.is_clean("a")
+        cache.mark_clean("a")
+
+    with open_cache(git_repository, hook) as cache:
+        assert cache.is_clean("a")
+        assert not cache.is_clean(None)
+    with open_cache(git_repository, hook_key("hook", 2)) as cache:
+        assert not cache.is_clean("a")
+    with open_cache(git_repository, hook, enabled=False) as cache:
+        assert not cache.enabled
+        assert not cache.is_clean("a")
+
+
+def test_result_cache_outside_repository(tmpdir):
+    with open_cache(tmpdir, hook_key("hook", 1)) as cache:
+        assert not cache.enabled
+
+
+def test_result_cache_eviction(tmpdir):
+    # the least recently used results are evicted first.
+    database = tmpdir / "cache.sqlite"
+    for sha in ("a", "b", "c"):
+        with ResultCache(database, "hook", max_entries=2) as cache:
+            # looking up a keeps it fresh
+            cache.is_clean("a")
+            cache.mark_clean(sha)
+
+    with ResultCache(database, "hook", max_entries=2) as cache:
+        assert [cache.is_clean(sha) for sha in ("a", "b", "c")] == [True, False, True]
+
+
+def test_memo_cache(git_repository):
+    # results survive between runs, while the counters track the lookups.
+    hook = hook_key("hook", 1)
+    with open_memo_cache(git_repository, hook) as cache:
+        assert cache.enabled
+        assert cache.get("text") is None
+        cache.put("text", ["formatted", "text"])
+        assert cache.get("text") == ["formatted", "text"]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    with open_memo_cache(git_repository, hook) as cache:
+        assert cache.get("text") == ["formatted", "text"]
+        assert cache.get("other") is None
+    with open_memo_cache(git_repository, hook_key("hook", 2)) as cache:
+        assert cache.get("text") is None
+    with open_memo_cache(git_repository, hook, enabled=False) as cache:
+        assert not cache.enabled
+        assert cache.get("text") is None
+
+
+def test_memo_cache_eviction(tmpdir):
+    # the memory and the database both keep the most recently used results.
+    database = tmpdir / "cache.sqlite"
+    for text in ("a", "b", "c"):
+        with MemoCache(database, "hook", max_size=1, max_entries=2) as cache:
+            cache.get("a")
+            cache.put(text, text.upper())
+            assert list(cache.memory) == [cache.key(text)]
+
+    with MemoCache(database, "hook") as cache:
+        assert [cache.get(text) for text in ("a", "b", "c")] == ["A", None, "C"]
+
+
+def test_memo_cache_merge(tmpdir):
+    # changes made in a worker process are stored by the main process.
+    database = tmpdir / "cache.sqlite"
+    cache = MemoCache(database, "hook")
+    worker_cache = pickle.loads(pickle.dumps(cache))
+    assert worker_cache is not cache
+    assert pickle.loads(pickle.dumps(cache)) is worker_cache
+
+    worker_cache.put("text", "TEXT")
+    assert worker_cache.get("text") == "TEXT"
+    assert worker_cache.get("other") is None
+    cache.merge(worker_cache.drain())
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (worker_cache.hits, worker_cache.misses) == (0, 0)
+    cache.close()
+
+    with MemoCache(database, "hook") as cache:
+        assert cache.get("text") == "TEXT"
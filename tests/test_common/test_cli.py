@@ -0,0 +1,56 @@
+import functools
+import os
+from pathlib import Path
+
+from src.common.cache import blob_sha, open_cache
+from src.common.cli import check_staged_files, report, run_hashed, skip_clean_files
+from src.common.normalization import needs_normalization, transforms_key
+from src.remove_carriage_return import TRANSFORM
+from tests.conftest import git_add
+
+
+def test_check_staged_files(git_repository, capsys):
+    # the staged contents are checked and nothing is modified.
+    clean = git_repository / "clean.txt"
+    dirty = git_repository / "dirty.txt"
+    clean.write_binary(b"clean\n")
+    dirty.write_binary(b"dirty\r\n")
+    git_add(git_repository, "clean.txt", "dirty.txt")
+    # fixing the working tree copy does not fix the staged one
+    dirty.write_binary(b"dirty\n")
+
+    check = functools.partial(needs_normalization, transforms=[TRANSFORM])
+    results = check_staged_files([clean, dirty], check, git_repository)
+
+    assert [result.modified for result in results] == [False, True]
+    assert report(results, check=True) == 1
+    assert f"{dirty}: would be modified" in capsys.readouterr().out
+    assert dirty.read_binary() == b"dirty\n"
+
+
+def test_skip_clean_files(git_repository):
+    # only files not found clean by a previous run are returned, without
+    # reading them, since the workers return the SHAs of the clean contents.
+    clean = git_repository / "clean.txt"
+    dirty = git_repository / "dirty.txt"
+    clean.write_binary(b"clean\n")
+    dirty.write_binary(b"dirty\r\n")
+    files = [Path(clean), Path(dirty)]
+    # files modified within the last seconds are always hashed again
+    for file in files:
+        os.utime(file, ns=(1_000_000_000, 1_000_000_000))
+
+    with open_cache(git_repository, transforms_key([TRANSFORM])) as cache:
+        shas = skip_clean_files(files, cache, False, git_repository)
+        assert shas == dict.fromkeys(files)
+        result = run_hashed(str(clean), func=lambda file_name: False)
+        assert result.sha == blob_sha(b"clean\n")
+        cache.mark_clean(result.sha, clean)
+
+    with open_cache(git_repository, transforms_key([TRANSFORM])) as cache:
+        assert list(skip_clean_files(files, cache, False, git_repository)) == [files[1]]
+
+    # a change to the contents invalidates the result
+    clean.write_binary(b"changed\n")
+    with open_cache(git_repository, transforms_key([TRANSFORM])) as cache:
+        assert list(skip_clean_files(files, cache, False, git_repository)) == files
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from src.common.file_writer import atomic_replace, write_if_changed
+
+
+def test_write_if_changed_skips_unchanged_file(tmpdir):
+    # an unchanged file must not be rewritten, so its mtime stays the same.
+    file_name = tmpdir.join("unchanged.txt")
+    file_name.write_binary(b"contents\n")
+    os.utime(file_name, ns=(0, 0))
+
+    assert not write_if_changed(file_name, b"contents\n", b"contents\n")
+    assert os.stat(file_name).st_mtime_ns == 0
+
+
+def test_write_if_changed_replaces_file(tmpdir):
+    # a changed file is replaced and keeps its permissions.
+    file_name = tmpdir.join("changed.sh")
+    file_name.write_binary(b"contents \n")
+    os.chmod(file_name, 0o755)
+
+    assert write_if_changed(file_name, b"contents \n", b"contents\n")
+    assert file_name.read_binary() == b"contents\n"
+    assert os.stat(file_name).st_mode & 0o777 == 0o755
+    assert tmpdir.listdir() == [file_name]
+
+
+def test_atomic_replace_keeps_original_on_error(tmpdir):
+    # if writing fails, the original file is left intact
+    # and the temporary file is removed.
+    file_name = tmpdir.join("original.txt")
+    file_name.write_binary(b"original\n")
+
+    with pytest.raises(RuntimeError):
+        with atomic_replace(file_name) as file:
+            file.write(b"partial")
+            raise RuntimeError
+
+    assert file_name.read_binary() == b"original\n"
+    assert tmpdir.listdir() == [file_name]
+
+
+def test_write_if_changed_follows_symlink(tmpdir):
+    # the file a link points to is replaced, the link itself is kept.
+    target = tmpdir.mkdir("target").join("file.txt")
+    target.write_binary(b"contents \n")
+    link = tmpdir.join("link.txt")
+    link.mksymlinkto(target)
+
+    assert write_if_changed(link, b"contents \n", b"contents\n")
+    assert link.islink()
+    assert target.read_binary() == b"contents\n"
+    assert sorted(tmpdir.listdir()) == [link, target.dirpath()]
+    assert target.dirpath().listdir() == [target]
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from src.common.git import (
+    BlobReader,
+    object_sizes,
+    repository_root,
+    staged_entries,
+    staged_files,
+)
+from tests.conftest import git_add
+
+
+def test_staged_files(git_repository):
+    # only files staged for commit are returned, limited to the given path.
+    (git_repository / "staged.txt").write("staged")
+    (git_repository / "unstaged.txt").write("unstaged")
+    (git_repository / "sub dir").mkdir()
+    (git_repository / "sub dir" / "staged.py").write("staged")
+    git_add(git_repository, "staged.txt", "sub dir/staged.py")
+
+    root = repository_root(git_repository)
+    assert root == Path(git_repository).resolve()
+    assert staged_files(git_repository) == [
+        root / "staged.txt",
+        root / "sub dir" / "staged.py",
+    ]
+    assert staged_files(git_repository / "sub dir") == [root / "sub dir" / "staged.py"]
+
+    # symbolic links are skipped, their blob is the path they point to
+    (git_repository / "link.txt").mksymlinkto("sub dir/staged.py")
+    git_add(git_repository, "link.txt")
+    assert [entry.path.name for entry in staged_entries(git_repository)] == [
+        "staged.txt",
+        "staged.py",
+    ]
+    assert "link.txt" not in [path.name for path in staged_files(git_repository)]
+
+    # files removed from the working tree after staging are skipped
+    (git_repository / "staged.txt").remove()
+    assert staged_files(git_repository) == [root / "sub dir" / "staged.py"]
+
+
+def test_blob_reader(git_repository):
+    # staged contents are read from the index, not from the working tree.
+    file_name = git_repository / "file.txt"
+    file_name.write_binary(b"staged\r\n")
+    git_add(git_repository, "file.txt")
+    file_name.write_binary(b"unstaged\n")
+
+    with BlobReader(git_repository) as reader:
+        assert reader.read_staged(file_name) == b"staged\r\n"
+        assert reader.read_staged(git_repository / "missing.txt") is None
+        # the same process keeps serving requests
+        assert reader.read_staged(file_name) == b"staged\r\n"
+
+
+def test_read_prefix(git_repository):
+    # the rest of a long object is skipped and the next request still works.
+    (git_repository / "long.txt").write_binary(b"a" * 100 + b"b" * 100)
+    (git_repository / "short.txt").write_binary(b"short")
+    git_add(git_repository, "long.txt", "short.txt")
+
+    entries = staged_entries(git_repository)
+    assert [entry.path.name for entry in entries] == ["long.txt", "short.txt"]
+    assert object_sizes([entry.sha for entry in entries], git_repository) == {
+        entries[0].sha: 200,
+        entries[1].sha: 5,
+    }
+
+    with BlobReader(git_repository) as reader:
+        assert reader.read_prefix(entries[0].sha, 10) == b"a" * 10
+        assert reader.read_prefix(entries[1].sha, 10) == b"short"
+        assert reader.read_prefix("0" * 40, 10) is None
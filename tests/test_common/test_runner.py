@@ -0,0 +1,60 @@
+import os
+
+from src.common.runner import FileResult, make_batches, run_parallel
+
+
+def fail_on_broken_files(file_name) -> bool:
+    if "broken" in str(file_name):
+        raise ValueError("broken file")
+    return "modified" in str(file_name)
+
+
+def record_process(file_name) -> FileResult:
+    return FileResult(str(file_name), message=str(os.getpid()))
+
+
+def test_make_batches(tmpdir):
+    # small files are grouped together, large files get a batch of their own.
+    small = [tmpdir.join(f"small_{i}.txt") for i in range(3)]
+    large = tmpdir.join("large.txt")
+    for file in small:
+        file.write("x" * 10)
+    large.write("x" * 100)
+
+    batches = make_batches([*small[:2], large, small[2]], batch_size=50)
+    assert batches == [small[:2], [large], [small[2]]]
+
+
+def test_run_parallel(tmpdir):
+    # results and errors come back in the order of the input paths.
+    names = ["a_modified", "b_clean", "c_broken", "d_modified"] * 10
+    paths = []
+    for i, name in enumerate(names):
+        path = tmpdir.join(f"{i:02}_{name}.txt")
+        path.write("contents")
+        paths.append(path)
+
+    # small batches spread the files over several workers
+    for jobs in (1, 4):
+        results = run_parallel(fail_on_broken_files, paths, jobs=jobs, batch_length=3)
+        assert [result.path for result in results] == [str(path) for path in paths]
+        assert [result.modified for result in results] == [
+            "modified" in name for name in names
+        ]
+        assert [bool(result.error) for result in results] == [
+            "broken" in name for name in names
+        ]
+
+
+def test_run_parallel_workers(tmpdir):
+    # files split into several batches are processed by the worker processes.
+    paths = []
+    for i in range(12):
+        path = tmpdir.join(f"{i:02}.txt")
+        path.write("contents")
+        paths.append(path)
+
+    results = run_parallel(record_process, paths, jobs=2, batch_length=2)
+    assert [result.path for result in results] == [str(path) for path in paths]
+    assert str(os.getpid()) not in {result.message for result in results}
+    assert run_parallel(record_process, paths, jobs=1)[0].message == str(os.getpid())
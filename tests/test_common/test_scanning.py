@@ -0,0 +1,24 @@
+from src.common.scanning import Violation, line_number, mapped_file, scan_byte
+
+
+def test_line_number():
+    contents = b"first\nsecond\n\nfourth"
+    assert line_number(contents, 0) == 1
+    assert line_number(contents, 5) == 1
+    assert line_number(contents, 6) == 2
+    assert line_number(contents, len(contents)) == 4
+
+
+def test_scan_byte_mapped_file(tmpdir):
+    # memory-mapped files are scanned like bytes, and empty files
+    # cannot be mapped at all.
+    file_name = tmpdir / "file.txt"
+    file_name.write_binary(b"first\r\nsecond\r\n")
+    with mapped_file(file_name) as contents:
+        assert scan_byte(contents, b"\r", "carriage return") == Violation(
+            1, 5, 2, "carriage return"
+        )
+
+    file_name.write_binary(b"")
+    with mapped_file(file_name) as contents:
+        assert scan_byte(contents, b"\r", "carriage return") is None
@@ -0,0 +1,35 @@
+from src.common.sniffing import SNIFF_SIZE, is_binary, looks_binary, looks_like_data
+
+
+def test_looks_binary():
+    assert not looks_binary(b"")
+    assert not looks_binary("zażółć gęślą jaźń\n".encode("utf-8"))
+    assert looks_binary(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+    assert looks_binary("zażółć".encode("iso8859_2"))
+
+    # a multibyte character cut in half at the end of the sniffed chunk
+    assert not looks_binary("ż".encode("utf-8")[:1])
+
+
+def test_looks_like_data():
+    # text is accepted whatever its encoding.
+    assert not looks_like_data(b"")
+    assert not looks_like_data("zażółć gęślą jaźń\n".encode("iso8859_2"))
+    assert not looks_like_data("zażółć gęślą jaźń\n".encode("utf-16"))
+    assert not looks_like_data("zażółć".encode("utf-32"))
+    assert not looks_like_data(b"\x1b[31mred\x1b[0m\r\n")
+
+    assert looks_like_data(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+    assert looks_like_data(bytes(range(1, 32)))
+    assert looks_like_data("text".encode("utf-16")[:2] + b"\0\0" * 8)
+
+
+def test_is_binary(tmpdir):
+    # only the beginning of the file is inspected.
+    file_name = tmpdir.join("late_nul.txt")
+    file_name.write_binary(b"x" * SNIFF_SIZE + b"\0")
+    assert not is_binary(file_name)
+
+    # the verdict is recomputed once the file changes.
+    file_name.write_binary(b"\0" + b"x" * SNIFF_SIZE)
+    assert is_binary(file_name)
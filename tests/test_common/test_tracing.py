@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from src.common import tracing
+from src.common.runner import BATCH_SIZE, run_parallel
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = tracing.Tracer()
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    return tracer
+
+
+def is_modified(file_name) -> bool:
+    return "modified" in str(file_name)
+
+
+def test_disabled_tracing(tracer):
+    # nothing is recorded until tracing is enabled.
+    with tracing.span("file.txt", "file"):
+        pass
+
+    assert tracing.span("file.txt") is tracing.span("other.txt")
+    assert tracer.events == []
+
+
+def test_span(tracer):
+    tracing.enable()
+    with tracing.span("outer", "hook", lines=3):
+        with tracing.span("inner", "filter"):
+            pass
+
+    inner, outer = tracing.drain()
+    assert (inner["name"], inner["cat"], inner["ph"]) == ("inner", "filter", "X")
+    assert outer["args"] == {"lines": 3}
+    assert outer["ts"] <= inner["ts"]
+    assert outer["dur"] >= inner["dur"]
+    assert tracer.events == []
+
+
+def test_worker_spans_are_merged(tracer, tmpdir):
+    # spans recorded in the worker processes end up in the written trace,
+    # every file is large enough to get a batch of its own.
+    paths = []
+    for i in range(3):
+        path = tmpdir.join(f"{i}_modified.txt")
+        path.write("x" * BATCH_SIZE)
+        paths.append(path)
+
+    tracing.enable()
+    with tracing.span("run", "hook"):
+        results = run_parallel(is_modified, paths, jobs=2)
+    assert all(result.modified for result in results)
+
+    output = tmpdir.join("trace.json")
+    tracing.write(output)
+    events = json.loads(output.read())["traceEvents"]
+
+    files = sorted(event["name"] for event in events if event.get("cat") == "file")
+    assert files == sorted(map(str, paths))
+    processes = [event for event in events if event["ph"] == "M"]
+    pids = {event["pid"] for event in events}
+    assert len(pids) > 1
+    assert {event["pid"] for event in processes} == pids
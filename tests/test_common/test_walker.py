@@ -0,0 +1,108 @@
+import subprocess
+
+import pytest
+
+from src.common.walker import compile_patterns, is_path_ignored, walk
+
+
+def walked(directory, ignore=()):
+    return sorted(
+        entry.path[len(str(directory)) + 1 :] for entry in walk(directory, ignore)
+    )
+
+
+def test_walk(tmpdir):
+    # ignored directories are pruned and nested .gitignore files apply
+    # only below their directory.
+    for name in (
+        ".git/HEAD",
+        "node_modules/package/index.js",
+        "build/output.o",
+        "src/main.py",
+        "src/main.pyc",
+        "src/keep.log",
+        "src/nested/.gitignore",
+        "src/nested/data.csv",
+        "src/nested/deep/data.csv",
+        "docs/data.csv",
+        "debug.log",
+    ):
+        (tmpdir / name).write("temp", ensure=True)
+    (tmpdir / ".gitignore").write("node_modules/\n/build\n*.py[co]\n*.log\n!keep.log\n")
+    (tmpdir / "src" / "nested" / ".gitignore").write("*.csv\n")
+
+    assert walked(tmpdir) == [
+        ".gitignore",
+        "docs/data.csv",
+        "src/keep.log",
+        "src/main.py",
+        "src/nested/.gitignore",
+    ]
+    assert walked(tmpdir, ["docs", "src/**/*.gitignore"]) == [
+        ".gitignore",
+        "src/keep.log",
+        "src/main.py",
+    ]
+
+
+def test_walk_skips_symlinks(tmpdir):
+    # links are not yielded, wherever they point to.
+    outside = tmpdir.mkdir("outside").join("file.txt")
+    outside.write("temp")
+    tree = tmpdir.mkdir("tree")
+    tree.join("main.py").write("temp")
+    tree.join("link.txt").mksymlinkto(outside)
+    tree.join("local.py").mksymlinkto(tree.join("main.py"))
+    tree.join("linked").mksymlinkto(outside.dirpath())
+
+    assert walked(tree) == ["main.py"]
+
+
+def test_walk_repository_subdirectory(git_repository):
+    # the .gitignore files above the walked directory and the exclude files
+    # of the repository apply, anchored at the root of the repository.
+    for name in (
+        "src/main.py",
+        "src/debug.log",
+        "src/generated/output.py",
+        "src/scratch.tmp",
+        "src/backup.bak",
+        "src/skip.py",
+        "src/top.py",
+        "src/nested/top.py",
+    ):
+        (git_repository / name).write("temp", ensure=True)
+    (git_repository / ".gitignore").write("*.log\n/src/generated/\n")
+    (git_repository / ".git" / "info" / "exclude").write("*.tmp\n", ensure=True)
+    (git_repository / "excludes").write("*.bak\n")
+    subprocess.run(
+        ["git", "config", "core.excludesFile", str(git_repository / "excludes")],
+        cwd=git_repository,
+        check=True,
+    )
+
+    assert walked(git_repository / "src", ["skip.py", "/top.py"]) == [
+        "main.py",
+        "nested/top.py",
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern, path, ignored",
+    [
+        ("*.py", "a/b/c.py", True),
+        ("/*.py", "a/c.py", False),
+        ("/*.py", "c.py", True),
+        ("a/*.py", "a/b/c.py", False),
+        ("a/**/c.py", "a/b/d/c.py", True),
+        ("**/b", "a/b/c.py", True),
+        ("a/**", "a/b/c.py", True),
+        ("b/", "a/b", False),
+        ("b/", "a/b/c.py", True),
+        ("c.p?", "c.py", True),
+        ("c.[!p]y", "c.py", False),
+        ("\\#c.py", "#c.py", True),
+    ],
+)
+def test_is_path_ignored(pattern, path, ignored):
+    assert is_path_ignored(compile_patterns([pattern]), path) == ignored
@@ -1,6 +1,13 @@
 from git_root import git_root
 
-from src.correct_file_names import correct_file_name
+from src.correct_file_names import (
+    Rename,
+    apply_renames,
+    correct_file_name,
+    git_mv_script,
+    plan_file_renames,
+    plan_renames,
+)
 import subprocess
 import sys
 import pytest
@@ -46,3 +53,60 @@ def test_correct_file_name_bash(tmpdir):
         new_file = temp_dir_path / new_file_name
         assert not file.exists()
         assert new_file.exists()
+
+
+def test_plan_renames(tmpdir):
+    # directories are renamed after everything beneath them, hidden entries
+    # are left alone and clashing names are reported instead of renamed.
+    (tmpdir / "Sub Dir" / "Nested Dir" / "File A").write("temp", ensure=True)
+    (tmpdir / "Sub Dir" / "file_b").write("temp")
+    (tmpdir / "Sub Dir" / "File B").write("temp")
+    (tmpdir / ".Hidden Dir" / "File C").write("temp", ensure=True)
+
+    plan = plan_renames(tmpdir)
+    root = Path(tmpdir)
+    assert plan.collisions == {
+        root
+        / "Sub Dir"
+        / "file_b": [
+            root / "Sub Dir" / "File B",
+            root / "Sub Dir" / "file_b",
+        ]
+    }
+
+    apply_renames(plan.renames)
+    assert sorted(str(path.relative_to(root)) for path in root.glob("**/*")) == [
+        ".Hidden Dir",
+        ".Hidden Dir/File C",
+        "sub_dir",
+        "sub_dir/File B",
+        "sub_dir/file_b",
+        "sub_dir/nested_dir",
+        "sub_dir/nested_dir/file_a",
+    ]
+
+
+def test_plan_file_renames(tmpdir):
+    # only the listed files and their directories are renamed, and entries
+    # that are not listed are never replaced.
+    for name in ("Sub Dir/File A", "Sub Dir/Ignored Dir/File B", "File C", "file_c"):
+        (tmpdir / name).write("temp", ensure=True)
+    (tmpdir / "File D").write("temp")
+    root = Path(tmpdir)
+
+    plan = plan_file_renames(tmpdir, [root / "Sub Dir" / "File A", root / "File D"])
+    assert plan.collisions == {}
+    assert plan.renames == [
+        Rename(root / "Sub Dir" / "File A", root / "Sub Dir" / "file_a"),
+        Rename(root / "File D", root / "file_d"),
+        Rename(root / "Sub Dir", root / "sub_dir"),
+    ]
+
+    plan = plan_file_renames(tmpdir, [root / "File C"])
+    assert plan.renames == []
+    assert plan.collisions == {root / "file_c": [root / "File C", root / "file_c"]}
+
+
+def test_git_mv_script():
+    renames = [Rename(Path("a/B C"), Path("a/b_c")), Rename(Path("A"), Path("a"))]
+    assert git_mv_script(renames) == "git mv -- 'a/B C' a/b_c\ngit mv -- A a\n"
@@ -731,3 +731,33 @@ def test_docstring_filter_pipeline():
     result = pipeline.format(docstring)
     for expected_line, result_line in zip(result, expected):
         assert expected_line == result_line
+
+
+def test_line_filters_share_a_pass():
+    docstring = [
+        '    """',
+        "    Description",
+        "    ..:param param1:   description of param1",
+        "    :param param2 description of param2",
+        "    :return:   description of return value",
+        '    """',
+    ]
+    docstring_filters = [
+        NoRepeatedWhitespacesFilter(),
+        PrefixStripperFilter(),
+        ParameterSectionSeparatorFilter(),
+        ParamDescriptionFormatFilter(),
+        SentenceCapitalizationFilter(),
+    ]
+    pipeline = DocstringFilterPipeline(docstring_filters)
+    passes = pipeline.passes()
+    assert len(passes) == 3
+    assert passes[1] is docstring_filters[2]
+
+    expected = list(docstring)
+    for docstring_filter in docstring_filters:
+        expected = docstring_filter.format(expected)
+
+    assert pipeline.format(list(docstring)) == expected
+    assert expected[3] == "      :param param1: Description of param1"
+    assert expected[4] == "    :param param2: Description of param2"
@@ -1,6 +1,9 @@
 from src.docstring_physician.filters.docstrings_validators.class_init_parameter_match_validator import (
     ClassInitParameterMatchValidator,
 )
+from src.docstring_physician.filters.docstrings_validators.docstring_validator_pipeline import (
+    DocstringValidatorPipeline,
+)
 from src.docstring_physician.filters.docstrings_validators.module_docstring_validator import (
     ModuleDocstringValidator,
 )
@@ -350,3 +353,26 @@ def test_class_init_parameter_docstring_validator():
         print("Actual: ", result)
         print("Content: ", content)
     assert result == expected
+
+
+def test_docstring_validator_pipeline():
+    pipeline = DocstringValidatorPipeline(
+        [ModuleDocstringValidator(), PublicFunctionDocstringValidator()]
+    )
+
+    content = [
+        '"""',
+        "Module docstring",
+        '"""',
+        "",
+        "def public_function():",
+        '    """Public function docstring"""',
+    ]
+    assert pipeline.check(content, verbosity=False)
+
+    content = ["def public_function():", "    pass"]
+    assert not pipeline.check(content, verbosity=False)
+
+    # files that cannot be parsed fail the checks
+    content = ['"""', "Module docstring", '"""', "def public_function(:"]
+    assert not pipeline.check(content, verbosity=False)
@@ -1,5 +1,7 @@
+import pickle
 from pathlib import Path
 
+from src.common.cache import MemoCache
 from src.docstring_physician.filters.docstrings_filters.docstrings_filter_pipeline import (
     DocstringFilterPipeline,
 )
@@ -181,3 +183,71 @@ def test_main_formatter(tmpdir):
 
     for line_result, line_expected in zip(result, expected):
         assert line_result.strip() == line_expected.strip()
+
+
+def test_formatter_process(tmpdir):
+    valid_file = Path(tmpdir.join("valid.py"))
+    valid_file.write_text(
+        '"""\nModule docstring.\n"""\n\n\ndef function(a):\n    """\n    Does things.\n\n    :param a: value\n    """\n'
+    )
+    invalid_file = Path(tmpdir.join("invalid.py"))
+    invalid_file.write_text("def function(a):\n    pass\n")
+
+    validator_pipeline = DocstringValidatorPipeline(
+        [ModuleDocstringValidator(), PublicFunctionDocstringValidator()]
+    )
+    filter_pipeline = DocstringFilterPipeline([SentencePunctuationFilter()])
+
+    # the bound method is sent to the worker processes
+    process = pickle.loads(
+        pickle.dumps(Formatter(validator_pipeline, filter_pipeline).process)
+    )
+
+    result = process(valid_file)
+    assert result.passed and result.modified and not result.errors
+    assert "+     :param a: value." in result.diff
+    assert valid_file.read_text().endswith(':param a: value.\n    """\n')
+
+    result = process(str(invalid_file))
+    assert not result.passed and not result.modified and not result.diff
+    assert [error.line_number for error in result.errors] == [1, 1]
+    assert invalid_file.read_text() == "def function(a):\n    pass\n"
+
+
+def test_formatter_docstring_cache(tmpdir):
+    content = '"""\nModule docstring\n"""\n\n\ndef function(a):\n    """\n    Does things\n    """\n'
+    file_names = [Path(tmpdir.join(f"file_{i}.py")) for i in range(2)]
+    for file_name in file_names:
+        file_name.write_text(content)
+
+    filter_pipeline = DocstringFilterPipeline([SentencePunctuationFilter()])
+    formatter = Formatter(
+        DocstringValidatorPipeline([]),
+        filter_pipeline,
+        docstring_cache=MemoCache(None, "hook"),
+    )
+
+    # the second file only repeats the docstrings of the first one
+    results = [formatter.process(file_name) for file_name in file_names]
+    counters = [
+        (result.docstrings.hits, result.docstrings.misses) for result in results
+    ]
+    assert counters == [(0, 2), (2, 0)]
+    assert len(results[0].docstrings.entries) == 2
+    assert file_names[0].read_text() == file_names[1].read_text()
+    assert file_names[0].read_text().count("Does things.") == 1
+
+
+def test_formatter_call_invalid_file(tmpdir, capsys):
+    # a file failing the validators is reported and left unchanged.
+    file_path = Path(tmpdir.join("invalid.py"))
+    file_path.write_text("def function(a):\n    pass\n")
+
+    validator_pipeline = DocstringValidatorPipeline([ModuleDocstringValidator()])
+    filter_pipeline = DocstringFilterPipeline([SentencePunctuationFilter()])
+
+    assert not Formatter(validator_pipeline, filter_pipeline)(file_path)
+    output = capsys.readouterr().out
+    assert "Module docstring is missing." in output
+    assert f"Docstrings are missing or incorrect in {file_path}" in output
+    assert file_path.read_text() == "def function(a):\n    pass\n"
@@ -45,3 +45,60 @@ def test_find_next_docstring():
     expected = (19, 24)
     result = localizer.find_next_docstring(13)
     assert result == expected
+
+
+def test_find_all_docstrings():
+    file_content = '''
+def single_line():
+    """Description."""
+
+def inline_opening():
+    r\'\'\'Description
+    spanning two lines.
+    \'\'\'
+    text = """
+    not a docstring
+    """
+    b"""not a docstring"""
+    return text
+
+class SomeClass:
+    # comment
+    u"""
+    Description
+    """
+class A: """Description."""
+def f(): "Description."
+async def g(
+    a: "int",
+) -> "str": """Description
+    spanning two lines."""
+x: "int" = 1
+y = lambda: "text"
+z = {"key": "value"}
+'''
+    localizer = DocstringsLocalizer(file_content.split("\n"))
+
+    assert localizer.find_all_docstrings() == [
+        (2, 2),
+        (5, 7),
+        (16, 18),
+        (19, 19),
+        (20, 20),
+        (23, 24),
+    ]
+    assert localizer.find_next_docstring(3) == (5, 7)
+    assert localizer.find_next_docstring(25) == (-1, -1)
+
+
+def test_find_all_docstrings_invalid_file():
+    # docstrings on lines of their own are found in files that cannot be tokenized.
+    file_content = '''
+def function(:
+    """
+    Description
+    """
+'''
+    localizer = DocstringsLocalizer(file_content.split("\n"))
+
+    assert localizer.find_all_docstrings() == [(2, 4)]
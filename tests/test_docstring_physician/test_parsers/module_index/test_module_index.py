@@ -0,0 +1,87 @@
+import pytest
+
+from src.docstring_physician.parsers.module_index.module_index import ModuleIndex
+from src.docstring_physician.parsers.param_parser.data import ParameterData
+
+
+def test_module_index():
+    content = '''
+    """
+    Module docstring.
+    """
+
+
+    @decorator
+    class Example(Base):
+        """
+        Example class.
+
+        :param value: Value of the example.
+        """
+
+        def __init__(self, value: int = 0):
+            self._value = value
+
+        @property
+        def value(self) -> int:
+            """Returns the value."""
+            return self._value
+
+        @value.setter
+        def value(self, value):
+            self._value = value
+
+
+    async def fetch(url: str, *args, timeout: float = 1.0, **kwargs):
+        """
+        Fetches the url.
+
+        :param url: Address to fetch.
+        """
+    '''.split("\n")
+
+    index = ModuleIndex(content)
+
+    assert index.docstring_span == (1, 3)
+
+    assert len(index.classes) == 1
+    example = index.classes[0]
+    assert (example.name, example.line_number) == ("Example", 8)
+    assert example.decorators == ["decorator"]
+    assert example.docstring_span == (8, 12)
+    assert example.docstring_parameters == ["value"]
+    assert example.init.parameters == [ParameterData("value", "int", "0")]
+
+    names = [(function.name, function.line_number) for function in index.functions]
+    assert names == [("__init__", 15), ("value", 19), ("value", 24), ("fetch", 28)]
+    assert [function.is_public() for function in index.functions] == [
+        False,
+        True,
+        False,
+        True,
+    ]
+    assert index.functions[1].docstring_span == (19, 19)
+    assert index.functions[2].docstring_span is None
+
+    fetch = index.functions[3]
+    assert fetch.parameters == [
+        ParameterData("url", "str"),
+        ParameterData("args", ""),
+        ParameterData("timeout", "float", "1.0"),
+        ParameterData("kwargs", ""),
+    ]
+    assert fetch.docstring_parameters == ["url"]
+
+
+def test_module_index_without_docstrings():
+    index = ModuleIndex(["x = 1", "", "class Example:", "    pass"])
+
+    assert index.docstring_span is None
+    assert index.functions == []
+    assert index.classes[0].docstring_span is None
+    assert index.classes[0].init is None
+
+
+def test_module_index_invalid_file():
+    with pytest.raises(SyntaxError):
+        ModuleIndex(["def function(:", "    pass"])
@@ -243,3 +243,30 @@ def test_replace_parameters():
 
     for line_result, line_expected in zip(result, expected):
         assert line_result.strip() == line_expected.strip()
+
+
+def test_parameter_extractor_span():
+    function_in_code = """
+    def first_function(param_a: int):
+        return param_a
+
+    async def second_function(
+        param_a, /, param_b: Dict[str, int] = {"a": 1}, *args, param_c="(", **kwargs
+    ) -> None:  # the colon ends the header
+        pass
+    """.split(
+        "\n"
+    )
+
+    extractor = ParametersExtractor(function_in_code)
+
+    # the first function defined in the span is parsed
+    assert extractor.extract_parameter_names() == ["param_a"]
+    assert extractor.extract_parameters(3, 7) == [
+        ParameterData("param_a", ""),
+        ParameterData("param_b", "Dict[str, int]", '{"a": 1}'),
+        ParameterData("args", ""),
+        ParameterData("param_c", "", '"("'),
+        ParameterData("kwargs", ""),
+    ]
+    assert extractor.extract_parameters(2, 3) == []
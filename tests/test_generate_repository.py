@@ -0,0 +1,25 @@
+from benchmarks.generate_repository import RepositorySpec, generate_repository
+
+
+def read_tree(directory):
+    return {
+        file.relto(directory): file.read_binary()
+        for file in directory.visit()
+        if file.isfile()
+    }
+
+
+def test_generate_repository(tmpdir):
+    # the same seed always produces the same files.
+    spec = RepositorySpec(files=40, median_size=512, binary_share=0.25, crlf_share=0.5)
+    generate_repository(tmpdir / "first", spec)
+    generate_repository(tmpdir / "second", spec)
+    first = read_tree(tmpdir / "first")
+
+    assert len(first) == 40
+    assert first == read_tree(tmpdir / "second")
+    assert any(name.endswith(".bin") for name in first)
+    assert any(b"\r\n" in contents for contents in first.values())
+
+    generate_repository(tmpdir / "third", RepositorySpec(files=40, seed=1))
+    assert read_tree(tmpdir / "third") != first
@@ -0,0 +1,45 @@
+import pytest
+
+from src.last_line_empty import find_missing_last_line, make_sure_last_line_is_empty
+
+
+@pytest.mark.parametrize(
+    "original_content, expected_content",
+    [
+        (b"first line\nlast line", b"first line\nlast line\n"),
+        (b"first line\nlast line\n\n\n", b"first line\nlast line\n"),
+        (b"first line\nlast line\n", b"first line\nlast line\n"),
+        (b"", b""),
+    ],
+)
+def test_make_sure_last_line_is_empty(tmpdir, original_content, expected_content):
+    file_name = tmpdir.join("test_last_line_empty.txt")
+    file_name.write_binary(original_content)
+    make_sure_last_line_is_empty(file_name)
+    assert file_name.read_binary() == expected_content
+
+
+def test_make_sure_last_line_is_empty_skips_binaries(tmpdir):
+    # binary files must not be decoded nor modified.
+    original_content = b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR\xff\xfe"
+    file_name = tmpdir.join("image.png")
+    file_name.write_binary(original_content)
+    assert not make_sure_last_line_is_empty(file_name)
+    assert file_name.read_binary() == original_content
+
+
+@pytest.mark.parametrize(
+    "contents, violation",
+    [
+        (b"first line\nlast line", (2, 20, 1)),
+        (b"first line\nlast line\n\n\n", (3, 21, 2)),
+        (b"first line\nlast line\n", None),
+        (b"", None),
+    ],
+)
+def test_find_missing_last_line(contents, violation):
+    found = find_missing_last_line(contents)
+    if violation is None:
+        assert found is None
+    else:
+        assert (found.line, found.offset, found.count) == violation
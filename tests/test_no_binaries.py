@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+
+from src.no_binaries import find_binaries
+from tests.conftest import git_add
+
+
+def test_find_binaries(git_repository):
+    # only staged blobs are inspected, whatever the working tree holds.
+    (git_repository / "text.txt").write_binary(b"text\n")
+    (git_repository / "empty.txt").write_binary(b"")
+    (git_repository / "image.png").write_binary(b"\x89PNG\r\n\x1a\n\0" * 4096)
+    (git_repository / "copy.png").write_binary(b"\x89PNG\r\n\x1a\n\0" * 4096)
+    (git_repository / "latin.txt").write_binary("zażółć".encode("iso8859_2"))
+    (git_repository / "wide.txt").write_binary("zażółć\n".encode("utf-16"))
+    (git_repository / "control.bin").write_binary(bytes(range(1, 32)))
+    (git_repository / "unstaged.bin").write_binary(b"\0")
+    os.symlink("image.png", git_repository / "link")
+    git_add(
+        git_repository,
+        "text.txt",
+        "empty.txt",
+        "image.png",
+        "copy.png",
+        "latin.txt",
+        "wide.txt",
+        "control.bin",
+        "link",
+    )
+    # removing the file from the working tree does not unstage it
+    (git_repository / "image.png").remove()
+
+    root = Path(git_repository).resolve()
+    # text is accepted whatever its encoding
+    assert find_binaries(git_repository) == [
+        (root / "control.bin", 31),
+        (root / "copy.png", 36864),
+        (root / "image.png", 36864),
+    ]
+
+
+def test_find_binaries_nothing_staged(git_repository):
+    (git_repository / "unstaged.bin").write_binary(b"\0")
+    assert find_binaries(git_repository) == []
@@ -0,0 +1,32 @@
+from src.normalize import normalize
+
+original_content = "Zażółć gęślą jaźń  \r\n" "second line\t\r\n" "\r\n" "\r\n"
+
+expected_content = "Zazolc gesla jazn\n" "second line\n"
+
+
+def test_normalize(tmpdir):
+    # create a temporary file that violates every rule at once.
+    # test if normalize() fixes all of them in a single pass.
+    file_name = tmpdir.join("test_normalize.txt")
+    file_name.write_binary(original_content.encode("utf-8"))
+    normalize(file_name)
+    assert file_name.read_binary().decode("utf-8") == expected_content
+
+
+def test_normalize_selected_transforms(tmpdir):
+    # only the selected transforms should be applied.
+    file_name = tmpdir.join("test_normalize.txt")
+    file_name.write_binary(original_content.encode("utf-8"))
+    normalize(file_name, ["remove_carriage_return"])
+    assert file_name.read_binary().decode("utf-8") == original_content.replace(
+        "\r", ""
+    )
+
+
+def test_normalize_reports_modified_files(tmpdir):
+    # a file is only rewritten when one of the transforms changed it.
+    file_name = tmpdir.join("test_normalize.txt")
+    file_name.write_binary(original_content.encode("utf-8"))
+    assert normalize(file_name)
+    assert not normalize(file_name)
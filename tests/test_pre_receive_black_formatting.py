@@ -0,0 +1,73 @@
+import io
+import subprocess
+
+import pytest
+
+from src.pre_receive_black_formatting import check_refs, is_checked, unformatted_files
+from tests.conftest import git_add
+
+pytest.importorskip("black")
+
+ZERO_SHA = "0" * 40
+FORMATTED = b"x = 1\n"
+UNFORMATTED = b"x=1\n"
+
+
+def commit(repository, message) -> str:
+    subprocess.run(["git", "commit", "-q", "-m", message], cwd=repository, check=True)
+    output = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repository, check=True, stdout=subprocess.PIPE
+    ).stdout
+    return output.decode().strip()
+
+
+def test_unformatted_files(git_repository):
+    # only the python files changed between the revisions are checked, and
+    # every file of the new revision is checked when the branch is created.
+    (git_repository / "a.py").write_binary(FORMATTED)
+    (git_repository / "b.py").write_binary(UNFORMATTED)
+    git_add(git_repository, "a.py", "b.py")
+    first = commit(git_repository, "first")
+
+    (git_repository / "a.py").write_binary(UNFORMATTED)
+    (git_repository / "c.txt").write_binary(UNFORMATTED)
+    git_add(git_repository, "a.py", "c.txt")
+    second = commit(git_repository, "second")
+
+    assert unformatted_files(first, second, git_repository) == ["a.py"]
+    assert unformatted_files(ZERO_SHA, first, git_repository) == ["b.py"]
+
+
+def test_black_config(git_repository):
+    # the configuration is read from the pushed revision.
+    (git_repository / "pyproject.toml").write(
+        "[tool.black]\nline-length = 10\nextend-exclude = 'skipped'\n"
+    )
+    (git_repository / "a.py").write_binary(b"x = [1, 2, 3, 4]\n")
+    (git_repository / "skipped.py").write_binary(UNFORMATTED)
+    git_add(git_repository, "pyproject.toml", "a.py", "skipped.py")
+    revision = commit(git_repository, "first")
+
+    assert unformatted_files(ZERO_SHA, revision, git_repository) == ["a.py"]
+    assert is_checked("src/b.pyi", {})
+    assert not is_checked("build/b.py", {})
+
+
+def test_check_refs(git_repository, tmpdir, capsys):
+    # pushes are checked in the bare repository of the server, and only
+    # the selected branches are checked.
+    (git_repository / "a.py").write_binary(UNFORMATTED)
+    git_add(git_repository, "a.py")
+    revision = commit(git_repository, "first")
+    server = tmpdir / "server.git"
+    subprocess.run(
+        ["git", "clone", "-q", "--bare", str(git_repository), str(server)], check=True
+    )
+
+    lines = f"{ZERO_SHA} {revision} refs/heads/master\n"
+    assert not check_refs(io.StringIO(lines), ["master"], server)
+    assert "refs/heads/master: would reformat a.py" in capsys.readouterr().out
+    assert check_refs(io.StringIO(lines), ["main"], server)
+    assert check_refs(
+        io.StringIO(f"{revision} {ZERO_SHA} refs/heads/master\n"), ["master"], server
+    )
@@ -0,0 +1,142 @@
+import io
+import json
+import os
+import subprocess
+
+from src.pre_receive_unit_tests import (
+    HOOKS_ROOT,
+    MAP_FILE_NAME,
+    affected_tests,
+    check_refs,
+    imported_modules,
+    unit_test_environment,
+)
+from tests.conftest import git_add
+
+ZERO_SHA = "0" * 40
+TEST_MODULE = """import unittest
+
+from pkg.{name} import VALUE
+
+
+class Test(unittest.TestCase):
+    def test_value(self):
+        self.assertEqual(VALUE, 1)
+"""
+
+
+def commit(repository, message) -> str:
+    subprocess.run(["git", "commit", "-q", "-m", message], cwd=repository, check=True)
+    output = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repository, check=True, stdout=subprocess.PIPE
+    ).stdout
+    return output.decode().strip()
+
+
+def test_imported_modules():
+    # relative imports are resolved and imported names may be submodules.
+    source = (
+        b"import os\nfrom . import a\nfrom ..c import d\n\ndef f():\n    import e.f\n"
+    )
+    assert imported_modules(source, "pkg/sub/b.py") == [
+        "e.f",
+        "os",
+        "pkg.c",
+        "pkg.c.d",
+        "pkg.sub",
+        "pkg.sub.a",
+    ]
+    assert imported_modules(b"import (", "b.py") == []
+
+
+def test_affected_tests():
+    # tests importing a changed module through other modules are affected,
+    # and so are tests importing a package whose __init__ changed.
+    files = {
+        "pkg/__init__.py": {"imports": []},
+        "pkg/a.py": {"imports": []},
+        "pkg/b.py": {"imports": ["pkg.a"]},
+        "tests/__init__.py": {"imports": []},
+        "tests/test_a.py": {"imports": ["pkg.a"]},
+        "tests/test_b.py": {"imports": ["pkg.b"]},
+        "tests/test_c.py": {"imports": ["os"]},
+    }
+
+    assert affected_tests(files, ["pkg/a.py"]) == ["tests/test_a.py", "tests/test_b.py"]
+    assert affected_tests(files, ["pkg/b.py"]) == ["tests/test_b.py"]
+    assert affected_tests(files, ["pkg/__init__.py"]) == [
+        "tests/test_a.py",
+        "tests/test_b.py",
+    ]
+    assert affected_tests(files, ["tests/test_c.py"]) == ["tests/test_c.py"]
+    # nothing imports the module, so it may be loaded in another way
+    assert affected_tests(files, ["pkg/c.py"]) is None
+
+
+def test_affected_tests_source_roots():
+    # modules under a source root are imported by their path from the root.
+    files = {
+        "src/pkg/__init__.py": {"imports": []},
+        "src/pkg/a.py": {"imports": []},
+        "tests/__init__.py": {"imports": []},
+        "tests/test_a.py": {"imports": ["pkg.a"]},
+    }
+
+    assert affected_tests(files, ["src/pkg/a.py"]) == ["tests/test_a.py"]
+    assert affected_tests(files, ["src/pkg/a.py"], source_roots=()) is None
+
+
+def test_unit_test_environment(monkeypatch):
+    # the tests cannot import the modules of the hooks.
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([HOOKS_ROOT, "other"]))
+    assert unit_test_environment()["PYTHONPATH"] == "other"
+    monkeypatch.setenv("PYTHONPATH", HOOKS_ROOT)
+    assert "PYTHONPATH" not in unit_test_environment()
+
+
+def test_check_refs(git_repository, tmpdir, capsys):
+    # the first push runs the full suite and builds the map, later pushes
+    # only run the affected tests, and a failing push does not update the map.
+    for name in ("__init__", "a", "b"):
+        (git_repository / "pkg" / f"{name}.py").write("VALUE = 1\n", ensure=True)
+    (git_repository / "tests" / "__init__.py").write("", ensure=True)
+    for name in ("a", "b"):
+        (git_repository / "tests" / f"test_{name}.py").write(
+            TEST_MODULE.format(name=name)
+        )
+    git_add(git_repository, "pkg", "tests")
+    first = commit(git_repository, "first")
+    server = tmpdir / "server.git"
+    subprocess.run(
+        ["git", "clone", "-q", "--bare", str(git_repository), str(server)], check=True
+    )
+
+    assert check_refs(
+        io.StringIO(f"{ZERO_SHA} {first} refs/heads/master\n"), ["master"], True, server
+    )
+    assert "running the full suite" in capsys.readouterr().out
+    maps = json.loads((server / MAP_FILE_NAME).read())["refs"]
+    assert maps["refs/heads/master"]["revision"] == first
+
+    (git_repository / "pkg" / "a.py").write("VALUE = 1\n\n")
+    git_add(git_repository, "pkg")
+    second = commit(git_repository, "second")
+    subprocess.run(
+        ["git", "push", "-q", str(server), "HEAD:master"], cwd=git_repository
+    )
+    assert check_refs(
+        io.StringIO(f"{first} {second} refs/heads/master\n"), ["master"], True, server
+    )
+    assert "running 1 affected test modules" in capsys.readouterr().out
+
+    (git_repository / "pkg" / "b.py").write("VALUE = 2\n")
+    git_add(git_repository, "pkg")
+    third = commit(git_repository, "third")
+    subprocess.run(
+        ["git", "push", "-q", str(server), "HEAD:master"], cwd=git_repository
+    )
+    assert not check_refs(
+        io.StringIO(f"{second} {third} refs/heads/master\n"), ["master"], True, server
+    )
+    maps = json.loads((server / MAP_FILE_NAME).read())["refs"]
+    assert maps["refs/heads/master"]["revision"] == second
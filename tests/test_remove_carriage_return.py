@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from src.remove_carriage_return import remove_carriage_return
+
+original_content = b"first line\r\nsecond line\r\n\r\nlast line\r"
+
+expected_content = b"first line\nsecond line\n\nlast line"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 11, 12, 1024])
+def test_remove_carriage_return(tmpdir, chunk_size):
+    # carriage returns falling exactly on a chunk boundary
+    # must be removed like any other.
+    file_name = tmpdir.join("test_remove_carriage_return.txt")
+    file_name.write_binary(original_content)
+    remove_carriage_return(file_name, chunk_size=chunk_size)
+    assert file_name.read_binary() == expected_content
+
+
+def test_remove_carriage_return_keeps_mode(tmpdir):
+    # the temporary file replacing the original keeps its permissions
+    # and no temporary file is left behind.
+    file_name = tmpdir.join("test_remove_carriage_return.sh")
+    file_name.write_binary(original_content)
+    os.chmod(file_name, 0o755)
+    remove_carriage_return(file_name)
+    assert os.stat(file_name).st_mode & 0o777 == 0o755
+    assert tmpdir.listdir() == [file_name]
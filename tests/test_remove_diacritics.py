@@ -55,3 +55,18 @@ def test_remove_diacritics_bash(tmpdir):
         file_name.read().split("\n"), expected_content.split("\n")
     ):
         assert result_line == expected_line
+
+
+def test_remove_diacritics_extended(tmpdir):
+    # characters outside of the explicit mapping are only replaced
+    # when the Latin Extended-A/B decompositions are enabled.
+    content = "Ŕŕ Ǘ ȁ ł żółw\n"
+    file_name = tmpdir.join("test_remove_diacritics_extended.txt")
+
+    file_name.write_text(content, encoding="utf-8")
+    remove_diacritics(file_name)
+    assert file_name.read_text(encoding="utf-8") == "Ŕŕ Ǘ ȁ l zolw\n"
+
+    file_name.write_text(content, encoding="utf-8")
+    remove_diacritics(file_name, extended=True)
+    assert file_name.read_text(encoding="utf-8") == "Rr U a l zolw\n"
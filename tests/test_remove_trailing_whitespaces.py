@@ -1,6 +1,10 @@
 from git_root import git_root
 
-from src.remove_trailing_whitespaces import remove_trailing_whitespaces
+from src.remove_trailing_whitespaces import (
+    find_trailing_whitespaces,
+    remove_trailing_whitespaces,
+    strip_trailing_whitespaces,
+)
 import subprocess
 import sys
 import pytest
@@ -42,3 +46,26 @@ def test_remove_trailing_whitespaces_bash(tmpdir):
         [f"{git_root()}/src/remove_trailing_whitespaces.sh", file_name]
     )
     assert file_name.read() == expected_content + "\n"
+
+
+def test_find_trailing_whitespaces():
+    # the first offending line is reported along with the number of lines.
+    violation = find_trailing_whitespaces(original_content.encode())
+    assert (violation.line, violation.offset, violation.count) == (1, 21, 3)
+    assert find_trailing_whitespaces(b"first\r\n  second \t\r\n").line == 2
+    assert find_trailing_whitespaces(expected_content.encode()) is None
+
+
+@pytest.mark.parametrize(
+    "contents, expected",
+    [
+        (b"first \nsecond\t\n", b"first\nsecond\n"),
+        (b"first \r\nsecond\t \r\n", b"first\r\nsecond\r\n"),
+        (b"first\n \n\nlast  ", b"first\n\n\nlast"),
+        (b"clean\n", b"clean\n"),
+        (b"", b""),
+    ],
+)
+def test_strip_trailing_whitespaces(contents, expected):
+    # line terminators and the final newline are kept.
+    assert strip_trailing_whitespaces(contents) == expected
@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+
+from src.run_hooks import print_timings, run_hooks
+from tests.conftest import git_add
+
+
+def test_run_hooks(tmpdir, capsys):
+    # every file goes through all content hooks in one pass and is
+    # renamed only after that.
+    (tmpdir / "File A.txt").write_binary(b"first \r\nsecond\r\n\n\n")
+    (tmpdir / "clean.txt").write_binary(b"clean\n")
+    (tmpdir / "image.bin").write_binary(b"\0\r\n")
+
+    names = [
+        "remove_carriage_return",
+        "remove_trailing_whitespaces",
+        "last_line_empty",
+        "correct_file_names",
+    ]
+    reports, results = run_hooks(tmpdir, names, jobs=1)
+
+    assert [result.modified for result in results] == [True, False, False]
+    assert (tmpdir / "file_a.txt").read_binary() == b"first\nsecond\n"
+    assert (tmpdir / "image.bin").read_binary() == b"\0\r\n"
+
+    assert list(reports) == names
+    # binary files are skipped by the content hooks
+    assert reports["remove_carriage_return"].files == 2
+    assert reports["correct_file_names"].files == 1
+    assert not any(report.failed for report in reports.values())
+
+    print_timings(reports)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["Hook", "Files", "Time", "[s]", "Status"]
+    assert sorted(line.split()[0] for line in lines[1:]) == sorted(names)
+
+
+def test_run_hooks_collected_files(git_repository):
+    # ignored and, in staged mode, unstaged files are neither renamed nor
+    # processed, and clean files are skipped on the next run.
+    (git_repository / ".gitignore").write("venv/\n")
+    (git_repository / "venv" / "Ignored File.txt").write("temp", ensure=True)
+    (git_repository / "Staged File.txt").write_binary(b"staged\n")
+    (git_repository / "Unstaged File.txt").write_binary(b"unstaged \n")
+    git_add(git_repository, ".gitignore", "Staged File.txt")
+    for file in git_repository.visit(lambda path: path.isfile()):
+        os.utime(file, ns=(0, 0))
+
+    names = ["remove_trailing_whitespaces", "correct_file_names"]
+    reports, results = run_hooks(git_repository, names, jobs=1, staged=True)
+    assert [Path(result.path).name for result in results] == [
+        ".gitignore",
+        "Staged File.txt",
+    ]
+    assert reports["correct_file_names"].files == 1
+    assert (git_repository / "staged_file.txt").exists()
+    assert (git_repository / "Unstaged File.txt").exists()
+    assert (git_repository / "venv" / "Ignored File.txt").exists()
+
+    os.utime(git_repository / "staged_file.txt", ns=(0, 0))
+    _, results = run_hooks(git_repository, names[:1], jobs=1)
+    # the renamed file is hashed again under its new path
+    assert [Path(result.path).name for result in results] == [
+        "Unstaged File.txt",
+        "staged_file.txt",
+    ]
+    # rewritten files are hashed by the next run
+    os.utime(git_repository / "Unstaged File.txt", ns=(0, 0))
+    _, results = run_hooks(git_repository, names[:1], jobs=1)
+    assert [Path(result.path).name for result in results] == ["Unstaged File.txt"]
+    _, results = run_hooks(git_repository, names[:1], jobs=1)
+    assert results == []
+    _, results = run_hooks(git_repository, names[:1], jobs=1, cache=False)
+    assert len(results) == 3